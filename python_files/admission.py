@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Admission Control for Blind Assistant
+Deadline-aware bounded queue in front of the object detector
+
+An obstacle warning for a frame that is seconds old is worse than none, so
+each detection job carries a deadline. A job is rejected up front when the
+queue is full or the estimated wait (jobs ahead of it times the recent
+average service time) means it cannot finish in time; an idle detector
+always takes the job, which keeps the average current. Jobs whose deadline
+passes while they wait are dropped before they reach the detector. Detection
+itself runs on a small thread pool so the event loop stays responsive.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+DETECT_WORKERS = int(os.getenv("DETECT_WORKERS", "1"))
+DETECT_QUEUE_SIZE = int(os.getenv("DETECT_QUEUE_SIZE", "8"))
+DETECT_DEADLINE_MS = int(os.getenv("DETECT_DEADLINE_MS", "1000"))
+# Weight of the newest sample in the service-time average
+EWMA_ALPHA = 0.2
+
+QUEUE_DEPTH = metrics.REGISTRY.gauge(
+    "blind_assistant_detect_queue_depth", "Detection jobs waiting or running"
+)
+REJECTED = metrics.REGISTRY.counter(
+    "blind_assistant_detect_rejected_total", "Detection jobs refused or dropped", ("reason",)
+)
+
+class Overloaded(Exception):
+    """Job refused at admission; retry after ``retry_after`` seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class DeadlineExceeded(Exception):
+    """Job expired in the queue before it could run"""
+
+class AdmissionController:
+    """FIFO of deadline-stamped jobs served by a fixed pool of threads"""
+
+    def __init__(self, workers=DETECT_WORKERS, max_queue=DETECT_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.service_time = None  # seconds, EWMA of completed jobs
+        self._jobs = deque()
+        self._running = 0
+        self._loop = None
+        self._wakeup = None
+        self._executor = None
+        self._tasks = []
+
+    def _start(self):
+        # Lazily, so the event and the tasks belong to the serving loop. A new
+        # loop (a restarted server, a test client) gets its own; jobs and
+        # workers left on an earlier loop can never run, so they are dropped.
+        self._loop = asyncio.get_running_loop()
+        self._jobs.clear()
+        self._running = 0
+        self._wakeup = asyncio.Event()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="detect")
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    def depth(self):
+        return len(self._jobs) + self._running
+
+    def estimated_wait(self):
+        """Seconds a job submitted now would wait before it starts"""
+        if self.service_time is None:
+            return 0.0
+        ahead = len(self._jobs) + max(0, self._running - self.workers + 1)
+        return ahead * self.service_time / self.workers
+
+    async def submit(self, func, *args, deadline):
+        """Run ``func(*args)`` on the pool if it can finish before ``deadline``
+
+        ``deadline`` is a time.monotonic() timestamp. Raises Overloaded when
+        the job is refused and DeadlineExceeded when it expires while queued.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            self._start()
+
+        now = time.monotonic()
+        wait = self.estimated_wait()
+        expected_finish = now + wait + (self.service_time or 0.0)
+        if len(self._jobs) >= self.max_queue:
+            REJECTED.inc("queue_full")
+            raise Overloaded("Detection queue is full", self._retry_after(wait))
+        # An idle detector always takes the job: the estimate only comes down
+        # when jobs finish, so one slow frame must not lock everything out
+        idle = not self._jobs and self._running == 0
+        if expected_finish > deadline and not idle:
+            REJECTED.inc("deadline")
+            raise Overloaded("Detection cannot finish before the deadline", self._retry_after(wait))
+
+        future = asyncio.get_running_loop().create_future()
+        self._jobs.append((deadline, future, func, args))
+        QUEUE_DEPTH.set(value=self.depth())
+        self._wakeup.set()
+        return await future
+
+    def _retry_after(self, wait):
+        return max(1, math.ceil(wait))
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._jobs:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            deadline, future, func, args = self._jobs.popleft()
+            if future.cancelled():
+                continue
+            if time.monotonic() > deadline:
+                REJECTED.inc("expired")
+                future.set_exception(DeadlineExceeded("Deadline passed while queued"))
+                QUEUE_DEPTH.set(value=self.depth())
+                continue
+
+            self._running += 1
+            start = time.monotonic()
+            try:
+                result = await loop.run_in_executor(self._executor, func, *args)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self._running -= 1
+                elapsed = time.monotonic() - start
+                if self.service_time is None:
+                    self.service_time = elapsed
+                else:
+                    self.service_time += EWMA_ALPHA * (elapsed - self.service_time)
+                QUEUE_DEPTH.set(value=self.depth())
+
+    async def close(self):
+        # Tasks of another, finished loop cannot be cancelled from here
+        if self._loop is asyncio.get_running_loop():
+            for task in self._tasks:
+                task.cancel()
+        self._tasks = []
+        self._loop = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -1,16 +1,16 @@
 from geopy.geocoders import Nominatim
 import speech_recognition as sr
+import gazetteer
+import mic_session
+import recognizers
 
 def get_voice_input():
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Speak your destination...")
-        audio = r.listen(source)
+    print("Speak your destination...")
 
     try:
-        result = r.recognize_google(audio)
-        return result
-    except:
+        # Stops as soon as the speaker pauses (see mic_session.py)
+        return recognizers.get_recognizer().listen(mic_session.get_session()).text
+    except (sr.UnknownValueError, sr.RequestError, sr.WaitTimeoutError):
         return None
 
 # Geocoder initialize
@@ -20,7 +20,7 @@ destination = get_voice_input()
 
 if destination:
     print("You said:", destination)
-    location = geolocator.geocode(destination)
+    location = gazetteer.geocode(destination, geolocator)
 
     if location:
         print(f"Latitude: {location.latitude}, Longitude: {location.longitude}")
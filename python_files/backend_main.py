@@ -4,17 +4,42 @@ Blind Assistant Backend API
 Provides REST API endpoints for the Blind Assistant features
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from contextlib import aclosing, asynccontextmanager
 import base64
+import os
+import time
 import cv2
-import numpy as np
-from geopy.geocoders import Nominatim
+from geocoding import AsyncGeocoder
+from intents import match_intent
+import metrics
+import detection
+import serialization
+from serialization import FastJSONResponse
+from admission import AdmissionController, DeadlineExceeded, Overloaded, DETECT_DEADLINE_MS
+from spatial_index import get_spatial_index
 
-app = FastAPI(title="Blind Assistant API", version="1.0.0")
+# Initialize services
+geocoder = AsyncGeocoder(user_agent="blind_assistant_app")
+BATCH_GEOCODE_LIMIT = 100
+BATCH_GEOCODE_CONCURRENCY = int(os.getenv("BATCH_GEOCODE_CONCURRENCY", "4"))
+NEARBY_MAX_RADIUS = 50000.0  # metres
+NEARBY_MAX_LIMIT = 100
+detection_queue = AdmissionController()
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await geocoder.close()
+    await detection_queue.close()
+
+# Responses are encoded with orjson when available (see serialization.py)
+app = FastAPI(title="Blind Assistant API", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -25,6 +50,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency, in-flight and error metrics, served on /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Pydantic models
 class VoiceCommandRequest(BaseModel):
     command: str
@@ -32,9 +60,11 @@ class VoiceCommandRequest(BaseModel):
 
 class ObjectDetectionRequest(BaseModel):
     image_data: str  # base64 encoded image
+    deadline_ms: Optional[int] = None  # give up if no result within this time
+    layout: Optional[str] = "objects"  # or "columnar" for parallel arrays
 
-# Initialize services
-geolocator = Nominatim(user_agent="blind_assistant_app")
+class BatchGeocodeRequest(BaseModel):
+    names: List[str]
 
 # Load OpenCV cascades for basic object detection
 try:
@@ -45,6 +75,18 @@ except Exception as e:
     face_cascade = None
     eye_cascade = None
 
+# Spoken replies per voice intent (see intents.py)
+VOICE_RESPONSES = {
+    "navigate": "Navigation feature ready. Please specify destination.",
+    "help": "Available commands: navigate, location, detect, camera, weather",
+    "location": "Location services are available. Say a place name.",
+    "detect": "Object detection is ready. Point camera at objects.",
+    "camera": "Camera is active and ready for detection.",
+    "weather": "Weather information feature is in development.",
+    "traffic": "Traffic monitoring is active.",
+    "emergency": "Emergency services contact feature available."
+}
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -57,65 +99,79 @@ async def health_check():
 @app.post("/api/voice/process")
 async def process_voice_command(request: VoiceCommandRequest):
     """Process voice commands and return appropriate responses"""
-    command = request.command.lower()
-    
-    responses = {
-        "navigate": "Navigation feature ready. Please specify destination.",
-        "help": "Available commands: navigate, location, detect, camera, weather",
-        "location": "Location services are available. Say a place name.",
-        "detect": "Object detection is ready. Point camera at objects.",
-        "camera": "Camera is active and ready for detection.",
-        "weather": "Weather information feature is in development.",
-        "traffic": "Traffic monitoring is active.",
-        "emergency": "Emergency services contact feature available."
-    }
+    intent = match_intent(request.command)
     
-    for keyword, response in responses.items():
-        if keyword in command:
-            return JSONResponse(status_code=200, content={
-                "success": True, 
-                "response": response,
-                "command_type": keyword
-            })
+    if intent is not None:
+        response = VOICE_RESPONSES[intent.name]
+        if intent.name == "navigate" and "destination" in intent.slots:
+            response = f"Navigation feature ready. Destination: {intent.slots['destination']}."
+        return FastJSONResponse(status_code=200, content={
+            "success": True, 
+            "response": response,
+            "command_type": intent.name,
+            "slots": intent.slots
+        })
     
-    return JSONResponse(status_code=200, content={
+    return FastJSONResponse(status_code=200, content={
         "success": False, 
         "response": "Command not recognized. Say 'help' for available commands.",
         "command_type": "unknown"
     })
 
+def run_detection(image_data):
+    """Decode a base64 image and detect objects (runs on the detection pool)"""
+    # Decode base64 image
+    with metrics.stage("detect.base64_decode"):
+        image_bytes = base64.b64decode(image_data)
+    with metrics.stage("detect.imdecode"):
+        # Decoded straight to reduced-size grayscale for the cascade
+        gray, scale = detection.decode_gray(image_bytes)
+    
+    if gray is None:
+        raise HTTPException(status_code=400, detail="Invalid image data")
+    
+    detected_objects = []
+    
+    # Basic face detection
+    if face_cascade is not None:
+        with metrics.stage("detect.cascade"):
+            faces = detection.detect(face_cascade, gray, scale)
+        
+        for (x, y, w, h) in faces:
+            detected_objects.append({
+                "type": "face",
+                "confidence": 0.85,
+                "bbox": [int(x), int(y), int(w), int(h)],
+                "description": "Human face detected"
+            })
+    return detected_objects
+
 @app.post("/api/detect")
-async def detect_objects(request: ObjectDetectionRequest):
+async def detect_objects(request: ObjectDetectionRequest, x_deadline_ms: Optional[int] = Header(None)):
     """Perform basic object detection on uploaded image"""
+    if request.layout not in ("objects", "columnar"):
+        raise HTTPException(status_code=422, detail="layout must be 'objects' or 'columnar'")
+    deadline_ms = request.deadline_ms or x_deadline_ms or DETECT_DEADLINE_MS
+    deadline = time.monotonic() + deadline_ms / 1000.0
     try:
-        # Decode base64 image
-        image_data = base64.b64decode(request.image_data)
-        nparr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            raise HTTPException(status_code=400, detail="Invalid image data")
+        detected_objects = await detection_queue.submit(run_detection, request.image_data, deadline=deadline)
         
-        detected_objects = []
-        
-        # Basic face detection
-        if face_cascade is not None:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-            
-            for (x, y, w, h) in faces:
-                detected_objects.append({
-                    "type": "face",
-                    "confidence": 0.85,
-                    "bbox": [int(x), int(y), int(w), int(h)],
-                    "description": "Human face detected"
-                })
-        
-        return JSONResponse(status_code=200, content={
-            "objects": detected_objects,
-            "count": len(detected_objects)
-        })
+        with metrics.stage("detect.encode"):
+            if request.layout == "columnar":
+                content = serialization.columnar(detected_objects)
+                content["layout"] = "columnar"
+            else:
+                content = {"objects": detected_objects}
+            content["count"] = len(detected_objects)
+            response = FastJSONResponse(status_code=200, content=content)
+        return response
         
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection error: {str(e)}")
 
@@ -123,7 +179,8 @@ async def detect_objects(request: ObjectDetectionRequest):
 async def geocode_location(name: str):
     """Convert place name to coordinates"""
     try:
-        location = geolocator.geocode(name)
+        with metrics.stage("geocode.lookup"):
+            location = await geocoder.geocode(name)
         if location:
             return {
                 "success": True,
@@ -137,11 +194,48 @@ async def geocode_location(name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Geocoding error: {str(e)}")
 
+@app.post("/api/geocode/batch")
+async def geocode_batch(request: BatchGeocodeRequest, accept_encoding: Optional[str] = Header(None)):
+    """Resolve many place names, streaming one JSON line per distinct name"""
+    if len(request.names) > BATCH_GEOCODE_LIMIT:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_GEOCODE_LIMIT} names per batch")
+
+    async def results():
+        # aclosing cancels outstanding lookups as soon as the stream is dropped
+        async with aclosing(geocoder.geocode_many(request.names, BATCH_GEOCODE_CONCURRENCY)) as items:
+            async for name, location, error in items:
+                if error is not None:
+                    item = {"success": False, "place_name": name, "error": f"Geocoding error: {error}"}
+                elif location is None:
+                    item = {"success": False, "place_name": name, "error": "Location not found"}
+                else:
+                    item = {
+                        "success": True,
+                        "latitude": location.latitude,
+                        "longitude": location.longitude,
+                        "address": location.address,
+                        "place_name": name
+                    }
+                yield serialization.dumps(item) + b"\n"
+
+    # Large batches are compressed with brotli or gzip, still one flush per line
+    encoding = None
+    if len(set(request.names)) >= serialization.COMPRESS_MIN_ITEMS:
+        encoding = serialization.negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return StreamingResponse(results(), media_type="application/x-ndjson", headers={"Vary": "Accept-Encoding"})
+    return StreamingResponse(
+        serialization.compress_stream(results(), encoding),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
+
 @app.get("/api/reverse-geocode")
 async def reverse_geocode(lat: float, lon: float):
     """Convert coordinates to place name"""
     try:
-        location = geolocator.reverse((lat, lon))
+        with metrics.stage("geocode.reverse"):
+            location = await geocoder.reverse(lat, lon)
         if location:
             return {
                 "success": True,
@@ -154,6 +248,36 @@ async def reverse_geocode(lat: float, lon: float):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Reverse geocoding error: {str(e)}")
 
+@app.get("/api/nearby")
+async def nearby_places(lat: float, lon: float,
+                        radius: float = Query(500.0, gt=0, le=NEARBY_MAX_RADIUS),
+                        limit: int = Query(10, ge=1, le=NEARBY_MAX_LIMIT)):
+    """List known places within a radius (metres) of a coordinate"""
+    index = get_spatial_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Nearby places index not available")
+
+    places = index.within(lat, lon, radius, limit=limit)
+    return {
+        "success": True,
+        "places": [
+            {
+                "name": place.name,
+                "address": place.address,
+                "latitude": place.latitude,
+                "longitude": place.longitude,
+                "distance": round(place.distance, 1)
+            }
+            for place in places
+        ],
+        "count": len(places)
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics for this process"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/features")
 async def get_features():
     """Get list of available features"""
@@ -174,10 +298,20 @@ async def get_features():
                 "description": "Convert place names to coordinates",
                 "endpoint": "/api/geocode"
             },
+            {
+                "name": "Batch Geocoding",
+                "description": "Convert many place names to coordinates, streamed as they resolve",
+                "endpoint": "/api/geocode/batch"
+            },
             {
                 "name": "Reverse Geocoding",
                 "description": "Convert coordinates to place names",
                 "endpoint": "/api/reverse-geocode"
+            },
+            {
+                "name": "Nearby Places",
+                "description": "List places around a coordinate",
+                "endpoint": "/api/nearby"
             }
         ]
     }
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Detection Resolution Benchmark for Blind Assistant
+Reports the speed/recall tradeoff of running the face cascade downscaled
+
+Each web_app/temp frame is processed the old way (full decode, full-size
+cascade) and at several working widths using reduced JPEG decoding. Recall is
+the share of full-resolution detections that are found again (IoU >= 0.3),
+overall and for faces at least --large pixels wide. Small full-resolution
+hits are often cascade false positives on background texture, so the overall
+figure understates how much real recall the downscaled path keeps.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import detection
+
+FRAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web_app", "temp")
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = w * h
+    return inter / float(aw * ah + bw * bh - inter) if inter else 0.0
+
+def full_resolution(cascade, data):
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return [tuple(int(v) for v in box) for box in cascade.detectMultiScale(gray, 1.1, 4)]
+
+def downscaled(cascade, data, width):
+    gray, scale = detection.decode_gray(data, width)
+    return detection.detect(cascade, gray, scale)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade working-resolution benchmark")
+    parser.add_argument("--widths", type=int, nargs="+", default=[960, 640, 480, 320])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--large", type=int, default=100, help="Face width counted as large, in pixels")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FRAMES_DIR, "*.jpg")))[:args.frames]
+    if not paths:
+        print(f"❌ No frames found in {FRAMES_DIR}")
+        return 1
+    frames = []
+    for path in paths:
+        with open(path, "rb") as f:
+            frames.append(f.read())
+
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+    start = time.perf_counter()
+    reference = [full_resolution(cascade, data) for data in frames]
+    full_ms = (time.perf_counter() - start) / len(frames) * 1000
+    total = sum(len(boxes) for boxes in reference)
+    large_total = sum(1 for boxes in reference for box in boxes if box[2] >= args.large)
+
+    width, height = detection.image_size(frames[0])
+    print(f"{len(frames)} frames at {width}x{height}, {total} faces at full resolution")
+    print(f"{'width':>6}  {'ms/frame':>9}  {'speedup':>7}  {'recall':>6}  {'large':>6}")
+    print(f"{'full':>6}  {full_ms:>9.1f}  {1.0:>6.1f}x  {1.0:>6.2f}  {1.0:>6.2f}")
+
+    for target in args.widths:
+        found = large_found = 0
+        start = time.perf_counter()
+        results = [downscaled(cascade, data, target) for data in frames]
+        ms = (time.perf_counter() - start) / len(frames) * 1000
+        for expected, boxes in zip(reference, results):
+            for box in expected:
+                if any(iou(box, other) >= 0.3 for other in boxes):
+                    found += 1
+                    large_found += box[2] >= args.large
+        recall = found / total if total else 1.0
+        large_recall = large_found / large_total if large_total else 1.0
+        print(f"{target:>6}  {ms:>9.1f}  {full_ms / ms:>6.1f}x  {recall:>6.2f}  {large_recall:>6.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
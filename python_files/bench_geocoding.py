@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Geocoding Concurrency Benchmark for Blind Assistant
+Compares the async /api/geocode handler with the old blocking geopy client
+
+Both run against a local fake geocoder with fixed latency, so the numbers only
+reflect how well concurrent lookups overlap on one event loop.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from fake_services import FakeGeocoder
+
+async def run_level(lookup, concurrency, rounds):
+    """Time ``rounds`` batches of ``concurrency`` simultaneous lookups"""
+    start = time.perf_counter()
+    for r in range(rounds):
+        names = [f"place {r}-{i}" for i in range(concurrency)]
+        await asyncio.gather(*(lookup(name) for name in names))
+    elapsed = time.perf_counter() - start
+    return concurrency * rounds / elapsed
+
+async def benchmark(levels, rounds, latency):
+    with FakeGeocoder(latency=latency) as service:
+        # Configure before importing so the app talks to the fake server
+        os.environ["GEOCODER_DOMAIN"] = service.domain
+        os.environ["GEOCODER_SCHEME"] = "http"
+        os.environ["GAZETTEER_PATH"] = ""
+        os.environ["POI_INDEX_PATH"] = ""
+        import backend_main
+        from geopy.geocoders import Nominatim
+
+        blocking = Nominatim(user_agent="blind_assistant_bench", domain=service.domain, scheme="http")
+
+        async def blocking_lookup(name):
+            # What the handlers used to do: a synchronous call inside async def
+            return blocking.geocode(name)
+
+        async def async_lookup(name):
+            return await backend_main.geocode_location(name)
+
+        print(f"Fake geocoder latency: {latency * 1000:.0f} ms")
+        print(f"{'concurrency':>11}  {'blocking req/s':>14}  {'async req/s':>11}  {'speedup':>7}")
+        for concurrency in levels:
+            blocking_rps = await run_level(blocking_lookup, concurrency, rounds)
+            async_rps = await run_level(async_lookup, concurrency, rounds)
+            print(f"{concurrency:>11}  {blocking_rps:>14.1f}  {async_rps:>11.1f}  {async_rps / blocking_rps:>6.1f}x")
+
+        await backend_main.geocoder.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Geocoding concurrency benchmark")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake server latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.levels, args.rounds, args.latency))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
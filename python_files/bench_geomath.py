@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Geodesic Math Benchmark for Blind Assistant
+Per-pair geopy/math loop vs vectorized geomath on random points around Delhi
+
+Times distance plus bearing plus compass direction from one origin to many
+candidates and for a many-to-many matrix, and reports the largest distance
+difference from geopy's geodesic.
+
+    python bench_geomath.py --points 20000 --matrix 300
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+from geopy.distance import geodesic
+
+import geomath
+
+def scalar_bearing(lat1, lon1, lat2, lon2):
+    """The per-pair bearing previously duplicated in direction.py and get_location.py"""
+    dlon = math.radians(lon2 - lon1)
+    lat1, lat2 = math.radians(lat1), math.radians(lat2)
+    y = math.sin(dlon) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+def scalar_one_to_many(origin, points):
+    results = []
+    for lat, lon in points:
+        distance = geodesic(origin, (lat, lon)).meters
+        bearing = scalar_bearing(origin[0], origin[1], lat, lon)
+        results.append((distance, geomath.COMPASS_POINTS[round(bearing / 45) % 8]))
+    return results
+
+def vector_one_to_many(origin, points, method):
+    distances = geomath.distance_m(origin[0], origin[1], points[:, 0], points[:, 1], method)
+    bearings = geomath.initial_bearing(origin[0], origin[1], points[:, 0], points[:, 1])
+    return distances, geomath.compass_direction(bearings)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized geodesic math")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--matrix", type=int, default=300, help="origins and destinations per side")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    origin = (28.6129, 77.2295)
+    points = np.column_stack([origin[0] + rng.uniform(-0.5, 0.5, args.points),
+                              origin[1] + rng.uniform(-0.5, 0.5, args.points)])
+
+    scalar, scalar_time = timed(scalar_one_to_many, origin, points)
+    print(f"One origin to {args.points} points (distance, bearing, direction):")
+    print(f"  {'geopy loop':<12} {scalar_time * 1000:9.1f} ms")
+    reference = np.array([distance for distance, _ in scalar])
+    for method in ("vincenty", "haversine"):
+        (distances, directions), seconds = timed(vector_one_to_many, origin, points, method)
+        error = np.abs(distances - reference).max()
+        same = np.mean(directions == np.array([direction for _, direction in scalar])) * 100
+        print(f"  {method:<12} {seconds * 1000:9.1f} ms  {scalar_time / seconds:7.0f}x  "
+              f"max error {error:9.4f} m  same direction {same:.1f}%")
+
+    side = points[:args.matrix]
+    start = time.perf_counter()
+    for a in side:
+        for b in side:
+            geodesic(tuple(a), tuple(b))
+    scalar_time = time.perf_counter() - start
+    print(f"\n{args.matrix}x{args.matrix} distance matrix:")
+    print(f"  {'geopy loop':<12} {scalar_time * 1000:9.1f} ms")
+    for method in ("vincenty", "haversine"):
+        _, seconds = timed(geomath.distance_matrix, side, side, method)
+        print(f"  {method:<12} {seconds * 1000:9.1f} ms  {scalar_time / seconds:7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark for Blind Assistant
+Measures what MetricsMiddleware and stage timers add to each request
+
+Requests are driven straight through the ASGI interface of a trivial FastAPI
+app, so the numbers are not hidden behind network or server overhead.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+
+import metrics
+
+def build_app(instrumented):
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"item_id": item_id}
+
+    return app
+
+async def drive(app, requests):
+    """Send ``requests`` GETs through the ASGI app; return seconds per request"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": f"/api/items/{i}", "raw_path": b"",
+            "query_string": b"", "root_path": "", "headers": [], "server": ("test", 80),
+            "client": ("test", 1234),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+def time_stage(iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.stage("bench.noop"):
+            pass
+    return (time.perf_counter() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics overhead benchmark")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Alternate the two apps and keep the best run of each to cancel out noise
+    plain_app, instrumented_app = build_app(False), build_app(True)
+    plain = instrumented = float("inf")
+    for _ in range(args.repeat):
+        plain = min(plain, asyncio.run(drive(plain_app, args.requests)))
+        instrumented = min(instrumented, asyncio.run(drive(instrumented_app, args.requests)))
+    stage_cost = time_stage(args.requests * 10)
+
+    start = time.perf_counter()
+    text = metrics.REGISTRY.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Request without metrics: {plain * 1e6:8.1f} us")
+    print(f"Request with metrics:    {instrumented * 1e6:8.1f} us "
+          f"(+{(instrumented - plain) * 1e6:.1f} us, {(instrumented / plain - 1) * 100:+.1f}%)")
+    print(f"stage() timer:           {stage_cost * 1e6:8.2f} us")
+    print(f"/metrics render:         {render_ms:8.2f} ms ({len(text)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
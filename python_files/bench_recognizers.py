@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Speech Recognizer Benchmark for Blind Assistant
+Latency and accuracy of each recognizer backend on recorded commands
+
+Each WAV is played through a MicSession like the live microphone. Latency is
+the time from the endpoint to the final transcript, so streaming backends
+that recognize during capture are measured the way the user experiences
+them. Accuracy is word error rate against the expected text and whether the
+transcript matches the intended command.
+
+Expected text comes from a ``transcripts.tsv`` (file name, tab, text) next
+to the recordings, or else from the file name ("take_me_to_india_gate.wav").
+Record a set of the commands with --record.
+
+    python bench_recognizers.py --record recordings
+    python bench_recognizers.py recordings/*.wav --backends vosk,google
+"""
+
+import argparse
+import glob
+import os
+import time
+import wave
+
+import speech_recognition as sr
+
+import recognizers
+from intents import match_intent
+from mic_session import MicSession
+
+RECORD_PHRASES = [
+    "navigate to india gate",
+    "take me to connaught place",
+    "what is in front",
+    "where am i",
+    "traffic",
+    "help",
+    "emergency",
+    "camera",
+]
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance divided by the reference length"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, guess in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (word != guess))
+    return row[-1] / max(1, len(ref))
+
+def expected_texts(paths):
+    texts = {}
+    for directory in {os.path.dirname(p) for p in paths}:
+        manifest = os.path.join(directory, "transcripts.tsv")
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                for line in f:
+                    name, _, text = line.rstrip("\n").partition("\t")
+                    if text:
+                        texts[os.path.join(directory, name)] = text
+    for path in paths:
+        if path not in texts:
+            texts[path] = os.path.splitext(os.path.basename(path))[0].replace("_", " ")
+    return texts
+
+def run(path, backend, grammar):
+    """Stream one file through a backend; returns (transcript text, latency seconds)"""
+    chain = recognizers.RecognizerChain([backend])
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, calibration=0.3)
+        try:
+            text = chain.listen(session, timeout=10, grammar=grammar).text
+        except (sr.UnknownValueError, sr.RequestError):
+            text = ""
+        except sr.WaitTimeoutError:
+            return "", 0.0
+        return text, time.perf_counter() - session.last_capture.endpointed_at
+
+def record(directory, phrases=RECORD_PHRASES):
+    """Prompt for each phrase and save it from the microphone"""
+    os.makedirs(directory, exist_ok=True)
+    session = MicSession().open()
+    with open(os.path.join(directory, "transcripts.tsv"), "a", encoding="utf-8") as manifest:
+        for i, phrase in enumerate(phrases):
+            input(f"Press Enter, then say: {phrase!r}")
+            audio = session.capture(timeout=10).audio
+            name = f"command_{i:02d}.wav"
+            with wave.open(os.path.join(directory, name), "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(audio.sample_width)
+                f.setframerate(audio.sample_rate)
+                f.writeframes(audio.frame_data)
+            manifest.write(f"{name}\t{phrase}\n")
+    session.close()
+    print(f"✅ Recorded {len(phrases)} commands to {directory}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech recognizer latency and accuracy")
+    parser.add_argument("wavs", nargs="*", help="WAV recordings of spoken commands")
+    parser.add_argument("--backends", default="vosk,google")
+    parser.add_argument("--no-grammar", action="store_true", help="free dictation for every backend")
+    parser.add_argument("--record", metavar="DIR", help="record the command set from the microphone")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+    paths = sorted(p for pattern in args.wavs for p in glob.glob(pattern) if p.endswith(".wav"))
+    if not paths:
+        parser.error("no WAV files given (record some with --record DIR)")
+
+    texts = expected_texts(paths)
+    grammar = None if args.no_grammar else recognizers.command_grammar()
+    for backend in recognizers.available_backends(args.backends):
+        latencies, errors, intents_ok = [], [], 0
+        print(f"\n📊 {backend.name}")
+        for path in paths:
+            text, latency = run(path, backend, grammar)
+            expected = texts[path]
+            wer = word_error_rate(expected, text)
+            wanted, got = match_intent(expected), match_intent(text)
+            correct = (wanted.name if wanted else None) == (got.name if got else None)
+            latencies.append(latency)
+            errors.append(wer)
+            intents_ok += correct
+            print(f"  {os.path.basename(path):<28} {latency * 1000:7.0f}ms  WER {wer:4.2f}  "
+                  f"{'✅' if correct else '❌'} {text!r}")
+        latencies.sort()
+        print(f"  p50 {latencies[len(latencies) // 2] * 1000:.0f}ms  max {latencies[-1] * 1000:.0f}ms  "
+              f"mean WER {sum(errors) / len(errors):.2f}  intent accuracy {intents_ok}/{len(paths)}")
+
+if __name__ == "__main__":
+    main()
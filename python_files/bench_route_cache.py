@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Route Cache Benchmark for Blind Assistant
+Hit rate and latency of RouteCache on simulated daily walks
+
+A few users walk between a handful of places every day, starting from
+GPS fixes with a few metres of noise. Requests go to a local FakeORS server
+with a fixed round-trip delay, once with the cache and once without.
+
+    python bench_route_cache.py --days 14 --latency 0.3 --jitter 4
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import openrouteservice
+
+from fake_services import FakeORS
+from route_cache import RouteCache
+
+PLACES = [
+    (77.2295, 28.6129),  # India Gate
+    (77.2190, 28.6315),  # Connaught Place
+    (77.2410, 28.6562),  # Red Fort
+    (77.2167, 28.6280),  # Janpath
+    (77.2500, 28.5933),  # Humayun's Tomb
+]
+
+def trips(days, users, routes_per_user, jitter_m, seed=0):
+    """Each user's fixed routes, walked once a day with noisy start points"""
+    rng = np.random.default_rng(seed)
+    pairs = [(a, b) for a in range(len(PLACES)) for b in range(len(PLACES)) if a != b]
+    routines = [[pairs[i] for i in rng.choice(len(pairs), routes_per_user, replace=False)] for _ in range(users)]
+    degrees = jitter_m / 111320.0
+    for _ in range(days):
+        for routine in routines:
+            for a, b in routine:
+                start = [PLACES[a][0] + rng.normal(0, degrees), PLACES[a][1] + rng.normal(0, degrees)]
+                yield [start, list(PLACES[b])]
+
+def main():
+    parser = argparse.ArgumentParser(description="Route cache hit rate on repeated walks")
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--routes", type=int, default=3, help="routes each user walks daily")
+    parser.add_argument("--jitter", type=float, default=4.0, help="GPS noise in metres")
+    parser.add_argument("--latency", type=float, default=0.1, help="fake ORS round trip in seconds")
+    parser.add_argument("--snap", type=int, default=4, help="decimals coordinates are snapped to")
+    args = parser.parse_args()
+
+    requests = list(trips(args.days, args.users, args.routes, args.jitter))
+    with FakeORS(latency=args.latency) as service, tempfile.TemporaryDirectory() as cache_dir:
+        client = openrouteservice.Client(base_url=service.url)
+        cache = RouteCache(cache_dir, snap_decimals=args.snap)
+
+        start = time.perf_counter()
+        for coordinates in requests:
+            cache.directions(client, coordinates)
+        cached_time = time.perf_counter() - start
+        cached_requests = service.requests
+
+        start = time.perf_counter()
+        for coordinates in requests:
+            client.directions(coordinates, profile="foot-walking", format="geojson")
+        direct_time = time.perf_counter() - start
+
+    stats = cache.stats()
+    print(f"{len(requests)} walks over {args.days} days, {args.jitter:.0f} m GPS noise, "
+          f"snapped to {args.snap} decimals")
+    print(f"  hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses), "
+          f"{cached_requests} requests to ORS instead of {len(requests)}")
+    print(f"  mean latency {cached_time / len(requests) * 1000:.1f} ms cached vs "
+          f"{direct_time / len(requests) * 1000:.1f} ms direct")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Offline Routing Benchmark for Blind Assistant
+Query time of A*, bidirectional Dijkstra and contraction hierarchies
+
+Without an extract, a synthetic city is generated: a grid of named streets
+and avenues with some blocks missing, a few footpaths, a motorway (not
+walkable) and a disconnected island. Random start/end pairs are routed with
+every method and the distances are checked against each other.
+
+    python bench_routing.py --grid 60 --queries 200
+    python bench_routing.py --osm delhi.osm --queries 100
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from routing import RoadGraph, Router
+
+ORIGIN = (28.60, 77.20)
+
+def write_grid_osm(path, rows=10, cols=10, spacing_m=100.0, missing=0.1, seed=0):
+    """Write a synthetic street grid as OSM XML; returns node id -> (lat, lon)"""
+    rng = np.random.default_rng(seed)
+    dlat = spacing_m / 111320.0
+    dlon = spacing_m / (111320.0 * np.cos(np.radians(ORIGIN[0])))
+    coords = {}
+    for r in range(rows):
+        for c in range(cols):
+            # Small offsets so streets are not perfectly straight
+            coords[r * cols + c + 1] = (ORIGIN[0] + r * dlat + rng.normal(0, dlat * 0.03),
+                                        ORIGIN[1] + c * dlon + rng.normal(0, dlon * 0.03))
+    node = lambda r, c: r * cols + c + 1
+    ways = []
+
+    def add_street(refs, tags):
+        # Split where blocks are missing
+        run = [refs[0]]
+        for ref in refs[1:]:
+            if rng.random() < missing:
+                if len(run) > 1:
+                    ways.append((run, tags))
+                run = [ref]
+            else:
+                run.append(ref)
+        if len(run) > 1:
+            ways.append((run, tags))
+
+    for r in range(rows):
+        add_street([node(r, c) for c in range(cols)], {"highway": "residential", "name": f"Street {r + 1}"})
+    for c in range(cols):
+        add_street([node(r, c) for r in range(rows)], {"highway": "tertiary", "name": f"Avenue {c + 1}"})
+    for r in range(0, rows - 1, 3):
+        c = int(rng.integers(0, cols - 1))
+        ways.append(([node(r, c), node(r + 1, c + 1)], {"highway": "footway"}))
+    # Diagonal motorway and private road: faster on paper, but not walkable
+    ways.append(([node(i, i) for i in range(min(rows, cols))], {"highway": "motorway", "name": "Ring Road"}))
+    ways.append(([node(0, 0), node(rows - 1, cols - 1)], {"highway": "service", "access": "private"}))
+    # Island that must be dropped as a separate component
+    island = max(coords) + 1
+    coords[island] = (ORIGIN[0] - 5 * dlat, ORIGIN[1])
+    coords[island + 1] = (ORIGIN[0] - 5 * dlat, ORIGIN[1] + dlon)
+    ways.append(([island, island + 1], {"highway": "footway", "name": "Island Path"}))
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<osm version="0.6">\n')
+        for ref, (lat, lon) in coords.items():
+            f.write(f'  <node id="{ref}" lat="{lat:.7f}" lon="{lon:.7f}"/>\n')
+        for i, (refs, tags) in enumerate(ways, 1):
+            f.write(f'  <way id="{i}">\n')
+            for ref in refs:
+                f.write(f'    <nd ref="{ref}"/>\n')
+            for key, value in tags.items():
+                f.write(f'    <tag k="{key}" v="{value}"/>\n')
+            f.write('  </way>\n')
+        f.write('</osm>\n')
+    return coords
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline routing query benchmark")
+    parser.add_argument("--osm", help="OSM extract (default: synthetic grid)")
+    parser.add_argument("--grid", type=int, default=60, help="synthetic grid size per side")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--no-ch", action="store_true", help="skip contraction hierarchy preprocessing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.osm
+        if not path:
+            path = os.path.join(tmp, "grid.osm")
+            write_grid_osm(path, args.grid, args.grid)
+        start = time.perf_counter()
+        graph = RoadGraph.from_osm(path)
+        print(f"Graph: {len(graph)} nodes, {graph.edge_count} edges, built in {time.perf_counter() - start:.2f} s")
+        methods = ["astar", "bidijkstra"]
+        if not args.no_ch:
+            start = time.perf_counter()
+            graph.contract()
+            print(f"Contraction hierarchy: {time.perf_counter() - start:.2f} s, "
+                  f"{len(graph.ch[2])} upward edges")
+            methods.append("ch")
+        graph_path = os.path.join(tmp, "graph.npz")
+        graph.save(graph_path)
+        start = time.perf_counter()
+        graph = RoadGraph.load(graph_path)
+        print(f"Saved graph loads in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"({os.path.getsize(graph_path) / 1e6:.1f} MB)")
+
+    rng = np.random.default_rng(1)
+    pairs = rng.integers(0, len(graph), size=(args.queries, 2))
+    distances = {}
+    for method in methods:
+        router = Router(graph, method)
+        samples = []
+        distances[method] = []
+        for source, target in pairs:
+            start = time.perf_counter()
+            distance, _ = router.shortest_path(int(source), int(target))
+            samples.append(time.perf_counter() - start)
+            distances[method].append(distance)
+        samples.sort()
+        print(f"  {method:<11} p50 {samples[len(samples) // 2] * 1000:7.2f} ms  "
+              f"p99 {samples[int(len(samples) * 0.99)] * 1000:7.2f} ms")
+    reference = np.array(distances["bidijkstra"])
+    for method in methods:
+        error = np.abs(np.array(distances[method]) - reference).max()
+        print(f"  {method:<11} max difference from bidirectional Dijkstra {error:.6f} m")
+
+    router = Router(graph)
+    start = time.perf_counter()
+    router.route([(graph.longitudes[pairs[0][0]], graph.latitudes[pairs[0][0]]),
+                  (graph.longitudes[pairs[0][1]], graph.latitudes[pairs[0][1]])])
+    print(f"Full route with steps ({router.method}): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
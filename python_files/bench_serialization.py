@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark for Blind Assistant
+Compares JSON encoders, detection layouts and compression on the wire
+
+Reports encode time per response and the bytes sent for detection results
+(row vs columnar layout) and a 100-name batch geocode stream (plain, gzip and,
+when installed, brotli).
+
+    python bench_serialization.py --objects 1 10 100
+"""
+
+import argparse
+import random
+import time
+
+import serialization
+
+def make_detections(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "type": "face",
+            "confidence": 0.85,
+            "bbox": [rng.randint(0, 1280), rng.randint(0, 720), rng.randint(24, 300), rng.randint(24, 300)],
+            "description": "Human face detected"
+        }
+        for _ in range(n)
+    ]
+
+def make_batch(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "success": True,
+            "latitude": 28.4 + rng.random() * 0.5,
+            "longitude": 76.9 + rng.random() * 0.6,
+            "address": f"Place {i}, Block {rng.randint(1, 40)}, New Delhi, Delhi, 110001, India",
+            "place_name": f"Place {i}"
+        }
+        for i in range(n)
+    ]
+
+def time_per_call(func, arg, repeat):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(arg)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization benchmark")
+    parser.add_argument("--objects", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--batch", type=int, default=100, help="Names in the batch geocode stream")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    backends = ["stdlib"] + (["orjson"] if serialization.orjson else [])
+    if serialization.orjson is None:
+        print("⚠️  orjson not installed, only the standard library is measured")
+
+    print("Detection responses")
+    print(f"{'objects':>8} {'layout':>9} {'bytes':>7} " + " ".join(f"{b + ' us':>10}" for b in backends))
+    for n in args.objects:
+        objects = make_detections(n)
+        for layout in ("objects", "columnar"):
+            if layout == "columnar":
+                payload = serialization.columnar(objects)
+                payload["layout"] = "columnar"
+            else:
+                payload = {"objects": objects}
+            payload["count"] = n
+            size = len(serialization.get_dumps("stdlib")(payload))
+            times = [time_per_call(serialization.get_dumps(b), payload, args.repeat) * 1e6 for b in backends]
+            print(f"{n:>8} {layout:>9} {size:>7} " + " ".join(f"{t:>10.1f}" for t in times))
+
+    print()
+    print(f"Batch geocode stream ({args.batch} names)")
+    items = make_batch(args.batch)
+    for backend in backends:
+        dumps = serialization.get_dumps(backend)
+        encode_stream = lambda items: b"".join(dumps(item) + b"\n" for item in items)
+        print(f"  {backend:<8} encode {time_per_call(encode_stream, items, args.repeat // 10) * 1e6:8.1f} us")
+    body = b"".join(serialization.dumps(item) + b"\n" for item in items)
+    print(f"  {'identity':<8} {len(body):>8} bytes")
+    for encoding in ("gzip", "br"):
+        if encoding == "br" and serialization.brotli is None:
+            print("  br       (brotli not installed)")
+            continue
+        start = time.perf_counter()
+        compressed = serialization.compress(body, encoding)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"  {encoding:<8} {len(compressed):>8} bytes  ({len(compressed) / len(body):.0%}, {elapsed:.0f} us)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Multi-worker Serving Benchmark for Blind Assistant
+Measures /api/detect throughput of serve.py at different worker counts
+
+Each run starts the production server on a local port, posts camera frames
+from web_app/temp with several concurrent clients for a fixed time and
+reports requests per second.
+"""
+
+import argparse
+import asyncio
+import base64
+import glob
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FRAMES_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "web_app", "temp")
+
+def load_frames(limit=10):
+    frames = []
+    for path in sorted(glob.glob(os.path.join(FRAMES_DIR, "*.jpg")))[:limit]:
+        with open(path, "rb") as f:
+            frames.append(base64.b64encode(f.read()).decode("ascii"))
+    return frames
+
+async def wait_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url + "/api/health") as resp:
+                    if resp.status == 200:
+                        return True
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    return False
+
+async def load(url, frames, concurrency, duration):
+    """Post frames from ``concurrency`` clients for ``duration`` seconds"""
+    done = 0
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def client(i):
+        nonlocal done, errors
+        async with aiohttp.ClientSession() as session:
+            n = i
+            while time.monotonic() < deadline:
+                payload = {"image_data": frames[n % len(frames)]}
+                n += 1
+                async with session.post(url + "/api/detect", json=payload) as resp:
+                    await resp.read()
+                    if resp.status == 200:
+                        done += 1
+                    else:
+                        errors += 1
+
+    start = time.monotonic()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return done / (time.monotonic() - start), errors
+
+def run_level(workers, frames, port, duration):
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(SCRIPT_DIR, "serve.py"), "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        if not asyncio.run(wait_ready(url)):
+            raise RuntimeError("server did not start")
+        # Short warm-up so every worker has touched its models
+        asyncio.run(load(url, frames, workers * 2, 1.0))
+        return asyncio.run(load(url, frames, workers * 2, duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-worker /api/detect throughput benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    frames = load_frames()
+    if not frames:
+        print(f"❌ No frames found in {FRAMES_DIR}")
+        return 1
+
+    print(f"{'workers':>7}  {'req/s':>8}  {'scaling':>7}  {'errors':>6}")
+    baseline = None
+    for workers in args.workers:
+        rps, errors = run_level(workers, frames, args.port, args.duration)
+        baseline = baseline or rps / workers
+        print(f"{workers:>7}  {rps:>8.1f}  {rps / baseline:>6.2f}x  {errors:>6}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
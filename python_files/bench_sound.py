@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Alert Sound Latency Benchmark for Blind Assistant
+Time from trigger to playback start for preloaded vs on-demand sounds
+
+Runs on SDL's dummy audio driver by default, so it works headless and
+measures our side of the latency (decode, channel setup) rather than the
+sound card. Set SDL_AUDIODRIVER to measure a real device.
+
+    python bench_sound.py --triggers 200
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import sound_bank
+
+def summarize(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f"p50 {pick(0.5):8.3f} ms  p99 {pick(0.99):8.3f} ms  max {samples[-1] * 1000:8.3f} ms"
+
+def measure(trigger, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        trigger()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert sound trigger latency")
+    parser.add_argument("--triggers", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bank = sound_bank.SoundBank().load_defaults()
+    print(f"Driver: {os.environ['SDL_AUDIODRIVER']}, mixer {pygame.mixer.get_init()}, "
+          f"bank loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    rate = pygame.mixer.get_init()[0]
+    print(f"Mixer buffer {sound_bank.MIXER_BUFFER} frames adds ~{sound_bank.MIXER_BUFFER / rate * 1000:.1f} ms of output latency")
+
+    def on_demand():
+        pygame.mixer.Sound(sound_bank.ALERT_SOUND).play()
+
+    def music_stream():
+        pygame.mixer.music.load(sound_bank.ALERT_SOUND)
+        pygame.mixer.music.play()
+
+    results = {
+        "preloaded alert": measure(lambda: bank.play("alert"), args.triggers),
+        "preloaded tone": measure(lambda: bank.play("vehicle"), args.triggers),
+        "decode + play": measure(on_demand, max(10, args.triggers // 10)),
+        "music load + play": measure(music_stream, max(10, args.triggers // 10)),
+    }
+    for name, samples in results.items():
+        print(f"{name:>18}: {summarize(samples)}")
+
+    # Overlap: a burst uses every reserved channel at once
+    pygame.mixer.stop()
+    for name in ("alert", "vehicle", "obstacle", "confirm"):
+        bank.play(name)
+    busy = sum(channel.get_busy() for channel in bank.channels)
+    print(f"Overlapping alerts: {busy}/{len(bank.channels)} reserved channels busy")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Texture Upload Benchmark for Blind Assistant
+Per-frame display cost of the old copy-and-recreate path vs FrameTexture
+
+Always measures the CPU-side preparation (flip + tobytes vs a buffer view).
+With --gl and a working Kivy window it also times the full upload: a new
+texture per frame vs one reused texture flipped through its UVs.
+
+    python bench_texture.py --frames 300
+    python bench_texture.py --gl
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+import texture_upload
+from texture_upload import FrameTexture, frame_buffer
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080)}
+
+class _Canvas:
+    def ask_update(self):
+        pass
+
+class _Widget:
+    """Stand-in for a Kivy Image: holds the texture and a canvas"""
+
+    def __init__(self):
+        self.texture = None
+        self.canvas = _Canvas()
+
+def legacy_prepare(frame):
+    return cv2.flip(frame, 0).tobytes()
+
+def legacy_upload(frame, widget):
+    buf = cv2.flip(frame, 0).tobytes()
+    texture = texture_upload.Texture.create(size=(frame.shape[1], frame.shape[0]), colorfmt="bgr")
+    texture.blit_buffer(buf, colorfmt="bgr", bufferfmt="ubyte")
+    widget.texture = texture
+
+def frame_time_ms(func, frames):
+    """Best-of-3 mean milliseconds per call over the given frames"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for frame in frames:
+            func(frame)
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best * 1000
+
+def make_frames(size, count):
+    rng = np.random.default_rng(0)
+    width, height = size
+    # A few distinct frames cycled, like a camera feed
+    distinct = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(4)]
+    return [distinct[i % len(distinct)] for i in range(count)]
+
+def init_gl():
+    """Create a Kivy window for a GL context; True on success"""
+    if texture_upload.Texture is None:
+        print("⚠️  Kivy not installed: skipping GPU upload timings")
+        return False
+    try:
+        from kivy.core.window import Window
+        return Window is not None
+    except Exception as e:
+        print(f"⚠️  No GL context available ({e}): skipping GPU upload timings")
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Texture upload benchmark")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--gl", action="store_true", help="Also time real Kivy texture uploads")
+    args = parser.parse_args()
+
+    gl = init_gl() if args.gl else False
+
+    header = f"{'resolution':>10} {'flip+tobytes ms':>16} {'buffer view ms':>15}"
+    if gl:
+        header += f" {'new texture ms':>15} {'reused ms':>10}"
+    print(header)
+    for name, size in RESOLUTIONS.items():
+        frames = make_frames(size, args.frames)
+        row = f"{name:>10} {frame_time_ms(legacy_prepare, frames):>16.3f} {frame_time_ms(frame_buffer, frames):>15.4f}"
+        if gl:
+            widget = _Widget()
+            display = FrameTexture(_Widget())
+            row += f" {frame_time_ms(lambda f: legacy_upload(f, widget), frames):>15.3f}"
+            row += f" {frame_time_ms(display.show, frames):>10.3f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Voice Capture Latency Benchmark for Blind Assistant
+End-of-speech to transcript latency, MicSession vs Recognizer.listen
+
+Each WAV file is played through speech_recognition's AudioFile source. The
+endpoint lag is how much audio past the true end of speech a capture method
+consumes before returning, which on a live microphone is real waiting time.
+The old path calibrates for one second and waits for the recognizer's 0.8 s
+pause; MicSession keeps its calibration and stops after END_SILENCE.
+Without arguments, synthetic fixtures are generated.
+
+    python bench_voice.py                       # synthetic fixtures
+    python bench_voice.py recordings/*.wav --recognizer google
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+import wave
+
+import numpy as np
+import speech_recognition as sr
+
+from mic_session import FRAME_SECONDS, MicSession, frame_energy
+
+def synthesize_speech(seconds, rate, seed=0):
+    """Voiced, syllable-modulated signal standing in for speech"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 120 + 30 * rng.random()
+    voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+    syllables = 0.55 + 0.45 * np.sin(2 * np.pi * 4.0 * t) ** 2
+    return voiced * syllables * 3500
+
+def write_fixture(path, lead=0.8, speech=1.2, tail=1.5, rate=16000, noise=80, seed=0, phrases=1, gap=1.5):
+    """Write noise, speech, noise WAV; returns the end time of each phrase"""
+    rng = np.random.default_rng(seed)
+    parts = [np.zeros(int(lead * rate))]
+    ends = []
+    position = lead
+    for i in range(phrases):
+        if i:
+            parts.append(np.zeros(int(gap * rate)))
+            position += gap
+        parts.append(synthesize_speech(speech, rate, seed + i))
+        position += speech
+        ends.append(position)
+    parts.append(np.zeros(int(tail * rate)))
+    signal = np.concatenate(parts)
+    signal = signal + rng.normal(0, noise, len(signal))
+    samples = np.clip(signal, -32768, 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+    return ends
+
+def speech_end_of(path):
+    """Offline estimate of when speech ends: last loud frame in the file"""
+    with wave.open(path, "rb") as f:
+        rate, width, channels = f.getframerate(), f.getsampwidth(), f.getnchannels()
+        data = f.readframes(f.getnframes())
+    step = int(rate * FRAME_SECONDS) * width * channels
+    energies = np.array([frame_energy(data[i:i + step], width) for i in range(0, len(data) - step + 1, step)])
+    noise = np.percentile(energies, 20)
+    loud = np.nonzero(energies > max(150, 3 * noise))[0]
+    return None if not len(loud) else (loud[-1] + 1) * FRAME_SECONDS
+
+class _CountingStream:
+    """Wraps a source stream to count how much audio was consumed"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.bytes += len(data)
+        return data
+
+def measure_session(path, recognize):
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, calibration=0.3)
+        capture = session.capture(timeout=10)
+    start = time.perf_counter()
+    transcript = recognize(capture.audio)
+    return capture.endpoint, time.perf_counter() - start, transcript
+
+def measure_baseline(path, recognize):
+    """The previous get_location path: calibrate 1 s, then Recognizer.listen"""
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(path) as source:
+        source.stream = counter = _CountingStream(source.stream)
+        recognizer.adjust_for_ambient_noise(source)
+        audio = recognizer.listen(source, timeout=10)
+        consumed = counter.bytes / (source.SAMPLE_WIDTH * source.SAMPLE_RATE)
+    start = time.perf_counter()
+    transcript = recognize(audio)
+    return consumed, time.perf_counter() - start, transcript
+
+def get_recognizer(name):
+    if name == "none":
+        return lambda audio: ""
+    recognizer = sr.Recognizer()
+    def recognize(audio):
+        try:
+            return recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            return ""
+    return recognize
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice capture latency benchmark")
+    parser.add_argument("wavs", nargs="*", help="WAV recordings (default: synthetic fixtures)")
+    parser.add_argument("--recognizer", default="none", choices=["none", "google"])
+    args = parser.parse_args()
+
+    paths = [p for pattern in args.wavs for p in glob.glob(pattern)]
+    tmpdir = None
+    if not paths:
+        tmpdir = tempfile.TemporaryDirectory()
+        for i, (speech, noise) in enumerate([(0.6, 60), (1.2, 80), (2.0, 150), (1.0, 300)]):
+            path = os.path.join(tmpdir.name, f"synthetic_{i}.wav")
+            # Lead-in longer than the old path's 1 s calibration
+            write_fixture(path, lead=1.3, speech=speech, noise=noise, seed=i)
+            paths.append(path)
+
+    recognize = get_recognizer(args.recognizer)
+    print(f"{'file':<22} {'speech end':>10} {'session lag':>12} {'listen lag':>11} {'recognize':>10}  transcript")
+    for path in paths:
+        end = speech_end_of(path)
+        if end is None:
+            print(f"{os.path.basename(path):<22} no speech found")
+            continue
+        try:
+            session_end, recog_time, transcript = measure_session(path, recognize)
+            session_lag = f"{(session_end - end) * 1000:10.0f}ms"
+        except sr.WaitTimeoutError:
+            session_lag, recog_time, transcript = "timeout", 0.0, ""
+        try:
+            baseline_end, _, _ = measure_baseline(path, lambda audio: "")
+            baseline_lag = f"{(baseline_end - end) * 1000:9.0f}ms"
+        except sr.WaitTimeoutError:
+            baseline_lag = "timeout"
+        print(f"{os.path.basename(path):<22} {end:>9.2f}s {session_lag:>12} {baseline_lag:>11} "
+              f"{recog_time * 1000:>8.0f}ms  {transcript}")
+    print("Lag = audio consumed after speech ended; the old path also spends 1 s calibrating first.")
+
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+if __name__ == "__main__":
+    main()
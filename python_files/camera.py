@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Camera Capture for Blind Assistant
+Reads the camera on a background thread and keeps only the newest frame
+
+cap.read() blocks until the driver hands over a frame, and drivers queue
+several frames, so reading on the UI thread both stalls rendering and returns
+old images. CameraStream asks the driver for a one-frame buffer (and MJPG,
+which most USB webcams deliver at full rate), reads continuously on its own
+thread and publishes each frame into a single slot. Readers take whatever is
+newest without waiting; frames nobody picked up are simply replaced.
+
+Published frames are shared between readers: treat them as read-only and copy
+before drawing on them.
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+CAMERA_INDEX = os.getenv("CAMERA_INDEX", "0")
+CAMERA_WIDTH = int(os.getenv("CAMERA_WIDTH", "0"))
+CAMERA_HEIGHT = int(os.getenv("CAMERA_HEIGHT", "0"))
+CAMERA_FOURCC = os.getenv("CAMERA_FOURCC", "MJPG")
+# Weight of the newest frame interval in the fps average
+FPS_ALPHA = 0.1
+
+# seq counts frames captured so far; a reader seeing the same seq twice has no new frame
+Frame = namedtuple("Frame", ["image", "timestamp", "seq"])
+
+def _source(value):
+    """Camera index for numeric strings, otherwise a file or stream URL"""
+    return int(value) if str(value).isdigit() else value
+
+class CameraStream:
+    """Background camera reader exposing the latest frame"""
+
+    def __init__(self, source=CAMERA_INDEX, width=CAMERA_WIDTH, height=CAMERA_HEIGHT, fourcc=CAMERA_FOURCC):
+        self.source = _source(source)
+        self.width = width
+        self.height = height
+        self.fourcc = fourcc
+        self.fps = 0.0
+        self.frames = 0
+        self.failures = 0
+        self._latest = None  # a Frame; replaced whole, so readers need no lock
+        self._cap = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open camera {self.source!r}")
+        # Both are hints: drivers that do not support them ignore them
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        return cap
+
+    def start(self):
+        """Open the camera and start the capture thread"""
+        if self._thread is not None:
+            return self
+        self._cap = self._open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="camera", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        last = None
+        while not self._stop.is_set():
+            ret, image = self._cap.read()
+            now = time.perf_counter()
+            if not ret:
+                self.failures += 1
+                time.sleep(0.01)
+                continue
+            self.frames += 1
+            self._latest = Frame(image, now, self.frames)
+            if last is not None and now > last:
+                rate = 1.0 / (now - last)
+                self.fps = rate if not self.fps else self.fps + FPS_ALPHA * (rate - self.fps)
+            last = now
+
+    def latest(self):
+        """Newest Frame, or None before the first frame arrives"""
+        return self._latest
+
+    def frame_age(self):
+        """Seconds since the newest frame was captured, or None"""
+        frame = self._latest
+        return None if frame is None else time.perf_counter() - frame.timestamp
+
+    def wait_for_frame(self, timeout=5.0):
+        """Block until a first frame is available; returns it or None"""
+        deadline = time.perf_counter() + timeout
+        while self._latest is None and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        return self._latest
+
+    def stats(self):
+        age = self.frame_age()
+        return {
+            "capture_fps": round(self.fps, 1),
+            "frame_age_ms": None if age is None else round(age * 1000, 1),
+            "frames": self.frames,
+            "failures": self.failures,
+        }
+
+    def stop(self):
+        """Stop the capture thread and release the camera"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cascade Detection Helpers for Blind Assistant
+Runs Haar cascades at a reduced working resolution and maps boxes back
+
+Scanning a 720p or 1080p frame makes detectMultiScale walk a deep image
+pyramid. Here the image is brought down to DETECTION_WIDTH pixels wide first:
+encoded images are decoded straight to a reduced grayscale image with
+cv2.IMREAD_REDUCED_GRAYSCALE_2/4/8, and camera frames are resized once. The
+cascade then runs over a bounded size range and boxes are scaled back to the
+original image coordinates. Set DETECTION_WIDTH=0 to detect at full size.
+"""
+
+import os
+import struct
+
+import cv2
+import numpy as np
+
+DETECTION_WIDTH = int(os.getenv("DETECTION_WIDTH", "640"))
+# Smallest and largest object sizes searched, in working-resolution pixels
+DETECTION_MIN_SIZE = int(os.getenv("DETECTION_MIN_SIZE", "24"))
+DETECTION_MAX_SIZE = int(os.getenv("DETECTION_MAX_SIZE", "0"))
+SCALE_FACTOR = 1.1
+MIN_NEIGHBORS = 4
+
+_REDUCED_GRAYSCALE = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+def image_size(data):
+    """(width, height) from a JPEG or PNG header without decoding, else None"""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return width, height
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0xFF) or 0xD0 <= marker <= 0xD7:
+            i += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        # Start-of-frame markers carry the dimensions (C4, C8 and CC are not SOF)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    return None
+
+def reduction_factor(width, target_width=DETECTION_WIDTH):
+    """Largest JPEG decode reduction (1, 2, 4 or 8) keeping at least target_width"""
+    factor = 1
+    if target_width:
+        while factor < 8 and width // (factor * 2) >= target_width:
+            factor *= 2
+    return factor
+
+def decode_gray(data, target_width=DETECTION_WIDTH):
+    """Decode image bytes to a reduced grayscale array and its scale, or (None, 1.0)
+
+    The scale is working size / original size, so original = box / scale.
+    """
+    size = image_size(data)
+    factor = reduction_factor(size[0], target_width) if size else 1
+    gray = cv2.imdecode(np.frombuffer(data, np.uint8), _REDUCED_GRAYSCALE[factor])
+    if gray is None:
+        return None, 1.0
+    scale = 1.0 / factor
+    # Finish with a resize when the reduced decode is still much too large
+    if target_width and gray.shape[1] > target_width * 1.25:
+        gray, resize_scale = _resize(gray, target_width)
+        scale *= resize_scale
+    return gray, scale
+
+def _resize(image, target_width):
+    scale = target_width / image.shape[1]
+    height = max(1, round(image.shape[0] * scale))
+    return cv2.resize(image, (target_width, height), interpolation=cv2.INTER_AREA), scale
+
+def to_working_gray(frame, target_width=DETECTION_WIDTH):
+    """Grayscale copy of a BGR frame at the working resolution, and its scale"""
+    scale = 1.0
+    if target_width and frame.shape[1] > target_width:
+        frame, scale = _resize(frame, target_width)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), scale
+
+def detect(cascade, gray, scale=1.0, min_size=DETECTION_MIN_SIZE, max_size=DETECTION_MAX_SIZE):
+    """Run a cascade on a working-resolution image; boxes in original coordinates"""
+    kwargs = {"minSize": (min_size, min_size)}
+    if max_size:
+        kwargs["maxSize"] = (max_size, max_size)
+    boxes = cascade.detectMultiScale(gray, SCALE_FACTOR, MIN_NEIGHBORS, **kwargs)
+    if len(boxes) == 0:
+        return []
+    return [
+        (int(round(x / scale)), int(round(y / scale)), int(round(w / scale)), int(round(h / scale)))
+        for (x, y, w, h) in boxes
+    ]
+
+def detect_in_frame(cascade, frame, target_width=DETECTION_WIDTH):
+    """Downscale a BGR frame, run the cascade and return original-size boxes"""
+    gray, scale = to_working_gray(frame, target_width)
+    return detect(cascade, gray, scale)
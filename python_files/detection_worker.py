@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Background Detection for Blind Assistant
+Runs the cascade on the newest camera frame off the UI thread
+
+DetectionWorker pulls the latest frame from a CameraStream, detects on it and
+publishes the boxes with the frame they came from. The UI keeps rendering
+every camera frame and draws the most recent boxes on top, so the display
+frame rate no longer drops to the detector's. Frames that arrive while a
+detection is running are skipped, never queued. A thread is enough here:
+OpenCV releases the GIL inside detectMultiScale.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import detection
+
+# Weight of the newest interval in the fps average
+FPS_ALPHA = 0.2
+
+# frame_seq/frame_timestamp identify the camera frame the boxes belong to
+Detections = namedtuple("Detections", ["boxes", "frame_seq", "frame_timestamp", "finished_at", "seq"])
+
+class DetectionWorker:
+    """Detects on the newest camera frame in a loop while active"""
+
+    def __init__(self, camera, cascade, target_width=detection.DETECTION_WIDTH, idle_wait=0.005):
+        self.camera = camera
+        self.cascade = cascade
+        self.target_width = target_width
+        self.idle_wait = idle_wait
+        self.fps = 0.0
+        self.latency = None  # seconds from frame capture to published result
+        self.runs = 0
+        self._latest = None
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="detection", daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def active(self):
+        return self._active.is_set()
+
+    def set_active(self, active):
+        """Start or pause detecting; pausing drops the last result"""
+        if active:
+            self._active.set()
+        else:
+            self._active.clear()
+            self._latest = None
+
+    def _run(self):
+        last_seq = 0
+        last_finish = None
+        while not self._stop.is_set():
+            if not self._active.wait(0.1):
+                last_finish = None
+                continue
+            frame = self.camera.latest()
+            if frame is None or frame.seq == last_seq:
+                time.sleep(self.idle_wait)
+                continue
+            last_seq = frame.seq
+
+            try:
+                boxes = detection.detect_in_frame(self.cascade, frame.image, self.target_width)
+            except Exception as e:
+                print(f"Detection error: {e}")
+                time.sleep(0.1)
+                continue
+            finished = time.perf_counter()
+
+            if not self._active.is_set():
+                continue
+            self.runs += 1
+            self._latest = Detections(boxes, frame.seq, frame.timestamp, finished, self.runs)
+            self.latency = finished - frame.timestamp
+            if last_finish is not None and finished > last_finish:
+                rate = 1.0 / (finished - last_finish)
+                self.fps = rate if not self.fps else self.fps + FPS_ALPHA * (rate - self.fps)
+            last_finish = finished
+
+    def latest(self):
+        """Most recent Detections, or None"""
+        return self._latest
+
+    def stats(self):
+        return {
+            "detection_fps": round(self.fps, 1),
+            "detection_latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            "runs": self.runs,
+        }
+
+    def stop(self):
+        self._stop.set()
+        self._active.set()  # wake the loop so it can exit
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
@@ -5,17 +5,24 @@ Provides basic direction and distance calculations
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
-import math
+import gazetteer
+import geomath
+import route_cache
+import routing
+from spatial_index import get_spatial_index
 
 # Initialize geocoder
 geolocator = Nominatim(user_agent="blind_assistant")
 
+# Start and end points are geocoded side by side
+executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="direction")
+
 def get_coordinates(place_name):
     """Get coordinates for a place"""
     try:
-        location = geolocator.geocode(place_name)
+        location = gazetteer.geocode(place_name, geolocator)
         if location:
             return (location.latitude, location.longitude)
         return None
@@ -23,52 +30,26 @@ def get_coordinates(place_name):
         print(f"Error getting coordinates for {place_name}: {e}")
         return None
 
+def resolve_endpoints(start_place, end_place):
+    """Geocode both places concurrently; returns (start_coords, end_coords)"""
+    start = executor.submit(get_coordinates, start_place)
+    end = executor.submit(get_coordinates, end_place)
+    return start.result(), end.result()
+
 def calculate_distance(coord1, coord2):
     """Calculate distance between two coordinates"""
-    return geodesic(coord1, coord2).kilometers
+    return geomath.vincenty_m(coord1[0], coord1[1], coord2[0], coord2[1]) / 1000
 
 def calculate_bearing(coord1, coord2):
     """Calculate bearing from coord1 to coord2"""
-    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-    
-    dlon = lon2 - lon1
-    
-    y = math.sin(dlon) * math.cos(lat2)
-    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-    
-    bearing = math.atan2(y, x)
-    bearing = math.degrees(bearing)
-    bearing = (bearing + 360) % 360
-    
-    return bearing
+    return geomath.initial_bearing(coord1[0], coord1[1], coord2[0], coord2[1])
 
 def bearing_to_direction(bearing):
     """Convert bearing to compass direction"""
-    directions = [
-        "North", "North-East", "East", "South-East",
-        "South", "South-West", "West", "North-West"
-    ]
-    
-    index = round(bearing / 45) % 8
-    return directions[index]
+    return geomath.compass_direction(bearing)
 
-def get_basic_directions(start_place, end_place):
-    """Get basic directions between two places"""
-    print(f"\n🧭 Getting directions from {start_place} to {end_place}...")
-    
-    # Get coordinates
-    start_coords = get_coordinates(start_place)
-    end_coords = get_coordinates(end_place)
-    
-    if not start_coords:
-        print(f"❌ Could not find coordinates for {start_place}")
-        return None
-    
-    if not end_coords:
-        print(f"❌ Could not find coordinates for {end_place}")
-        return None
-    
+def basic_directions(start_coords, end_coords):
+    """Distance and compass direction between two (lat, lon) points"""
     print(f"📍 Start: {start_coords}")
     print(f"📍 End: {end_coords}")
     
@@ -88,65 +69,127 @@ def get_basic_directions(start_place, end_place):
         'direction': direction
     }
 
-def get_advanced_directions(start_place, end_place):
-    """Get advanced directions using OpenRouteService if available"""
+def get_basic_directions(start_place, end_place, endpoints=None):
+    """Get basic directions between two places
+
+    ``endpoints`` is an already resolved (start_coords, end_coords) pair.
+    """
+    print(f"\n🧭 Getting directions from {start_place} to {end_place}...")
     
-    # Check for API key
-    api_key = os.getenv('OPENROUTESERVICE_API_KEY')
-    if not api_key:
-        print("⚠️  OpenRouteService API key not found.")
-        print("   Set OPENROUTESERVICE_API_KEY environment variable for detailed directions.")
-        print("   Falling back to basic directions...")
-        return get_basic_directions(start_place, end_place)
+    # Get coordinates
+    start_coords, end_coords = endpoints or resolve_endpoints(start_place, end_place)
     
-    try:
+    if not start_coords:
+        print(f"❌ Could not find coordinates for {start_place}")
+        return None
+    
+    if not end_coords:
+        print(f"❌ Could not find coordinates for {end_place}")
+        return None
+    
+    return basic_directions(start_coords, end_coords)
+
+def get_nearby_places(coords, radius=500, limit=5):
+    """List known places around a (lat, lon) with distance and direction"""
+    index = get_spatial_index()
+    if index is None:
+        return []
+
+    places = index.within(coords[0], coords[1], radius, limit=limit)
+    if not places:
+        return []
+    # All bearings in one call
+    bearings = geomath.initial_bearing(coords[0], coords[1],
+                                       [place.latitude for place in places],
+                                       [place.longitude for place in places])
+    directions = geomath.compass_direction(bearings)
+    return [
+        {
+            'name': place.name,
+            'coords': (place.latitude, place.longitude),
+            'distance': place.distance,
+            'direction': str(direction)
+        }
+        for place, direction in zip(places, directions)
+    ]
+
+def advanced_directions(start_coords, end_coords, api_key=None, start_name="start", end_name="destination"):
+    """Walking route between two (lat, lon) points
+
+    Uses OpenRouteService with an API key, otherwise the offline walking
+    graph (see routing.py).
+    """
+    coords = ((start_coords[1], start_coords[0]), (end_coords[1], end_coords[0]))  # (lon, lat)
+    if api_key:
         import openrouteservice
         
-        # Get coordinates
-        start_coords = get_coordinates(start_place)
-        end_coords = get_coordinates(end_place)
-        
-        if not start_coords or not end_coords:
-            return get_basic_directions(start_place, end_place)
-        
         # Initialize client
         client = openrouteservice.Client(key=api_key)
         
-        # Get route
-        coords = ((end_coords[1], end_coords[0]), (start_coords[1], start_coords[0]))  # (lon, lat)
-        route = client.directions(coords, profile='foot-walking', format='geojson')
-        
-        # Extract steps
-        steps = route['features'][0]['properties']['segments'][0]['steps']
-        
-        print(f"\n🗺️  Turn-by-turn directions from {start_place} to {end_place}:")
-        print("=" * 60)
-        
-        for i, step in enumerate(steps, 1):
-            instruction = step['instruction']
-            distance = step.get('distance', 0)
-            duration = step.get('duration', 0)
-            
-            print(f"{i:2d}. {instruction}")
-            if distance > 0:
-                print(f"    Distance: {distance:.0f}m, Duration: {duration:.0f}s")
-            print()
-        
-        return {
-            'start_coords': start_coords,
-            'end_coords': end_coords,
-            'steps': steps,
-            'total_distance': route['features'][0]['properties']['segments'][0]['distance'] / 1000,
-            'total_duration': route['features'][0]['properties']['segments'][0]['duration'] / 60
-        }
+        # Repeated walks are answered from the local route cache
+        route = route_cache.get_route_cache().directions(client, coords, profile='foot-walking')
+    else:
+        router = routing.get_router()
+        if router is None:
+            raise routing.RoutingError("No OpenRouteService API key and no offline walking graph")
+        route = router.directions(coords, profile='foot-walking')
+    
+    # Extract steps
+    steps = route['features'][0]['properties']['segments'][0]['steps']
+    
+    print(f"\n🗺️  Turn-by-turn directions from {start_name} to {end_name}:")
+    print("=" * 60)
+    
+    for i, step in enumerate(steps, 1):
+        instruction = step['instruction']
+        distance = step.get('distance', 0)
+        duration = step.get('duration', 0)
         
+        print(f"{i:2d}. {instruction}")
+        if distance > 0:
+            print(f"    Distance: {distance:.0f}m, Duration: {duration:.0f}s")
+        print()
+    
+    return {
+        'start_coords': start_coords,
+        'end_coords': end_coords,
+        'steps': steps,
+        'total_distance': route['features'][0]['properties']['segments'][0]['distance'] / 1000,
+        'total_duration': route['features'][0]['properties']['segments'][0]['duration'] / 60
+    }
+
+def get_advanced_directions(start_place, end_place, endpoints=None):
+    """Get advanced directions using OpenRouteService or the offline router if available
+
+    Both places are geocoded once, concurrently, and the coordinates are
+    reused if this falls back to basic directions.
+    """
+    # Check for API key
+    api_key = os.getenv('OPENROUTESERVICE_API_KEY')
+    if not api_key and routing.get_router() is None:
+        print("⚠️  OpenRouteService API key not found.")
+        print("   Set OPENROUTESERVICE_API_KEY environment variable for detailed directions,")
+        print("   or build an offline walking graph with: python routing.py build <extract.osm> walking_graph.npz")
+        print("   Falling back to basic directions...")
+        return get_basic_directions(start_place, end_place, endpoints)
+    if not api_key:
+        print("🗺️  Using the offline walking graph")
+    
+    # Get coordinates
+    endpoints = endpoints or resolve_endpoints(start_place, end_place)
+    start_coords, end_coords = endpoints
+    if not start_coords or not end_coords:
+        return get_basic_directions(start_place, end_place, endpoints)
+    
+    try:
+        return advanced_directions(start_coords, end_coords, api_key, start_place, end_place)
     except ImportError:
         print("⚠️  OpenRouteService not installed. Install with: pip install openrouteservice")
-        return get_basic_directions(start_place, end_place)
+        return get_basic_directions(start_place, end_place, endpoints)
     except Exception as e:
         print(f"❌ Error getting advanced directions: {e}")
         print("   Falling back to basic directions...")
-        return get_basic_directions(start_place, end_place)
+        return get_basic_directions(start_place, end_place, endpoints)
 
 def main():
     """Main function to demonstrate direction services"""
@@ -172,8 +215,16 @@ def main():
             print(f"\n✅ Basic directions completed!")
             print(f"📏 Distance: {result['distance']:.2f} km")
             print(f"🧭 Direction: {result['direction']}")
+
+        # Describe what is around the destination if a POI index is available
+        for place in get_nearby_places(result['end_coords']):
+            print(f"📌 {place['name']}: {place['distance']:.0f} m {place['direction']}")
     else:
         print("❌ Could not get directions")
 
+    stats = route_cache.get_route_cache().stats()
+    if stats['hits'] or stats['misses']:
+        print(f"🗺️  Route cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
 if __name__ == "__main__":
     main()
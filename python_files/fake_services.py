@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Local Service Stand-ins for Blind Assistant
+Fake HTTP servers that mimic external APIs for load tests and benchmarks
+
+FakeGeocoder answers Nominatim ``/search`` and ``/reverse`` requests with
+deterministic coordinates after a configurable delay, and fails a configurable
+fraction of requests with HTTP 503. Point the app at it with
+GEOCODER_DOMAIN=<host:port> and GEOCODER_SCHEME=http.
+
+FakeORS answers OpenRouteService ``/v2/directions/<profile>/geojson``
+requests with a straight-line route and a few steps per leg; pass its url as
+``base_url`` to ``openrouteservice.Client``.
+"""
+
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # bursts of new connections must not be dropped
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate(self):
+        """Apply the configured delay; return False if this request should fail"""
+        service = self.server.service
+        with service.lock:
+            service.requests += 1
+        if service.latency:
+            time.sleep(service.latency)
+        if service.error_rate and random.random() < service.error_rate:
+            with service.lock:
+                service.errors += 1
+            self._send_json(503, {"error": "Service temporarily unavailable"})
+            return False
+        return True
+
+def _fake_coordinates(text):
+    """Stable pseudo-coordinates around Delhi for any query string"""
+    digest = hashlib.md5(text.lower().encode("utf-8")).digest()
+    lat = 28.4 + digest[0] / 255 * 0.5
+    lon = 76.9 + digest[1] / 255 * 0.6
+    return lat, lon
+
+class _GeocoderHandler(_FakeHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not self._simulate():
+            return
+
+        if url.path == "/search":
+            query = params.get("q", "")
+            if not query or query.lower().startswith("nowhere"):
+                self._send_json(200, [])
+                return
+            lat, lon = _fake_coordinates(query)
+            self._send_json(200, [{
+                "lat": f"{lat:.7f}",
+                "lon": f"{lon:.7f}",
+                "display_name": f"{query.title()}, Delhi, India",
+            }])
+        elif url.path == "/reverse":
+            lat, lon = params.get("lat", "0"), params.get("lon", "0")
+            self._send_json(200, {
+                "lat": lat,
+                "lon": lon,
+                "display_name": f"Fake Street {abs(hash((lat, lon))) % 100}, Delhi, India",
+                "address": {"city": "Delhi", "country": "India"},
+            })
+        else:
+            self._send_json(404, {"error": "Unknown endpoint"})
+
+def _fake_route(coordinates, profile):
+    """ORS-shaped GeoJSON: straight legs between the waypoints"""
+    from geomath import haversine_m
+    speed = 5.0 / 3.6 if profile.startswith("foot") else 40.0 / 3.6  # m/s
+    geometry = []
+    segments = []
+    for (lon1, lat1), (lon2, lat2) in zip(coordinates, coordinates[1:]):
+        start = len(geometry)
+        geometry.extend([lon1 + (lon2 - lon1) * i / 10, lat1 + (lat2 - lat1) * i / 10] for i in range(10))
+        distance = haversine_m(lat1, lon1, lat2, lon2)
+        steps = [
+            {"instruction": "Head north on Fake Road", "distance": distance * 0.4,
+             "duration": distance * 0.4 / speed, "type": 11, "name": "Fake Road", "way_points": [start, start + 4]},
+            {"instruction": "Turn left onto Test Street", "distance": distance * 0.6,
+             "duration": distance * 0.6 / speed, "type": 0, "name": "Test Street", "way_points": [start + 4, start + 10]},
+            {"instruction": "Arrive at your destination", "distance": 0.0, "duration": 0.0,
+             "type": 10, "name": "-", "way_points": [start + 10, start + 10]},
+        ]
+        segments.append({"distance": distance, "duration": distance / speed, "steps": steps})
+    geometry.append(list(coordinates[-1]))
+    return {
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": geometry},
+            "properties": {
+                "segments": segments,
+                "summary": {"distance": sum(s["distance"] for s in segments),
+                            "duration": sum(s["duration"] for s in segments)},
+            },
+        }],
+    }
+
+class _ORSHandler(_FakeHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self._simulate():
+            return
+        parts = urlparse(self.path).path.strip("/").split("/")
+        if len(parts) != 4 or parts[:2] != ["v2", "directions"] or parts[3] != "geojson":
+            self._send_json(404, {"error": "Unknown endpoint"})
+            return
+        coordinates = json.loads(body or b"{}").get("coordinates") or []
+        if len(coordinates) < 2:
+            self._send_json(400, {"error": {"code": 2003, "message": "Need at least two coordinates"}})
+            return
+        self._send_json(200, _fake_route(coordinates, parts[2]))
+
+class FakeService:
+    """Threaded local HTTP server; use as a context manager"""
+
+    handler_class = _FakeHandler
+
+    def __init__(self, latency=0.05, error_rate=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+        self._server = _Server((host, port), self.handler_class)
+        self._server.service = self
+        self._thread = None
+
+    @property
+    def domain(self):
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def url(self):
+        return f"http://{self.domain}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+class FakeGeocoder(FakeService):
+    """Nominatim stand-in"""
+
+    handler_class = _GeocoderHandler
+
+class FakeORS(FakeService):
+    """OpenRouteService directions stand-in"""
+
+    handler_class = _ORSHandler
+
+def main():
+    """Run a fake geocoder in the foreground"""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    with FakeGeocoder(latency=latency, port=port) as service:
+        print(f"Fake geocoder on {service.url} (latency {latency * 1000:.0f} ms)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Offline Gazetteer for Blind Assistant
+Fuzzy place-name lookup over a local place dataset, with Nominatim as a fallback
+
+The dataset is a CSV file with ``name``, ``lat`` and ``lon`` columns (optional
+``alt_names`` separated by ``;`` and ``importance``), or a GeoJSON
+FeatureCollection of points such as an OSM extract exported with osmtogeojson.
+Names are normalized and indexed as character trigrams in an inverted index, so
+misheard names ("conaught place") still resolve without a network round trip.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+import unicodedata
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+# Same shape as the geopy Location attributes the callers use
+Place = namedtuple("Place", ["name", "address", "latitude", "longitude", "score"])
+
+DEFAULT_GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "places.csv"
+)
+
+# Minimum trigram similarity for a fuzzy hit to be trusted over Nominatim
+MIN_SCORE = 0.55
+
+def normalize(name):
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    name = "".join(c if c.isalnum() else " " for c in name)
+    return " ".join(name.split())
+
+def trigrams(normalized):
+    """Distinct character trigrams of a normalized name, padded at word edges"""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class Gazetteer:
+    """Trigram inverted index over normalized place names"""
+
+    def __init__(self):
+        self.names = []
+        self.addresses = []
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        self.importance = array("d")
+        # Each indexed key (primary or alternate name) points at a place id
+        self._key_place = array("I")
+        self._key_grams = array("H")
+        self._exact = {}
+        self._postings = {}
+        self._frozen = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, latitude, longitude, address=None, alt_names=(), importance=0.0):
+        """Add a place and index its primary and alternate names"""
+        self._frozen = None
+        place_id = len(self.names)
+        self.names.append(name)
+        self.addresses.append(address or name)
+        self.latitudes.append(float(latitude))
+        self.longitudes.append(float(longitude))
+        self.importance.append(float(importance or 0.0))
+
+        for key in (name, *alt_names):
+            normalized = normalize(key)
+            if not normalized:
+                continue
+            # Identical names resolve exactly to the more important place
+            other = self._exact.get(normalized)
+            if other is None or self.importance[place_id] > self.importance[other]:
+                self._exact[normalized] = place_id
+
+            key_id = len(self._key_place)
+            grams = trigrams(normalized)
+            self._key_place.append(place_id)
+            self._key_grams.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array("I")
+                postings.append(key_id)
+        return place_id
+
+    def _freeze(self):
+        """Numpy views of the index, rebuilt after places are added"""
+        if self._frozen is None:
+            # Copies, so the growable arrays never export a live buffer
+            self._frozen = (
+                np.array(self._key_place, dtype=np.uint32),
+                np.array(self._key_grams, dtype=np.float64),
+                {gram: np.frombuffer(ids, dtype=np.uint32).copy() for gram, ids in self._postings.items()},
+            )
+        return self._frozen
+
+    def _place(self, place_id, score):
+        return Place(
+            self.names[place_id],
+            self.addresses[place_id],
+            self.latitudes[place_id],
+            self.longitudes[place_id],
+            score,
+        )
+
+    def search(self, query, limit=5, min_score=0.0):
+        """Return up to ``limit`` places ranked by trigram similarity to ``query``"""
+        normalized = normalize(query)
+        if not normalized:
+            return []
+
+        exact = self._exact.get(normalized)
+        if exact is not None and limit == 1:
+            return [self._place(exact, 1.0)]
+
+        key_place, key_grams, postings = self._freeze()
+        query_grams = trigrams(normalized)
+        hits = [postings[gram] for gram in query_grams if gram in postings]
+        best = {}
+        if hits:
+            # Shared-trigram counts for every key in one pass, then Dice coefficient
+            shared = np.bincount(np.concatenate(hits), minlength=len(key_place))
+            scores = 2.0 * shared / (len(query_grams) + key_grams)
+            candidates = np.flatnonzero(scores >= max(min_score, 1e-9))
+            if len(candidates) > limit * 4:
+                top = np.argpartition(scores[candidates], -limit * 4)[-limit * 4:]
+                candidates = candidates[top]
+            for key_id in candidates:
+                place_id = int(key_place[key_id])
+                score = float(scores[key_id])
+                if score > best.get(place_id, -1.0):
+                    best[place_id] = score
+        if exact is not None:
+            best[exact] = 1.0
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], -self.importance[item[0]]))
+        return [self._place(place_id, score) for place_id, score in ranked[:limit]]
+
+    def geocode(self, query, min_score=MIN_SCORE):
+        """Best match for ``query`` or None when nothing is similar enough"""
+        matches = self.search(query, limit=1, min_score=min_score)
+        return matches[0] if matches else None
+
+    @classmethod
+    def load(cls, path):
+        """Build a gazetteer from a CSV or GeoJSON file"""
+        gazetteer = cls()
+        for record in read_places(path):
+            gazetteer.add(**record)
+        return gazetteer
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                latitude = float(row.get("lat") or row["latitude"])
+                longitude = float(row.get("lon") or row["longitude"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not row.get("name"):
+                continue
+            yield {
+                "name": row["name"],
+                "latitude": latitude,
+                "longitude": longitude,
+                "address": row.get("address"),
+                "alt_names": [n.strip() for n in (row.get("alt_names") or "").split(";") if n.strip()],
+                "importance": row.get("importance") or 0.0,
+            }
+
+def _read_geojson(path):
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+    for feature in collection.get("features", []):
+        geometry = feature.get("geometry") or {}
+        properties = feature.get("properties") or {}
+        name = properties.get("name")
+        if not name or geometry.get("type") != "Point":
+            continue
+        longitude, latitude = geometry["coordinates"][:2]
+        yield {
+            "name": name,
+            "latitude": latitude,
+            "longitude": longitude,
+            "address": properties.get("address"),
+            "alt_names": [
+                value for key, value in properties.items()
+                if key.startswith(("name:", "alt_name", "old_name", "short_name")) and value
+            ],
+            "importance": properties.get("importance") or 0.0,
+        }
+
+def read_places(path):
+    """Yield place records from a CSV (name, lat, lon) or GeoJSON point file"""
+    if path.lower().endswith((".geojson", ".json")):
+        return _read_geojson(path)
+    return _read_csv(path)
+
+_default_gazetteer = None
+_default_loaded = False
+
+def get_gazetteer():
+    """Shared gazetteer from GAZETTEER_PATH (or places.csv), None if absent"""
+    global _default_gazetteer, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        path = os.getenv("GAZETTEER_PATH", DEFAULT_GAZETTEER_PATH)
+        if os.path.exists(path):
+            try:
+                _default_gazetteer = Gazetteer.load(path)
+            except Exception as e:
+                print(f"Warning: Could not load gazetteer {path}: {e}")
+    return _default_gazetteer
+
+def geocode(place_name, geolocator=None):
+    """Resolve a place offline first, falling back to ``geolocator.geocode``"""
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        place = gazetteer.geocode(place_name)
+        if place is not None:
+            return place
+    if geolocator is None:
+        return None
+    return geolocator.geocode(place_name)
+
+def main():
+    """Query a gazetteer file from the command line"""
+    if len(sys.argv) < 3:
+        print("Usage: python gazetteer.py <places.csv|places.geojson> <place name>")
+        return 1
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer.load(sys.argv[1])
+    print(f"Indexed {len(gazetteer)} places in {time.perf_counter() - start:.2f}s")
+
+    query = " ".join(sys.argv[2:])
+    start = time.perf_counter()
+    matches = gazetteer.search(query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for place in matches:
+        print(f"{place.score:.2f}  {place.name}  ({place.latitude:.5f}, {place.longitude:.5f})")
+    print(f"Lookup took {elapsed_ms:.3f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Async Geocoding Client for Blind Assistant
+Non-blocking Nominatim lookups over one pooled keep-alive HTTP session
+
+The offline gazetteer and POI index are consulted first, then an in-memory
+result cache; only misses go to Nominatim, no faster than GEOCODER_RATE_LIMIT
+requests per second. The server can be pointed elsewhere (a mirror or a local
+fake for load tests) with GEOCODER_DOMAIN and GEOCODER_SCHEME.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+import aiohttp
+from geopy.adapters import AioHTTPAdapter
+from geopy.geocoders import Nominatim
+
+import gazetteer
+from spatial_index import get_spatial_index
+
+PUBLIC_NOMINATIM = "nominatim.openstreetmap.org"
+
+GEOCODER_DOMAIN = os.getenv("GEOCODER_DOMAIN", PUBLIC_NOMINATIM)
+GEOCODER_SCHEME = os.getenv("GEOCODER_SCHEME", "https")
+GEOCODER_TIMEOUT = float(os.getenv("GEOCODER_TIMEOUT", "5"))
+GEOCODER_POOL_SIZE = int(os.getenv("GEOCODER_POOL_SIZE", "20"))
+# The public server's usage policy allows one request per second
+GEOCODER_RATE_LIMIT = float(os.getenv(
+    "GEOCODER_RATE_LIMIT", "1" if GEOCODER_DOMAIN == PUBLIC_NOMINATIM else "0"
+))
+GEOCODER_CACHE_SIZE = int(os.getenv("GEOCODER_CACHE_SIZE", "1024"))
+GEOCODER_CACHE_TTL = float(os.getenv("GEOCODER_CACHE_TTL", str(24 * 3600)))
+KEEPALIVE_TIMEOUT = 30
+
+# Cache sentinel, since "not found" (None) is itself a cacheable answer
+_MISSING = object()
+
+class TTLCache:
+    """Size-bounded LRU mapping whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize=GEOCODER_CACHE_SIZE, ttl=GEOCODER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+class RateLimiter:
+    """Spaces out request starts to at most ``rate`` per second (0 = unlimited)"""
+
+    def __init__(self, rate=GEOCODER_RATE_LIMIT):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        # No await between reading and reserving the slot, so this is race-free
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class PooledAioHTTPAdapter(AioHTTPAdapter):
+    """geopy aiohttp adapter with a bounded keep-alive connection pool"""
+
+    pool_size = GEOCODER_POOL_SIZE
+
+    @property
+    def session(self):
+        session = self.__dict__.get("session")
+        if session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=False,
+                raise_for_status=False
+            )
+            self.__dict__["session"] = session
+        return session
+
+class AsyncGeocoder:
+    """Offline-first geocoder whose network lookups never block the event loop"""
+
+    def __init__(self, user_agent="blind_assistant_app", domain=GEOCODER_DOMAIN,
+                 scheme=GEOCODER_SCHEME, timeout=GEOCODER_TIMEOUT):
+        self.user_agent = user_agent
+        self.domain = domain
+        self.scheme = scheme
+        self.timeout = timeout
+        self.cache = TTLCache()
+        self.rate_limiter = RateLimiter()
+        self._geolocator = None
+
+    @property
+    def geolocator(self):
+        # Created lazily so the aiohttp session binds to the running loop
+        if self._geolocator is None:
+            self._geolocator = Nominatim(
+                user_agent=self.user_agent,
+                domain=self.domain,
+                scheme=self.scheme,
+                timeout=self.timeout,
+                adapter_factory=PooledAioHTTPAdapter,
+            )
+        return self._geolocator
+
+    def cached(self, place_name):
+        """Location already known offline or from an earlier lookup, else _MISSING"""
+        offline = gazetteer.get_gazetteer()
+        if offline is not None:
+            place = offline.geocode(place_name)
+            if place is not None:
+                return place
+        return self.cache.get(gazetteer.normalize(place_name), _MISSING)
+
+    async def geocode(self, place_name, timeout=None):
+        """Place name to a location with latitude, longitude and address"""
+        location = self.cached(place_name)
+        if location is not _MISSING:
+            return location
+        await self.rate_limiter.wait()
+        location = await self.geolocator.geocode(place_name, timeout=timeout or self.timeout)
+        # Misses are cached too, so repeated unknown names stay off the network
+        self.cache.set(gazetteer.normalize(place_name), location)
+        return location
+
+    async def geocode_many(self, place_names, concurrency=4):
+        """Yield (name, location, error) for each distinct name as it resolves"""
+        unique = {}
+        for name in place_names:
+            key = gazetteer.normalize(name)
+            if not key:
+                # Nothing left to look up, but the caller still gets a line for it
+                key = ("empty", name.strip())
+            if key not in unique:
+                unique[key] = name.strip()
+
+        pending = []
+        for key, name in unique.items():
+            if isinstance(key, tuple):
+                yield name, None, ValueError("Place name is empty")
+                continue
+            location = self.cached(name)
+            if location is _MISSING:
+                pending.append(name)
+            else:
+                yield name, location, None
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(name):
+            async with semaphore:
+                try:
+                    return name, await self.geocode(name), None
+                except Exception as e:
+                    return name, None, e
+
+        tasks = [asyncio.ensure_future(resolve(name)) for name in pending]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # The consumer may stop early (a client disconnect); drop what is left
+            for task in tasks:
+                task.cancel()
+
+    async def reverse(self, latitude, longitude, timeout=None):
+        """Coordinate to the nearest known address"""
+        index = get_spatial_index()
+        if index is not None:
+            place = index.reverse(latitude, longitude)
+            if place is not None:
+                return place
+        await self.rate_limiter.wait()
+        return await self.geolocator.reverse((latitude, longitude), timeout=timeout or self.timeout)
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._geolocator is not None:
+            await self._geolocator.adapter.session.close()
+            self._geolocator = None
@@ -6,17 +6,21 @@ Provides voice-controlled navigation and location services
 
 import speech_recognition as sr
 from geopy.geocoders import Nominatim
-import pyttsx3
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import gazetteer
+import geomath
+import speech
+import mic_session
+import recognizers
+import route_cache
+import routing
+import tracing
+import tts_cache
 
 # Initialize Services
-recognizer = sr.Recognizer()
 geolocator = Nominatim(user_agent="blind_assistant_app")
-tts_engine = pyttsx3.init()
-
-# Configure TTS engine
-tts_engine.setProperty('rate', 150)
-tts_engine.setProperty('volume', 0.8)
 
 # Check for OpenRouteService API key
 ORS_API_KEY = os.getenv('OPENROUTESERVICE_API_KEY')
@@ -33,53 +37,107 @@ else:
     print("    for turn-by-turn directions. Basic location services will work.")
     ors_client = None
 
-def speak(text):
-    """Convert text to speech"""
-    try:
-        print(f"🔊 Speaking: {text}")
-        tts_engine.say(text)
-        tts_engine.runAndWait()
-    except Exception as e:
-        print(f"Speech error: {e}")
+# Without ORS, turn-by-turn directions come from a local walking graph if one was built
+local_router = None if ors_client else routing.get_router()
+if local_router:
+    print("✅ Offline walking graph loaded")
+
+DEFAULT_SOURCE = (77.2295, 28.6129)  # India Gate, Delhi (longitude, latitude)
+ROUTE_STEPS = 5  # instructions read out
+SPECULATION_SETTLE = 0.3  # seconds a partial's place must hold before it is routed
+
+# Geocoding, routing and speech synthesis overlap on these threads
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="navigation")
+
+# Fixed phrases synthesized while the user is still being prompted
+NAVIGATION_PHRASES = [
+    "Please speak your destination",
+    "Here are the turn by turn directions",
+    "Navigation complete. Have a safe journey!",
+]
+
+class StageTimer:
+    """Wall-clock time of each pipeline stage, printed at the end"""
 
-def get_destination_by_voice():
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = []  # (name, start, end) in seconds since self.start
+
+    def add(self, name, start, end=None):
+        """Record a stage between two perf_counter() readings"""
+        end = time.perf_counter() if end is None else end
+        self.stages.append((name, start - self.start, end - self.start))
+        tracing.record(f"navigation.{name}", int(start * 1e9), int(end * 1e9))
+
+    def report(self):
+        print("\n⏱️  Pipeline timings (ms from start):")
+        for name, start, end in self.stages:
+            print(f"  {name:<18} {start * 1000:8.0f} → {end * 1000:8.0f}  ({(end - start) * 1000:6.0f})")
+        stats = route_cache.get_route_cache().stats()
+        if stats['hits'] or stats['misses']:
+            print(f"🗺️  Route cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+def speak(text, priority=speech.PRIORITY_NAVIGATION):
+    """Queue text on the shared speech output (see speech.py)"""
+    print(f"🔊 Speaking: {text}")
+    speech.say(text, priority)
+
+def get_destination_by_voice(on_partial=None, timer=None):
     """Get destination from voice input"""
-    with sr.Microphone() as source:
-        print("🎤 Please speak your destination:")
-        speak("Please speak your destination")
+    print("🎤 Please speak your destination:")
+    start = time.perf_counter()
+    speak("Please speak your destination")
+    # Let the prompt finish so the microphone does not hear it
+    speech.get_speech_queue().wait_idle(timeout=10)
+    if timer:
+        timer.add("prompt", start)
+
+    try:
+        # Noise calibration happens once when the session opens, not per request
+        # Place names are free-form, so no command grammar here
+        session = mic_session.get_session()
+        start = time.perf_counter()
+        transcript = recognizers.get_recognizer().listen(session, timeout=10, on_partial=on_partial)
+        if timer:
+            endpoint = session.last_capture.endpointed_at
+            timer.add("listen", start, endpoint)
+            timer.add("recognize", endpoint)
+        destination = transcript.text
+        print(f"✅ You said: {destination} ({transcript.backend})")
+        return destination
         
-        try:
-            # Adjust for ambient noise
-            recognizer.adjust_for_ambient_noise(source)
-            audio = recognizer.listen(source, timeout=10)
-            
-            print("🔄 Processing your voice...")
-            destination = recognizer.recognize_google(audio)
-            print(f"✅ You said: {destination}")
-            return destination
-            
-        except sr.UnknownValueError:
-            print("❌ Could not understand audio.")
-            speak("Sorry, I didn't understand. Please try again.")
-            return None
-        except sr.RequestError as e:
-            print(f"❌ API error: {e}")
-            speak("Speech recognition service error. Please check your internet connection.")
-            return None
-        except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            speak("An error occurred. Please try again.")
-            return None
+    except sr.UnknownValueError:
+        print("❌ Could not understand audio.")
+        speak("Sorry, I didn't understand. Please try again.")
+        return None
+    except sr.RequestError as e:
+        print(f"❌ API error: {e}")
+        speak("Speech recognition service error. Please check your internet connection.")
+        return None
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        speak("An error occurred. Please try again.")
+        return None
+
+def _nominatim(query):
+    try:
+        return geolocator.geocode(query)
+    except Exception as e:
+        print(f"❌ Geocoding failed for '{query}': {e}")
+        return None
 
 def get_coordinates(place_name, city="Delhi"):
     """Convert place name to coordinates"""
     try:
-        # Try with city first
-        location = geolocator.geocode(f"{place_name}, {city}")
-        
-        # If not found, try without city
+        # Try the offline gazetteer first
+        location = gazetteer.geocode(place_name)
+
+        # Then Nominatim with and without the city at the same time;
+        # the city-qualified answer still wins when there is one
         if not location:
-            location = geolocator.geocode(place_name)
+            qualified = executor.submit(_nominatim, f"{place_name}, {city}")
+            unqualified = executor.submit(_nominatim, place_name)
+            location = qualified.result() or unqualified.result()
         
         if location:
             print(f"📍 Found: {location.address}")
@@ -90,51 +148,78 @@ def get_coordinates(place_name, city="Delhi"):
         print(f"❌ Geocoding failed: {e}")
         return None
 
+def get_route_steps(source_coords, destination_coords):
+    """Walking instructions from OpenRouteService or the offline router (first ROUTE_STEPS)"""
+    if ors_client:
+        # Repeated walks are answered from the local route cache
+        route = route_cache.get_route_cache().directions(
+            ors_client, [source_coords, destination_coords], profile='foot-walking'
+        )
+    else:
+        route = local_router.directions([source_coords, destination_coords], profile='foot-walking')
+    steps = route['features'][0]['properties']['segments'][0]['steps']
+    return [step['instruction'] for step in steps[:ROUTE_STEPS]]
+
+def prewarm_speech(phrases):
+    """Synthesize phrases in the background when speech plays cached audio"""
+    if isinstance(speech.get_speech_queue().player, speech.PygamePlayer):
+        tts_cache.get_cache().prewarm(phrases)
+
+class Speculation:
+    """Starts routing from partial transcripts the gazetteer already knows
+
+    A partial counts as confident when it resolves offline; its route is
+    fetched while the speaker is still talking and reused if the final
+    transcript names the same place. A place is routed only once it has
+    held for SPECULATION_SETTLE, so a sentence that passes through several
+    known names costs one routing call.
+    """
+
+    def __init__(self, source_coords):
+        self.source_coords = source_coords
+        self.coords = None
+        self.route = None
+
+    def on_partial(self, text):
+        place = gazetteer.geocode(text)
+        if place is None:
+            return
+        coords = (place.longitude, place.latitude)
+        if coords != self.coords:
+            self.coords = coords
+            # Only the latest place is routed; an earlier one still waiting is dropped
+            if self.route is not None:
+                self.route.cancel()
+            if ors_client or local_router:
+                self.route = executor.submit(self._route, coords)
+
+    def _route(self, coords):
+        time.sleep(SPECULATION_SETTLE)
+        if coords != self.coords:
+            return None
+        return get_route_steps(self.source_coords, coords)
+
+    def route_for(self, coords):
+        """Route already in flight for ``coords``, or None"""
+        return self.route if coords == self.coords else None
+
 def get_basic_directions(source_coords, destination_coords):
     """Get basic distance and direction information"""
-    from geopy.distance import geodesic
-    
-    # Calculate distance
-    distance = geodesic(
-        (source_coords[1], source_coords[0]),  # (lat, lon)
-        (destination_coords[1], destination_coords[0])
-    ).kilometers
-    
-    # Calculate bearing (simplified)
-    lat1, lon1 = source_coords[1], source_coords[0]
-    lat2, lon2 = destination_coords[1], destination_coords[0]
-    
-    import math
-    
-    def get_bearing(lat1, lon1, lat2, lon2):
-        dlon = math.radians(lon2 - lon1)
-        lat1 = math.radians(lat1)
-        lat2 = math.radians(lat2)
-        
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-        
-        bearing = math.atan2(y, x)
-        bearing = math.degrees(bearing)
-        bearing = (bearing + 360) % 360
-        
-        return bearing
-    
-    bearing = get_bearing(lat1, lon1, lat2, lon2)
-    
-    # Convert bearing to direction
-    directions = [
-        "North", "North-East", "East", "South-East",
-        "South", "South-West", "West", "North-West"
-    ]
-    
-    direction = directions[round(bearing / 45) % 8]
-    
+    # Coordinates here are (longitude, latitude)
+    lon1, lat1 = source_coords
+    lon2, lat2 = destination_coords
+    distance = geomath.vincenty_m(lat1, lon1, lat2, lon2) / 1000
+    direction = geomath.compass_direction(geomath.initial_bearing(lat1, lon1, lat2, lon2))
     return distance, direction
 
-def provide_navigation_info(source_coords, destination_coords, destination_name):
+def provide_navigation_info(source_coords, destination_coords, destination_name, route=None, timer=None):
     """Provide navigation information"""
     try:
+        start = time.perf_counter()
+        # Routing runs while the overview is spoken
+        if route is None and (ors_client or local_router):
+            route = executor.submit(get_route_steps, source_coords, destination_coords)
+
         distance, direction = get_basic_directions(source_coords, destination_coords)
         
         info = f"Your destination {destination_name} is approximately {distance:.1f} kilometers away in the {direction} direction."
@@ -142,26 +227,24 @@ def provide_navigation_info(source_coords, destination_coords, destination_name)
         print(f"📍 {info}")
         speak(info)
         
-        if ors_client:
+        if route is not None:
             try:
-                # Get detailed route
-                route = ors_client.directions(
-                    coordinates=[source_coords, destination_coords],
-                    profile='foot-walking',
-                    format='geojson'
-                )
-                
-                steps = route['features'][0]['properties']['segments'][0]['steps']
+                instructions = route.result()
+                if timer:
+                    timer.add("route", start)
+                # Synthesize upcoming instructions while the current one plays
+                prewarm_speech(instructions)
                 
                 print("\n🗺️  Turn-by-turn directions:")
                 speak("Here are the turn by turn directions")
                 
-                for i, step in enumerate(steps[:5]):  # Limit to first 5 steps
-                    instruction = step['instruction']
+                for i, instruction in enumerate(instructions):
                     print(f"  {i+1}. {instruction}")
                     speak(instruction)
+                    if timer and i == 0:
+                        timer.add("first_instruction", start)
                     
-                    if i < len(steps) - 1:
+                    if i < len(instructions) - 1:
                         input("Press Enter for next instruction...")
                         
             except Exception as e:
@@ -177,30 +260,35 @@ def main():
     print("="*50)
     print("🧭 VOICE NAVIGATION ASSISTANT")
     print("="*50)
+    timer = StageTimer()
+    prewarm_speech(NAVIGATION_PHRASES)
+    source_coords = DEFAULT_SOURCE  # can be changed
+    speculation = Speculation(source_coords)
     
     # Get destination from voice
-    destination = get_destination_by_voice()
+    destination = get_destination_by_voice(speculation.on_partial, timer)
     if not destination:
         return
     
     # Get coordinates for destination
+    start = time.perf_counter()
     destination_coords = get_coordinates(destination)
+    timer.add("geocode", start)
     if not destination_coords:
         print("❌ Destination not found.")
         speak("Destination not found. Please try with a more specific location.")
         return
     
-    # Use default current location (can be changed)
-    source_coords = (77.2295, 28.6129)  # India Gate, Delhi (longitude, latitude)
-    
     print(f"\n🚀 Navigating from India Gate to {destination}...")
     speak(f"Navigating to {destination}")
     
     # Provide navigation information
-    provide_navigation_info(source_coords, destination_coords, destination)
+    provide_navigation_info(source_coords, destination_coords, destination,
+                            speculation.route_for(destination_coords), timer)
     
     print("\n✅ Navigation complete!")
     speak("Navigation complete. Have a safe journey!")
+    timer.report()
 
 if __name__ == "__main__":
     try:
@@ -211,3 +299,5 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         speak("An error occurred")
+    # Finish speaking before the process exits
+    speech.get_speech_queue().close(drain=True, timeout=30)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Voice Intent Matcher for Blind Assistant
+Maps a spoken transcript to a command intent and its slots in a single pass
+
+Every keyword and synonym of every intent is compiled into one trie-shaped
+regular expression, so matching cost does not grow with the number of
+commands. When several intents are mentioned, the highest priority wins
+(hazards before chatter), then the earliest mention. Slots such as the
+destination in "navigate to India Gate" are extracted for the winner only,
+and phrases inside another intent's slot value do not count as mentions.
+"""
+
+import re
+from collections import namedtuple
+
+Intent = namedtuple("Intent", ["name", "phrases", "priority", "slots"])
+IntentMatch = namedtuple("IntentMatch", ["name", "phrase", "slots"])
+
+DEFAULT_INTENTS = (
+    Intent("emergency", ("emergency", "help me please", "call for help", "sos"), 100, None),
+    Intent("traffic", ("traffic", "horn", "honking", "vehicle"), 80, None),
+    Intent(
+        "navigate",
+        ("navigate", "navigation", "take me to", "directions to", "guide me to", "walk me to"),
+        60,
+        r"\b(?:navigate|take me|directions|guide me|walk me)(?:\s+(?:to|towards))?\s+(?P<destination>.+)",
+    ),
+    Intent("detect", ("detect", "what is in front", "what's in front", "obstacle"), 50, None),
+    Intent("location", ("location", "where am i"), 40, None),
+    Intent("camera", ("camera",), 30, None),
+    Intent("weather", ("weather", "forecast"), 20, None),
+    Intent("help", ("help", "commands", "what can you do"), 10, None),
+)
+
+# Filler words dropped from the end of slot values ("... gate please")
+_TRAILING_FILLER = re.compile(r"(?:[\s,.!?]+(?:please|now|thanks|thank you))*[\s,.!?]*$", re.IGNORECASE)
+
+def _trie_pattern(phrases):
+    """Regex source for a set of literal phrases, factored as a prefix trie"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        if list(node) == [""]:
+            return ""
+        optional = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+class IntentMatcher:
+    """Single compiled automaton over all intent phrases"""
+
+    def __init__(self, intents=DEFAULT_INTENTS):
+        self.intents = {intent.name: intent for intent in intents}
+        self._phrase_intent = {}
+        for intent in sorted(intents, key=lambda i: i.priority):
+            for phrase in intent.phrases:
+                # A phrase shared by two intents belongs to the higher priority one
+                self._phrase_intent[phrase.lower()] = intent
+        # Phrases match at a word start and may carry a suffix ("detection").
+        # Matching lowercased text is much cheaper than re.IGNORECASE.
+        self._pattern = re.compile(r"\b(" + _trie_pattern(self._phrase_intent) + r")")
+        self._slots = {
+            intent.name: re.compile(intent.slots, re.IGNORECASE)
+            for intent in intents if intent.slots
+        }
+
+    def match(self, text):
+        """Best IntentMatch for ``text`` or None if no phrase occurs"""
+        lowered = text.lower()
+        mentions = [(found.start(1), self._phrase_intent[found.group(1)], found.group(1))
+                    for found in self._pattern.finditer(lowered)]
+
+        if not mentions:
+            return None
+
+        # Words inside a slot value are not commands: "navigate to the
+        # traffic light" is navigation, not a traffic alert
+        slot_spans = []
+        mentioned = {intent.name for _, intent, _ in mentions}
+        if len(mentioned) > 1:
+            for name in mentioned & self._slots.keys():
+                found = self._slots[name].search(lowered)
+                if found:
+                    slot_spans.extend((name, found.span(group))
+                                      for group, value in found.groupdict().items() if value)
+
+        best = None
+        for start, intent, phrase in mentions:
+            if any(owner != intent.name and lo <= start < hi for owner, (lo, hi) in slot_spans):
+                continue
+            if best is None or intent.priority > best[0].priority:
+                best = (intent, phrase)
+        if best is None:
+            return None
+
+        intent, phrase = best
+        slots = {}
+        slot_pattern = self._slots.get(intent.name)
+        if slot_pattern is not None:
+            found = slot_pattern.search(text)
+            if found:
+                slots = {
+                    name: _TRAILING_FILLER.sub("", value).strip()
+                    for name, value in found.groupdict().items() if value
+                }
+                slots = {name: value for name, value in slots.items() if value}
+        return IntentMatch(intent.name, phrase, slots)
+
+_default_matcher = None
+
+def match_intent(text):
+    """Match ``text`` against the default command intents"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = IntentMatcher(DEFAULT_INTENTS)
+    return _default_matcher.match(text)
@@ -1,7 +1,8 @@
 from geopy.geocoders import Nominatim
+import gazetteer
 
 geolocator = Nominatim(user_agent="myapp")
-location = geolocator.geocode("Kanpur,India")
+location = gazetteer.geocode("Kanpur,India", geolocator)
 
 if location:
     print("Latitude:", location.latitude)
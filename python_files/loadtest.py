@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Load Testing Harness for Blind Assistant
+Replays a mixed API workload at a target request rate and reports JSON
+
+The backend is started with serve.py and pointed at a local fake geocoder
+(fake_services.py) with configurable latency and error rate, so runs are
+reproducible and never touch Nominatim. Requests are sent open-loop: arrivals
+follow the target rate whether or not earlier requests have finished, which
+is how real clients behave under overload. Detection requests post the
+camera frames in web_app/temp.
+
+    python loadtest.py --rps 20 --duration 30 --mix detect=1,geocode=3,reverse=2,voice=4
+"""
+
+import argparse
+import asyncio
+import base64
+import glob
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+
+import aiohttp
+
+from bench_intents import build_corpus
+from fake_services import FakeGeocoder
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FRAMES_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "web_app", "temp")
+
+PLACES = [
+    "India Gate", "Connaught Place", "Kanpur Central", "Gopal Nagar", "Red Fort",
+    "Chandni Chowk", "Lajpat Nagar", "Karol Bagh", "Hauz Khas", "Nowhere Special",
+]
+
+def parse_mix(text):
+    """'detect=1,geocode=3' -> {'detect': 1.0, 'geocode': 3.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"detect", "geocode", "reverse", "voice"}
+    if unknown:
+        raise ValueError(f"Unknown workload types: {', '.join(sorted(unknown))}")
+    return mix
+
+def load_frames(limit=20):
+    frames = []
+    for path in sorted(glob.glob(os.path.join(FRAMES_DIR, "*.jpg")))[:limit]:
+        with open(path, "rb") as f:
+            frames.append(base64.b64encode(f.read()).decode("ascii"))
+    return frames
+
+class Workload:
+    """Builds randomized requests of each type"""
+
+    def __init__(self, frames, seed=0):
+        self.rng = random.Random(seed)
+        self.frames = frames
+        self.transcripts = build_corpus(200, seed)
+
+    def request(self, kind):
+        """(method, path, params, json body) for one request of ``kind``"""
+        if kind == "detect":
+            return "POST", "/api/detect", None, {"image_data": self.rng.choice(self.frames)}
+        if kind == "geocode":
+            # A few numbered variants so some lookups hit the cache and some miss
+            name = f"{self.rng.choice(PLACES)} {self.rng.randint(1, 20)}"
+            return "GET", "/api/geocode", {"name": name}, None
+        if kind == "reverse":
+            params = {"lat": f"{28.4 + self.rng.random() * 0.5:.5f}", "lon": f"{76.9 + self.rng.random() * 0.6:.5f}"}
+            return "GET", "/api/reverse-geocode", params, None
+        return "POST", "/api/voice/process", None, {"command": self.rng.choice(self.transcripts)}
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(latencies, statuses):
+    latencies = sorted(latencies)
+    count = sum(statuses.values())
+    errors = sum(n for status, n in statuses.items() if status == "error" or int(status) >= 400)
+    return {
+        "count": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "status_counts": dict(sorted(statuses.items())),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+            "p50": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+            "p90": round(percentile(latencies, 90) * 1000, 2) if latencies else None,
+            "p99": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+            "max": round(latencies[-1] * 1000, 2) if latencies else None,
+        },
+    }
+
+async def run_load(url, workload, mix, rps, duration, timeout, max_inflight):
+    """Send requests open-loop at ``rps`` for ``duration`` seconds"""
+    kinds, weights = zip(*mix.items())
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    dropped = 0
+    inflight = 0
+
+    async def one(session, kind):
+        nonlocal inflight
+        method, path, params, body = workload.request(kind)
+        start = time.perf_counter()
+        try:
+            async with session.request(method, url + path, params=params, json=body) as resp:
+                await resp.read()
+                status = str(resp.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status = "error"
+        finally:
+            inflight -= 1
+        latencies[kind].append(time.perf_counter() - start)
+        statuses[kind][status] += 1
+
+    connector = aiohttp.TCPConnector(limit=max_inflight)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        tasks = []
+        start = time.perf_counter()
+        total = int(rps * duration)
+        for i in range(total):
+            # Open loop: request i is due at start + i / rps
+            delay = start + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if inflight >= max_inflight:
+                dropped += 1
+                continue
+            inflight += 1
+            kind = workload.rng.choices(kinds, weights)[0]
+            tasks.append(asyncio.ensure_future(one(session, kind)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_statuses = sum(statuses.values(), Counter())
+    completed = sum(n for status, n in all_statuses.items() if status != "error" and int(status) < 400)
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "sent": len(tasks),
+        "dropped_client_side": dropped,
+        "throughput_rps": round(completed / elapsed, 2),
+        "overall": summarize(all_latencies, all_statuses),
+        "endpoints": {kind: summarize(latencies[kind], statuses[kind]) for kind in sorted(latencies)},
+    }
+
+async def wait_ready(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url + "/api/health") as resp:
+                    if resp.status == 200:
+                        return True
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    return False
+
+def start_server(port, workers, geocoder, use_offline_data):
+    env = dict(os.environ)
+    env.update({
+        "GEOCODER_DOMAIN": geocoder.domain,
+        "GEOCODER_SCHEME": "http",
+        "GEOCODER_RATE_LIMIT": "0",
+    })
+    if not use_offline_data:
+        # Send every lookup to the fake geocoder
+        env.update({"GAZETTEER_PATH": "", "POI_INDEX_PATH": ""})
+    return subprocess.Popen(
+        [sys.executable, os.path.join(SCRIPT_DIR, "serve.py"), "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Blind Assistant API load test")
+    parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--mix", default="detect=1,geocode=3,reverse=2,voice=4",
+                        help="Relative weights of detect, geocode, reverse and voice requests")
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8797)
+    parser.add_argument("--workers", type=int, default=1, help="Server workers when starting one")
+    parser.add_argument("--geocoder-latency", type=float, default=0.1, help="Fake geocoder delay in seconds")
+    parser.add_argument("--geocoder-error-rate", type=float, default=0.0, help="Fake geocoder 503 fraction")
+    parser.add_argument("--offline-data", action="store_true", help="Keep the gazetteer and POI index enabled")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--max-inflight", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    frames = load_frames()
+    if "detect" in mix and not frames:
+        print(f"❌ No frames found in {FRAMES_DIR}", file=sys.stderr)
+        return 1
+    workload = Workload(frames, args.seed)
+
+    geocoder = None
+    server = None
+    try:
+        if args.url:
+            url = args.url.rstrip("/")
+        else:
+            geocoder = FakeGeocoder(latency=args.geocoder_latency, error_rate=args.geocoder_error_rate).start()
+            server = start_server(args.port, args.workers, geocoder, args.offline_data)
+            url = f"http://127.0.0.1:{args.port}"
+            if not asyncio.run(wait_ready(url)):
+                print("❌ Server did not start", file=sys.stderr)
+                return 1
+
+        result = asyncio.run(run_load(url, workload, mix, args.rps, args.duration, args.timeout, args.max_inflight))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if geocoder is not None:
+            geocoder.stop()
+
+    report = {
+        "config": {
+            "url": url,
+            "target_rps": args.rps,
+            "duration_s": args.duration,
+            "mix": mix,
+            "workers": None if args.url else args.workers,
+            "geocoder_latency_s": None if args.url else args.geocoder_latency,
+            "geocoder_error_rate": None if args.url else args.geocoder_error_rate,
+        },
+        **result,
+    }
+    if geocoder is not None:
+        report["fake_geocoder"] = {"requests": geocoder.requests, "errors": geocoder.errors}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
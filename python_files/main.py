@@ -4,84 +4,81 @@ from kivy.uix.button import Button
 from kivy.uix.image import Image
 from kivy.uix.boxlayout import BoxLayout
 from kivy.clock import Clock
-from kivy.graphics.texture import Texture
 
 import cv2
 import speech_recognition as sr
-from gtts import gTTS
 import os
 import threading
-try:
-    import pygame
-    pygame.mixer.init()
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
-    print("Warning: pygame not available. Audio playback disabled.")
+import time
+from intents import match_intent
+import tracing
+import tts_cache
+import speech
+import mic_session
+import recognizers
+import sound_bank
+from camera import CameraStream
+from detection_worker import DetectionWorker
+from texture_upload import FrameTexture
 
-# Camera access
-cap = cv2.VideoCapture(0)
+def speak(text, priority=speech.PRIORITY_INFO, ttl=None):
+    """Queue text on the shared speech output (see speech.py)"""
+    speech.say(text, priority, ttl)
 
-def speak(text):
-    """Convert text to speech"""
-    try:
-        tts = gTTS(text=text, lang='en')
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Create voice.mp3 in the parent directory
-        parent_dir = os.path.dirname(script_dir)
-        voice_path = os.path.join(parent_dir, "voice.mp3")
-        tts.save(voice_path)
-        
-        if PYGAME_AVAILABLE:
-            pygame.mixer.music.load(voice_path)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to finish
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-        else:
-            print(f"Speech: {text}")
-        
-        # Clean up
-        try:
-            os.remove(voice_path)
-        except:
-            pass
-    except Exception as e:
-        print(f"Speech error: {e}")
+COMMAND_RESPONSES = {
+    "emergency": "Emergency. Stay where you are and ask someone nearby for help.",
+    "traffic": "Please wait. Traffic detected ahead.",
+    "navigate": "Navigation feature available. Please use location services.",
+    "detect": "Object detection is ready. Use the toggle detection button.",
+    "location": "Location services are available. Use the navigation assistant.",
+    "help": "Available commands: navigate, detect, location, traffic, camera, weather, or emergency",
+    "camera": "Camera is active. Object detection ready.",
+    "weather": "Weather information feature is in development.",
+}
+
+# Replies to these interrupt whatever is being spoken
+HAZARD_COMMANDS = {"emergency", "traffic"}
+
+# Fixed phrases synthesized at startup so the first alert plays immediately
+ALERT_PHRASES = [
+    "Person detected",
+    "Object detection enabled",
+    "Object detection disabled",
+    "Command received. How can I assist you?",
+    "Sorry, I did not understand.",
+    "Please check your internet connection.",
+    "An error occurred. Please try again.",
+] + list(COMMAND_RESPONSES.values())
+
+COMMAND_GRAMMAR = recognizers.command_grammar()
 
 def listen_and_alert():
     """Listen for voice commands and respond"""
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Listening...")
-        try:
-            audio = r.listen(source, timeout=5)
-            result = r.recognize_google(audio)
-            print("You said:", result)
+    print("Listening...")
+    try:
+        # The microphone stays open between commands (see mic_session.py);
+        # an offline backend only listens for the command phrases
+        transcript = recognizers.get_recognizer().listen(
+            mic_session.get_session(), timeout=5, grammar=COMMAND_GRAMMAR,
+            on_partial=lambda text: print("...", text))
+        result = transcript.text
+        print(f"You said: {result} ({transcript.backend})")
 
-            # Basic command processing
-            if "horn" in result.lower() or "traffic" in result.lower():
-                speak("Please wait. Traffic detected ahead.")
-            elif "navigate" in result.lower():
-                speak("Navigation feature available. Please use location services.")
-            elif "help" in result.lower():
-                speak("Available commands: traffic, navigate, help, or camera")
-            elif "camera" in result.lower():
-                speak("Camera is active. Object detection ready.")
-            else:
-                speak("Command received. How can I assist you?")
+        # Basic command processing
+        intent = match_intent(result)
+        command = intent.name if intent else None
+        priority = speech.PRIORITY_HAZARD if command in HAZARD_COMMANDS else speech.PRIORITY_INFO
+        speak(COMMAND_RESPONSES.get(command, "Command received. How can I assist you?"), priority)
 
-        except sr.UnknownValueError:
-            print("Could not understand the audio.")
-            speak("Sorry, I did not understand.")
-        except sr.RequestError as e:
-            print("Internet error:", e)
-            speak("Please check your internet connection.")
-        except Exception as e:
-            print(f"Error occurred: {e}")
-            speak("An error occurred. Please try again.")
+    except sr.UnknownValueError:
+        print("Could not understand the audio.")
+        speak("Sorry, I did not understand.")
+    except sr.RequestError as e:
+        print("Internet error:", e)
+        speak("Please check your internet connection.")
+    except Exception as e:
+        print(f"Error occurred: {e}")
+        speak("An error occurred. Please try again.")
 
 # Load Haar cascades for object detection
 try:
@@ -93,14 +90,30 @@ except Exception as e:
     human_cascade = None
     face_cascade = None
 
+# Boxes from a detection this much older than the displayed frame are not drawn
+MAX_OVERLAY_AGE = 1.0
+# Print UI, camera and detection rates this often (seconds) when SHOW_FPS=1
+STATS_INTERVAL = 5.0
+
 class MainApp(App):
     def __init__(self):
         super().__init__()
         self.detection_active = False
         self.last_detection_time = 0
+        # Camera frames are read on a background thread (see camera.py)
+        self.camera = CameraStream()
+        self.last_frame_seq = 0
+        # Detection runs on its own thread and the UI draws its latest boxes
+        self.detector = DetectionWorker(self.camera, face_cascade) if human_cascade and face_cascade else None
+        self.last_alert_seq = 0
+        self.last_tone_seq = 0
+        self.sounds = None
+        self.ui_fps = 0.0
+        self.last_frame_shown = None
         
     def build(self):
         self.img = Image()
+        self.display = FrameTexture(self.img)
         layout = BoxLayout(orientation='vertical')
         
         # Voice command button
@@ -115,7 +128,20 @@ class MainApp(App):
         layout.add_widget(voice_btn)
         layout.add_widget(detect_btn)
         
+        try:
+            self.camera.start()
+        except Exception as e:
+            print(f"Warning: Could not open camera: {e}")
+        if self.detector is not None:
+            self.detector.start()
+        # Alert tones are decoded once now and played on reserved channels
+        self.sounds = sound_bank.get_sound_bank()
+        if isinstance(speech.get_speech_queue().player, speech.PygamePlayer):
+            tts_cache.get_cache().prewarm(ALERT_PHRASES)
+        
         Clock.schedule_interval(self.update, 1.0 / 30.0)
+        if os.getenv("SHOW_FPS") == "1":
+            Clock.schedule_interval(self.log_stats, STATS_INTERVAL)
         return layout
     
     def start_voice_command(self, instance):
@@ -125,41 +151,75 @@ class MainApp(App):
     def toggle_detection(self, instance):
         """Toggle object detection on/off"""
         self.detection_active = not self.detection_active
+        if self.detector is not None:
+            self.detector.set_active(self.detection_active)
         status = "enabled" if self.detection_active else "disabled"
         speak(f"Object detection {status}")
         print(f"Object detection {status}")
     
+    def stats(self):
+        """UI, camera and detection rates, measured independently"""
+        result = {"ui_fps": round(self.ui_fps, 1)}
+        result.update(self.camera.stats())
+        if self.detector is not None:
+            result.update(self.detector.stats())
+        return result
+    
+    def log_stats(self, dt):
+        print(f"📊 {self.stats()}")
+    
     def update(self, dt):
-        """Update camera feed and perform object detection"""
-        ret, frame = cap.read()
-        if ret:
-            # Perform object detection if active
-            if self.detection_active and human_cascade and face_cascade:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # Detect faces (more reliable than full body)
-                faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-                
-                current_time = Clock.get_time()
-                if len(faces) > 0 and (current_time - self.last_detection_time) > 3:  # 3-second delay
-                    cv2.rectangle(frame, (faces[0][0], faces[0][1]), 
-                                (faces[0][0] + faces[0][2], faces[0][1] + faces[0][3]), (0, 255, 0), 2)
-                    threading.Thread(target=speak, args=["Person detected"], daemon=True).start()
-                    self.last_detection_time = current_time
-                
-                # Draw detection boxes
-                for (x, y, w, h) in faces:
-                    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        """Show the newest camera frame with the latest detection boxes"""
+        with tracing.span("MainApp.update"):
+            self._update_frame()
+
+    def _update_frame(self):
+        latest = self.camera.latest()
+        # Nothing to do until the camera delivers a frame we have not shown
+        if latest is None or latest.seq == self.last_frame_seq:
+            return
+        self.last_frame_seq = latest.seq
+        frame = latest.image
+        if tracing.enabled():
+            tracing.record("camera.frame_age", int(latest.timestamp * 1e9), time.perf_counter_ns(),
+                           self.camera.stats())
+        
+        now = time.perf_counter()
+        if self.last_frame_shown is not None and now > self.last_frame_shown:
+            rate = 1.0 / (now - self.last_frame_shown)
+            self.ui_fps = rate if not self.ui_fps else self.ui_fps + 0.1 * (rate - self.ui_fps)
+        self.last_frame_shown = now
+        
+        # Overlay the newest detection result without waiting for one
+        result = self.detector.latest() if self.detection_active and self.detector else None
+        if result is not None and latest.timestamp - result.frame_timestamp <= MAX_OVERLAY_AGE and result.boxes:
+            # The captured frame is shared; draw on a copy
+            frame = frame.copy()
+            for (x, y, w, h) in result.boxes:
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            
+            # An earcon for each new result; the spoken alert is throttled below
+            if self.sounds is not None and result.seq != self.last_tone_seq:
+                self.sounds.play_for_detections(["face"])
+                self.last_tone_seq = result.seq
             
-            # Display frame
-            buf = cv2.flip(frame, 0).tobytes()
-            img_texture = Texture.create(size=(frame.shape[1], frame.shape[0]), colorfmt='bgr')
-            img_texture.blit_buffer(buf, colorfmt='bgr', bufferfmt='ubyte')
-            self.img.texture = img_texture
+            current_time = Clock.get_time()
+            if result.seq != self.last_alert_seq and (current_time - self.last_detection_time) > 3:  # 3-second delay
+                speak("Person detected", speech.PRIORITY_HAZARD, speech.HAZARD_TTL)
+                self.last_detection_time = current_time
+                self.last_alert_seq = result.seq
+        
+        # Display frame
+        with tracing.span("texture.upload"):
+            self.display.show(frame)
     
     def on_stop(self):
         """Clean up when app closes"""
-        cap.release()
+        print(f"📊 {self.stats()}")
+        if self.detector is not None:
+            self.detector.stop()
+        self.camera.stop()
+        speech.get_speech_queue().close(drain=False)
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Metrics for Blind Assistant
+Counters, gauges and latency histograms rendered as Prometheus text
+
+MetricsMiddleware records per-route request latency, in-flight requests and
+errors for the FastAPI backend. ``stage("name")`` times a block of code (image
+decoding, cascade detection, geocoding) into a per-stage histogram. Everything
+is kept in process memory; each worker exposes its own numbers. When tracing
+is enabled, requests and stages are also recorded as trace spans.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+import tracing
+
+# Latency buckets in seconds, from sub-millisecond stages to slow geocodes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        # Per-bucket counts; cumulative sums are only built when rendering
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *labels):
+        entry = self._values.get(labels)
+        return entry[2] if entry else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted((labels, (list(e[0]), e[1], e[2])) for labels, e in self._values.items())
+        names = self.label_names + ("le",)
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(names, label_values + (le,))} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()):
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "blind_assistant_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "blind_assistant_requests_in_flight", "HTTP requests currently being handled"
+)
+REQUEST_ERRORS = REGISTRY.counter(
+    "blind_assistant_request_errors_total", "HTTP responses with status >= 500 or unhandled errors",
+    ("method", "route", "status")
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "blind_assistant_stage_duration_seconds", "Time spent in named processing stages", ("stage",)
+)
+
+class stage:
+    """Context manager timing a block into the per-stage histogram"""
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter_ns()
+        STAGE_LATENCY.observe(self.name, value=(end - self._start) / 1e9)
+        if tracing.enabled():
+            tracing.record(self.name, self._start, end)
+        return False
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and errors per route"""
+
+    def __init__(self, app, exclude=("/metrics",)):
+        self.app = app
+        self.exclude = set(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end = time.perf_counter_ns()
+            REQUESTS_IN_FLIGHT.dec()
+            # Label by route template, never the raw path, to bound cardinality
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(scope["method"], route, value=(end - start) / 1e9)
+            if status >= 500:
+                REQUEST_ERRORS.inc(scope["method"], route, str(status))
+            if tracing.enabled():
+                tracing.record(f"{scope['method']} {route}", start, end, {"status": status})
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Microphone Session for Blind Assistant
+Keeps the microphone open and ends each capture when the speaker stops
+
+Every voice prompt used to open a new Microphone, spend a second in
+adjust_for_ambient_noise and then wait out the recognizer's fixed pause.
+MicSession opens the stream once, calibrates once and keeps a rolling
+estimate of the background noise from the audio it hears between and after
+phrases. Audio is read in 30 ms frames; a frame is speech when its energy is
+well above the noise floor (and, if webrtcvad is installed, the VAD agrees).
+Capture starts with a little pre-roll before the first speech frame and ends
+after END_SILENCE seconds without speech.
+
+Works with any speech_recognition source (Microphone, AudioFile), so it can
+be tested with WAV files.
+"""
+
+import collections
+import os
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import speech_recognition as sr
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+FRAME_SECONDS = 0.03
+END_SILENCE = float(os.getenv("VOICE_END_SILENCE", "0.5"))  # seconds of silence that end a phrase
+PREROLL = 0.3  # seconds kept from before speech onset
+CALIBRATION = 0.5  # seconds of noise measured when the session opens
+ENERGY_RATIO = 3.0  # speech must be this many times louder (RMS) than the noise floor
+MIN_ENERGY = 150  # never treat quieter audio (16-bit RMS) as speech
+NOISE_ALPHA = 0.05  # weight of each new silent frame in the noise floor
+VAD_MODE = 2  # webrtcvad aggressiveness, 0-3
+
+# Positions are seconds of audio into the stream, so they do not depend on read speed
+Capture = namedtuple("Capture", ["audio", "speech_start", "speech_end", "endpoint", "endpointed_at"])
+
+def frame_energy(data, width):
+    """RMS of a PCM frame on a 16-bit scale"""
+    if width == 2:
+        samples = np.frombuffer(data, "<i2").astype(np.float64)
+    elif width == 1:
+        samples = (np.frombuffer(data, np.uint8).astype(np.float64) - 128.0) * 256.0
+    elif width == 4:
+        samples = np.frombuffer(data, "<i4").astype(np.float64) / 65536.0
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+    if not len(samples):
+        return 0.0
+    return float(np.sqrt(np.mean(samples * samples)))
+
+class MicSession:
+    """Long-lived audio source with adaptive threshold and silence endpointing"""
+
+    def __init__(self, source=None, end_silence=END_SILENCE, energy_ratio=ENERGY_RATIO,
+                 min_energy=MIN_ENERGY, calibration=CALIBRATION, use_vad=True):
+        self.source = source
+        self.end_silence = end_silence
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.calibration = calibration
+        self.noise_energy = None
+        self.last_capture = None
+        self.position = 0.0  # seconds of audio read so far
+        self._owns_source = source is None
+        self._entered = False
+        self._vad = webrtcvad.Vad(VAD_MODE) if (use_vad and webrtcvad is not None) else None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """Start the audio stream (once) and measure the background noise"""
+        if self._entered:
+            return self
+        if self.source is None:
+            self.source = sr.Microphone()
+        if self.source.stream is None:
+            self.source.__enter__()
+        self._entered = True
+        self.rate = self.source.SAMPLE_RATE
+        self.width = self.source.SAMPLE_WIDTH
+        self.frame_samples = max(1, int(self.rate * FRAME_SECONDS))
+        self.frame_seconds = self.frame_samples / self.rate
+        if self._vad is not None and (self.rate not in (8000, 16000, 32000, 48000) or self.width != 2):
+            self._vad = None
+        if self.calibration and self.noise_energy is None:
+            self.calibrate(self.calibration)
+        return self
+
+    def close(self):
+        if self._entered and self._owns_source:
+            self.source.__exit__(None, None, None)
+        self._entered = False
+
+    @property
+    def threshold(self):
+        if self.noise_energy is None:
+            return self.min_energy
+        return max(self.min_energy, self.noise_energy * self.energy_ratio)
+
+    def _read(self):
+        data = self.source.stream.read(self.frame_samples)
+        if data:
+            self.position += len(data) / (self.width * self.rate)
+        return data
+
+    def _update_noise(self, energy):
+        if self.noise_energy is None:
+            self.noise_energy = energy
+        else:
+            self.noise_energy += NOISE_ALPHA * (energy - self.noise_energy)
+
+    def calibrate(self, seconds):
+        """Set the noise floor from the next few frames of audio"""
+        energies = []
+        for _ in range(max(1, int(seconds / self.frame_seconds))):
+            data = self._read()
+            if not data:
+                break
+            energies.append(frame_energy(data, self.width))
+        if energies:
+            self.noise_energy = float(np.median(energies))
+
+    def _drain(self):
+        """Drop audio the driver buffered while nobody was listening"""
+        stream = getattr(self.source.stream, "pyaudio_stream", None)
+        if stream is not None:
+            try:
+                available = stream.get_read_available()
+                if available:
+                    stream.read(available, exception_on_overflow=False)
+            except Exception:
+                pass
+
+    def _is_speech(self, data, energy):
+        if energy < self.threshold:
+            return False
+        if self._vad is None:
+            return True
+        try:
+            return self._vad.is_speech(data, self.rate)
+        except Exception:
+            return True
+
+    def capture(self, timeout=None, phrase_time_limit=None, on_frame=None):
+        """Record one phrase; returns a Capture or raises sr.WaitTimeoutError
+
+        ``on_frame`` is called with each captured frame as it arrives (the
+        pre-roll first), so a streaming recognizer can work during capture.
+        """
+        with self._lock:
+            self.open()
+            self._drain()
+            preroll = collections.deque(maxlen=max(1, int(PREROLL / self.frame_seconds)))
+            started = self.position
+            frames = []
+            speech_start = None
+            last_speech = None
+
+            while True:
+                data = self._read()
+                if not data:
+                    if speech_start is None:
+                        raise sr.WaitTimeoutError("Audio ended before speech started")
+                    break
+                energy = frame_energy(data, self.width)
+                speaking = self._is_speech(data, energy)
+
+                if speech_start is None:
+                    if speaking:
+                        speech_start = self.position - self.frame_seconds
+                        last_speech = self.position
+                        frames.extend(preroll)
+                        frames.append(data)
+                        if on_frame is not None:
+                            for chunk in frames:
+                                on_frame(chunk)
+                        continue
+                    self._update_noise(energy)
+                    preroll.append(data)
+                    if timeout is not None and self.position - started > timeout:
+                        raise sr.WaitTimeoutError("Listening timed out while waiting for phrase to start")
+                    continue
+
+                frames.append(data)
+                if on_frame is not None:
+                    on_frame(data)
+                if speaking:
+                    last_speech = self.position
+                else:
+                    self._update_noise(energy)
+                    if self.position - last_speech >= self.end_silence:
+                        break
+                if phrase_time_limit is not None and self.position - speech_start >= phrase_time_limit:
+                    break
+
+            audio = sr.AudioData(b"".join(frames), self.rate, self.width)
+            self.last_capture = Capture(audio, speech_start, last_speech, self.position, time.perf_counter())
+            return self.last_capture
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        """Drop-in for Recognizer.listen: the AudioData of one phrase"""
+        return self.capture(timeout, phrase_time_limit).audio
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Shared microphone session, opened on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = MicSession()
+        return _session.open()
@@ -5,6 +5,8 @@ import json
 import os
 import sys
 import traceback
+import tracing
+import detection
 
 # Parse command line arguments
 def parse_args():
@@ -14,6 +16,7 @@ def parse_args():
     parser.add_argument('--names', type=str, default='', help='Path to class names file')
     parser.add_argument('--json', action='store_true', help='Output results as JSON')
     parser.add_argument('--confidence', type=float, default=0.5, help='Confidence threshold')
+    parser.add_argument('--trace', type=str, default='', help='Write a chrome://tracing trace to this file')
     return parser.parse_args()
 
 def load_class_names(names_path):
@@ -67,6 +70,7 @@ def detect_objects_yolov5(image_path, model_path, names_path, conf_threshold=0.5
         log_error(f"Error in YOLOv5 detection: {str(e)}", is_json_mode)
         return None
 
+@tracing.traced("detect_objects_yolov3")
 def detect_objects_yolov3(image_path, config_path, weights_path, names_path, conf_threshold=0.5, is_json_mode=False):
     """Detect objects using YOLOv3 with OpenCV DNN"""
     try:
@@ -83,7 +87,8 @@ def detect_objects_yolov3(image_path, config_path, weights_path, names_path, con
         classes = load_class_names(names_path)
         
         # Load image
-        image = cv2.imread(image_path)
+        with tracing.span("imread"):
+            image = cv2.imread(image_path)
         if image is None:
             log_error(f"Could not read image: {image_path}", is_json_mode)
             return None
@@ -92,7 +97,8 @@ def detect_objects_yolov3(image_path, config_path, weights_path, names_path, con
         
         # Load YOLOv3 network
         try:
-            net = cv2.dnn.readNetFromDarknet(config_path, weights_path)
+            with tracing.span("dnn.load", config=os.path.basename(config_path)):
+                net = cv2.dnn.readNetFromDarknet(config_path, weights_path)
         except Exception as e:
             log_error(f"Error loading YOLOv3 model: {str(e)}", is_json_mode)
             return None
@@ -110,57 +116,64 @@ def detect_objects_yolov3(image_path, config_path, weights_path, names_path, con
             return None
             
         # Create blob from image
-        blob = cv2.dnn.blobFromImage(image, 1/255.0, (416, 416), swapRB=True, crop=False)
-        net.setInput(blob)
+        with tracing.span("dnn.blob"):
+            blob = cv2.dnn.blobFromImage(image, 1/255.0, (416, 416), swapRB=True, crop=False)
+            net.setInput(blob)
         
         # Run forward pass
         try:
-            outputs = net.forward(output_layers)
+            with tracing.span("dnn.forward"):
+                outputs = net.forward(output_layers)
         except Exception as e:
             log_error(f"Error during network forward pass: {str(e)}", is_json_mode)
             return None
         
         # Process detections
         detections = []
-        for output in outputs:
-            for detection in output:
-                scores = detection[5:]
-                class_id = np.argmax(scores)
-                confidence = scores[class_id]
+        with tracing.span("dnn.postprocess"):
+            for output in outputs:
+                for detection in output:
+                    scores = detection[5:]
+                    class_id = np.argmax(scores)
+                    confidence = scores[class_id]
                 
-                if confidence > conf_threshold:
-                    # Scale bounding box coordinates to image size
-                    center_x = int(detection[0] * width)
-                    center_y = int(detection[1] * height)
-                    w = int(detection[2] * width)
-                    h = int(detection[3] * height)
+                    if confidence > conf_threshold:
+                        # Scale bounding box coordinates to image size
+                        center_x = int(detection[0] * width)
+                        center_y = int(detection[1] * height)
+                        w = int(detection[2] * width)
+                        h = int(detection[3] * height)
                     
-                    # Rectangle coordinates
-                    x = int(center_x - w / 2)
-                    y = int(center_y - h / 2)
+                        # Rectangle coordinates
+                        x = int(center_x - w / 2)
+                        y = int(center_y - h / 2)
                     
-                    detections.append({
-                        'label': classes[class_id] if class_id < len(classes) else f"class_{class_id}",
-                        'confidence': float(confidence),
-                        'bbox': [x, y, w, h]
-                    })
+                        detections.append({
+                            'label': classes[class_id] if class_id < len(classes) else f"class_{class_id}",
+                            'confidence': float(confidence),
+                            'bbox': [x, y, w, h]
+                        })
         
         return detections
     except Exception as e:
         log_error(f"Error in YOLOv3 detection: {str(e)}", is_json_mode)
         return None
 
+@tracing.traced("detect_faces")
 def detect_faces(image):
     """Fallback face detection using Haar cascades"""
     try:
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # Convert to grayscale at the detection working resolution
+        with tracing.span("cvtColor"):
+            gray, scale = detection.to_working_gray(image)
         
         # Load face cascade
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        with tracing.span("cascade.load"):
+            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
         
         # Detect faces
-        faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+        with tracing.span("detectMultiScale"):
+            faces = detection.detect(face_cascade, gray, scale)
         
         # Create detection objects
         detections = []
@@ -176,6 +189,7 @@ def detect_faces(image):
         # Return empty list if all detection methods fail
         return []
 
+@tracing.traced("process_image")
 def process_image(image_path, model_path, names_path, conf_threshold=0.5, is_json_mode=False):
     """Process image with available models, trying different options"""
     # Get project root directory
@@ -212,7 +226,8 @@ def process_image(image_path, model_path, names_path, conf_threshold=0.5, is_jso
             return detections
     
     # 4. Last resort: try face detection
-    image = cv2.imread(image_path)
+    with tracing.span("imread"):
+        image = cv2.imread(image_path)
     if image is not None:
         return detect_faces(image)
     
@@ -224,6 +239,8 @@ def main():
     # Parse arguments
     args = parse_args()
     is_json_mode = args.json or '--json' in sys.argv
+    if args.trace:
+        tracing.enable(args.trace)
     
     try:
         # Process image if provided
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Speech Recognizer Backends for Blind Assistant
+Google online recognition, Vosk offline recognition, or both in order
+
+Every voice path used to call recognize_google, a network round trip that
+fails without connectivity. A RecognizerChain tries its backends in order
+(SPEECH_BACKENDS, default "vosk,google") and moves on when one cannot
+understand the audio or cannot be reached. Backends missing their library or
+model are skipped. For commands a grammar built from the intent phrases
+keeps the offline recognizer to the small command vocabulary, which is both
+faster and more accurate than open dictation.
+
+Streaming backends (Vosk) are fed audio while the microphone is still
+capturing, report partial transcripts as they go and have the final result
+ready almost as soon as the speaker stops.
+"""
+
+import json
+import os
+import time
+from collections import namedtuple
+
+import speech_recognition as sr
+
+from intents import DEFAULT_INTENTS
+
+try:
+    import vosk
+    vosk.SetLogLevel(-1)
+except ImportError:
+    vosk = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SPEECH_BACKENDS = os.getenv("SPEECH_BACKENDS", "vosk,google")
+SPEECH_LANGUAGE = os.getenv("SPEECH_LANGUAGE", "en-US")
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", os.path.join(os.path.dirname(SCRIPT_DIR), "vosk-model"))
+VOSK_RATE = 16000
+
+# seconds is the time spent recognizing after capture ended
+Transcript = namedtuple("Transcript", ["text", "confidence", "backend", "seconds"])
+
+def command_grammar(intents=DEFAULT_INTENTS):
+    """Phrases a grammar-constrained recognizer should listen for"""
+    phrases = []
+    for intent in intents:
+        for phrase in intent.phrases:
+            if phrase not in phrases:
+                phrases.append(phrase)
+    return phrases
+
+class RecognizerBackend:
+    """One recognition engine; raises sr.UnknownValueError or sr.RequestError"""
+
+    name = "base"
+    streaming = False
+
+    def recognize(self, audio, grammar=None):
+        raise NotImplementedError
+
+    def stream(self, rate, width, grammar=None):
+        """Incremental recognizer for live audio (see BufferedStream)"""
+        return BufferedStream(self, rate, width, grammar)
+
+class BufferedStream:
+    """Collects audio and recognizes it in one go when the phrase ends"""
+
+    def __init__(self, backend, rate, width, grammar=None):
+        self.backend = backend
+        self.rate = rate
+        self.width = width
+        self.grammar = grammar
+        self._frames = []
+
+    def accept(self, data):
+        """Feed captured audio; returns a partial transcript or None"""
+        self._frames.append(data)
+        return None
+
+    def finish(self):
+        audio = sr.AudioData(b"".join(self._frames), self.rate, self.width)
+        return self.backend.recognize(audio, self.grammar)
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API through speech_recognition (needs internet)"""
+
+    name = "google"
+
+    def __init__(self, language=SPEECH_LANGUAGE):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio, grammar=None):
+        start = time.perf_counter()
+        text = self.recognizer.recognize_google(audio, language=self.language)
+        return Transcript(text, None, self.name, time.perf_counter() - start)
+
+class VoskBackend(RecognizerBackend):
+    """Offline Kaldi recognition with a downloaded Vosk model"""
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        if vosk is None:
+            raise RuntimeError("vosk is not installed (pip install vosk)")
+        if not os.path.isdir(model_path):
+            raise RuntimeError(f"Vosk model not found at {model_path} (set VOSK_MODEL_PATH)")
+        self.model = vosk.Model(model_path)
+
+    def _recognizer(self, rate, grammar):
+        if grammar:
+            recognizer = vosk.KaldiRecognizer(self.model, rate, json.dumps(list(grammar) + ["[unk]"]))
+        else:
+            recognizer = vosk.KaldiRecognizer(self.model, rate)
+        recognizer.SetWords(True)
+        return recognizer
+
+    def recognize(self, audio, grammar=None):
+        stream = self.stream(VOSK_RATE, 2, grammar)
+        stream.accept(audio.get_raw_data(convert_rate=VOSK_RATE, convert_width=2))
+        return stream.finish()
+
+    def stream(self, rate, width, grammar=None):
+        if width != 2:
+            return BufferedStream(self, rate, width, grammar)
+        return _VoskStream(self, self._recognizer(rate, grammar))
+
+class _VoskStream:
+    def __init__(self, backend, recognizer):
+        self.backend = backend
+        self.recognizer = recognizer
+        self._segments = []
+        self._words = []
+
+    def _collect(self, result):
+        result = json.loads(result)
+        text = result.get("text", "")
+        if text and text != "[unk]":
+            self._segments.append(text)
+            self._words.extend(result.get("result", []))
+
+    def accept(self, data):
+        if self.recognizer.AcceptWaveform(data):
+            self._collect(self.recognizer.Result())
+            return " ".join(self._segments) or None
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self._segments + [partial]).strip() or None
+
+    def finish(self):
+        start = time.perf_counter()
+        self._collect(self.recognizer.FinalResult())
+        text = " ".join(self._segments).replace("[unk]", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        confidences = [word.get("conf", 1.0) for word in self._words]
+        confidence = sum(confidences) / len(confidences) if confidences else None
+        return Transcript(text, confidence, self.backend.name, time.perf_counter() - start)
+
+BACKENDS = {"google": GoogleBackend, "vosk": VoskBackend}
+
+class RecognizerChain:
+    """Backends tried in order until one returns a transcript"""
+
+    def __init__(self, backends):
+        if not backends:
+            raise ValueError("No speech recognizer backends available")
+        self.backends = list(backends)
+
+    def recognize(self, audio, grammar=None, skip=()):
+        error = None
+        for backend in self.backends:
+            if backend in skip:
+                continue
+            try:
+                return backend.recognize(audio, grammar)
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                error = e
+        raise error if error is not None else sr.UnknownValueError()
+
+    def listen(self, session, timeout=None, phrase_time_limit=None, grammar=None, on_partial=None):
+        """Capture one phrase from a MicSession and transcribe it
+
+        The first backend recognizes while audio is captured; ``on_partial``
+        receives each new partial transcript. If it fails, the captured audio
+        goes to the remaining backends.
+        """
+        session.open()
+        primary = self.backends[0]
+        stream = primary.stream(session.rate, session.width, grammar)
+        last_partial = [None]
+
+        def on_frame(data):
+            partial = stream.accept(data)
+            if partial and partial != last_partial[0]:
+                last_partial[0] = partial
+                if on_partial is not None:
+                    on_partial(partial)
+
+        capture = session.capture(timeout, phrase_time_limit, on_frame=on_frame)
+        try:
+            return stream.finish()
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            if len(self.backends) == 1:
+                raise
+            try:
+                return self.recognize(capture.audio, grammar, skip=(primary,))
+            except sr.UnknownValueError:
+                raise e
+
+def available_backends(names=SPEECH_BACKENDS):
+    backends = []
+    for name in [n.strip() for n in names.split(",") if n.strip()]:
+        backend_class = BACKENDS.get(name)
+        if backend_class is None:
+            print(f"⚠️  Unknown speech backend: {name}")
+            continue
+        try:
+            backends.append(backend_class())
+        except Exception as e:
+            print(f"⚠️  Speech backend {name} unavailable: {e}")
+    return backends
+
+_chain = None
+
+def get_recognizer():
+    """Shared recognizer chain built from SPEECH_BACKENDS"""
+    global _chain
+    if _chain is None:
+        backends = available_backends()
+        _chain = RecognizerChain(backends or [GoogleBackend()])
+    return _chain
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Route Cache for Blind Assistant
+Keeps OpenRouteService walking routes on disk and reuses them
+
+Users walk the same few routes every day, yet every directions request went
+to ORS. RouteCache keys a route by its profile and waypoints snapped to a
+grid (ROUTE_SNAP_DECIMALS, 4 decimals is about 11 m), so GPS jitter between
+trips still finds the stored route. Each route is one small JSON file: the
+geometry as an encoded polyline plus the segment and step lists. Entries
+older than ROUTE_CACHE_TTL are refetched, and the least recently used files
+are removed beyond ROUTE_CACHE_SIZE. Hits come back in the same GeoJSON
+shape ORS returns, so callers do not change.
+
+Coordinates are (longitude, latitude), the order ORS uses.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROUTE_CACHE_DIR = os.getenv("ROUTE_CACHE_DIR", os.path.join(os.path.dirname(SCRIPT_DIR), ".route_cache"))
+ROUTE_CACHE_TTL = float(os.getenv("ROUTE_CACHE_TTL", str(7 * 86400)))  # seconds
+ROUTE_CACHE_SIZE = int(os.getenv("ROUTE_CACHE_SIZE", "500"))  # routes kept on disk
+ROUTE_SNAP_DECIMALS = int(os.getenv("ROUTE_SNAP_DECIMALS", "4"))
+MEMORY_ITEMS = 32
+STEP_FIELDS = ("instruction", "distance", "duration", "type", "name", "way_points", "exit_number")
+
+LOOKUPS = metrics.REGISTRY.counter(
+    "blind_assistant_route_cache_total", "Route cache lookups", ("result",)
+)
+
+def encode_polyline(coordinates, precision=5):
+    """Google encoded polyline of (lon, lat) pairs"""
+    factor = 10 ** precision
+    output = []
+    previous = (0, 0)
+    for lon, lat in coordinates:
+        point = (round(lat * factor), round(lon * factor))
+        for value, last in zip(point, previous):
+            delta = value - last
+            delta = ~(delta << 1) if delta < 0 else delta << 1
+            while delta >= 0x20:
+                output.append(chr((0x20 | (delta & 0x1f)) + 63))
+                delta >>= 5
+            output.append(chr(delta + 63))
+        previous = point
+    return "".join(output)
+
+def decode_polyline(encoded, precision=5):
+    """(lon, lat) pairs from a Google encoded polyline"""
+    factor = 10 ** precision
+    coordinates = []
+    index = lat = lon = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        coordinates.append([lon / factor, lat / factor])
+    return coordinates
+
+def _compact_segment(segment):
+    return {
+        "distance": segment.get("distance", 0),
+        "duration": segment.get("duration", 0),
+        "steps": [{k: step[k] for k in STEP_FIELDS if k in step} for step in segment.get("steps", [])],
+    }
+
+class RouteCache:
+    """Disk-backed, size-bounded route store with a small memory LRU"""
+
+    def __init__(self, cache_dir=ROUTE_CACHE_DIR, ttl=ROUTE_CACHE_TTL, max_items=ROUTE_CACHE_SIZE,
+                 snap_decimals=ROUTE_SNAP_DECIMALS):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_items = max_items
+        self.snap_decimals = snap_decimals
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                print(f"⚠️  Route disk cache disabled: {e}")
+                self.cache_dir = None
+
+    def snap(self, coordinates):
+        return [[round(lon, self.snap_decimals), round(lat, self.snap_decimals)] for lon, lat in coordinates]
+
+    def key(self, coordinates, profile):
+        snapped = ";".join(f"{lon:.{self.snap_decimals}f},{lat:.{self.snap_decimals}f}"
+                           for lon, lat in self.snap(coordinates))
+        return hashlib.sha256(f"{profile}\0{snapped}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read cached route {key}: {e}")
+            return None
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > MEMORY_ITEMS:
+                self._memory.popitem(last=False)
+
+    def _forget(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, coordinates, profile="foot-walking"):
+        """Cached route in ORS GeoJSON shape, or None"""
+        key = self.key(coordinates, profile)
+        entry = self._load(key)
+        if entry is not None and time.time() - entry["created"] > self.ttl:
+            self._forget(key)
+            self.expired += 1
+            self.misses += 1
+            LOOKUPS.inc("expired")
+            return None
+        if entry is None:
+            self.misses += 1
+            LOOKUPS.inc("miss")
+            return None
+        self.hits += 1
+        LOOKUPS.inc("hit")
+        self._remember(key, entry)
+        if self.cache_dir:
+            try:
+                # Recently used routes are evicted last
+                os.utime(self._path(key))
+            except OSError:
+                pass
+        return {
+            "type": "FeatureCollection",
+            "features": [{
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": decode_polyline(entry["polyline"])},
+                "properties": {"segments": entry["segments"], "summary": entry["summary"]},
+            }],
+        }
+
+    def put(self, coordinates, route, profile="foot-walking"):
+        """Store an ORS GeoJSON route"""
+        feature = route["features"][0]
+        properties = feature["properties"]
+        segments = [_compact_segment(segment) for segment in properties.get("segments", [])]
+        entry = {
+            "created": time.time(),
+            "profile": profile,
+            "coordinates": self.snap(coordinates),
+            "polyline": encode_polyline(feature["geometry"]["coordinates"]),
+            "segments": segments,
+            "summary": properties.get("summary") or {
+                "distance": sum(s["distance"] for s in segments),
+                "duration": sum(s["duration"] for s in segments),
+            },
+        }
+        key = self.key(coordinates, profile)
+        self._remember(key, entry)
+        if not self.cache_dir:
+            return
+        try:
+            # Write then rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"⚠️  Could not cache route: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        try:
+            files = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        excess = len(files) - self.max_items
+        if excess <= 0:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:excess]:
+            self._forget(entry.name[:-len(".json")])
+            self.evictions += 1
+
+    def directions(self, client, coordinates, profile="foot-walking"):
+        """client.directions(...) in GeoJSON, answered from the cache when possible"""
+        route = self.get(coordinates, profile)
+        if route is None:
+            route = client.directions(coordinates, profile=profile, format="geojson")
+            self.put(coordinates, route, profile)
+        return route
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "expired": self.expired,
+                "evictions": self.evictions, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+_cache = None
+
+def get_route_cache():
+    """Shared process-wide route cache"""
+    global _cache
+    if _cache is None:
+        _cache = RouteCache()
+    return _cache
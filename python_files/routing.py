@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+Offline Walking Router for Blind Assistant
+Turn-by-turn walking directions from a local OpenStreetMap extract
+
+The walkable ways of an OSM extract (.osm XML, or .pbf with osmium) are
+turned into an undirected graph stored as CSR arrays: ``indptr`` gives each
+node's slice of ``indices`` (neighbours), ``weights`` (metres) and
+``edge_names``. Only the largest connected component is kept so every snapped
+point can reach every other. The graph is saved as one .npz file that loads
+in milliseconds.
+
+Queries use A* with a straight-line heuristic, bidirectional Dijkstra, or,
+when the graph was built with ``--ch``, a contraction hierarchy: nodes are
+contracted in order of importance, shortcuts preserve shortest distances, and
+a query only searches upwards from both ends. Preprocessing is pure Python
+and takes minutes on large extracts, so it is optional.
+
+Routes come back in the GeoJSON shape OpenRouteService returns (segments,
+steps with instruction/distance/duration/type/way_points), so existing
+callers can use a Router wherever they used the ORS client.
+
+    python routing.py build delhi.osm walking_graph.npz --ch
+    python routing.py route walking_graph.npz 28.6129 77.2295 28.6315 77.2190
+"""
+
+import heapq
+import math
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+import geomath
+
+try:
+    import osmium
+except ImportError:
+    osmium = None
+
+DEFAULT_GRAPH_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "walking_graph.npz"
+)
+ROUTING_METHOD = os.getenv("ROUTING_METHOD", "auto")  # auto, astar, bidijkstra, ch
+WALKING_SPEED = 5.0 / 3.6  # m/s, as ORS foot-walking
+MAX_SNAP_M = 500.0  # farthest a point may be from the graph
+WITNESS_SETTLE_LIMIT = 60  # nodes a CH witness search may settle
+
+WALKABLE = {
+    "footway", "path", "pedestrian", "steps", "living_street", "residential", "service",
+    "track", "unclassified", "tertiary", "tertiary_link", "secondary", "secondary_link",
+    "primary", "primary_link", "trunk", "trunk_link", "road", "cycleway", "bridleway",
+    "corridor",
+}
+NO_ACCESS = {"no", "private"}
+FOOT_ALLOWED = {"yes", "designated", "permissive"}
+
+# ORS instruction types
+TYPE_LEFT, TYPE_RIGHT, TYPE_SHARP_LEFT, TYPE_SHARP_RIGHT = 0, 1, 2, 3
+TYPE_SLIGHT_LEFT, TYPE_SLIGHT_RIGHT, TYPE_STRAIGHT = 4, 5, 6
+TYPE_UTURN, TYPE_GOAL, TYPE_DEPART = 9, 10, 11
+
+class RoutingError(Exception):
+    """No walking route between the requested points"""
+
+def walkable(tags):
+    """Whether an OSM way with these tags can be walked"""
+    if tags.get("highway") not in WALKABLE:
+        return False
+    foot = tags.get("foot")
+    if foot in NO_ACCESS:
+        return False
+    return tags.get("access") not in NO_ACCESS or foot in FOOT_ALLOWED
+
+def _way_name(tags):
+    return tags.get("name") or tags.get("ref") or ""
+
+def _read_xml(path):
+    coords = {}
+    ways = []
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag == "node":
+            coords[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+            elem.clear()
+        elif elem.tag == "way":
+            tags = {tag.get("k"): tag.get("v") for tag in elem.iter("tag")}
+            if walkable(tags):
+                ways.append(([int(nd.get("ref")) for nd in elem.iter("nd")], _way_name(tags)))
+            elem.clear()
+        elif elem.tag == "relation":
+            elem.clear()
+    return coords, ways
+
+def _read_pbf(path):
+    if osmium is None:
+        raise RuntimeError("Reading .pbf extracts needs osmium (pip install osmium)")
+    coords = {}
+    ways = []
+
+    class Handler(osmium.SimpleHandler):
+        def way(self, way):
+            tags = {tag.k: tag.v for tag in way.tags}
+            if walkable(tags):
+                refs = []
+                for node in way.nodes:
+                    if node.location.valid():
+                        coords[node.ref] = (node.location.lat, node.location.lon)
+                        refs.append(node.ref)
+                ways.append((refs, _way_name(tags)))
+
+    Handler().apply_file(path, locations=True)
+    return coords, ways
+
+def read_osm(path):
+    """Node coordinates and walkable (node refs, name) ways from an extract"""
+    if path.endswith(".pbf"):
+        return _read_pbf(path)
+    return _read_xml(path)
+
+def _csr(count, src, dst, *columns):
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=count), out=indptr[1:])
+    return (indptr, dst[order]) + tuple(column[order] for column in columns)
+
+def _components(count, indptr, indices):
+    labels = np.full(count, -1, dtype=np.int64)
+    indptr, indices = indptr.tolist(), indices.tolist()
+    for start in range(count):
+        if labels[start] >= 0:
+            continue
+        labels[start] = start
+        stack = [start]
+        while stack:
+            u = stack.pop()
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if labels[v] < 0:
+                    labels[v] = start
+                    stack.append(v)
+    return labels
+
+class RoadGraph:
+    """Undirected walking graph in CSR arrays, optionally with a contraction hierarchy"""
+
+    def __init__(self, latitudes, longitudes, indptr, indices, weights, edge_names, names, ch=None):
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.edge_names = edge_names
+        self.names = names
+        self.ch = ch  # (rank, indptr, indices, weights, middle) of the upward graph
+        self._lists = None
+        self._ch_lists = None
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    @property
+    def edge_count(self):
+        return len(self.indices) // 2
+
+    @classmethod
+    def from_ways(cls, coords, ways):
+        """Build from node coordinates and (node refs, name) ways, largest component only"""
+        node_ids = {}
+        names = [""]
+        name_ids = {"": 0}
+        src, dst, name_index = [], [], []
+        for refs, name in ways:
+            refs = [ref for ref in refs if ref in coords]
+            if name not in name_ids:
+                name_ids[name] = len(names)
+                names.append(name)
+            name_id = name_ids[name]
+            for a, b in zip(refs, refs[1:]):
+                if a == b:
+                    continue
+                ia = node_ids.setdefault(a, len(node_ids))
+                ib = node_ids.setdefault(b, len(node_ids))
+                src += [ia, ib]
+                dst += [ib, ia]
+                name_index += [name_id, name_id]
+        if not src:
+            raise RoutingError("No walkable ways in the extract")
+
+        count = len(node_ids)
+        latlon = np.array([coords[ref] for ref in node_ids], dtype=np.float64)
+        src, dst = np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+        name_index = np.array(name_index, dtype=np.int32)
+
+        # Keep the largest connected component
+        indptr, indices = _csr(count, src, dst)
+        labels = _components(count, indptr, indices)
+        keep = labels == np.bincount(labels).argmax()
+        remap = np.cumsum(keep) - 1
+        edges = keep[src]
+        src, dst, name_index = remap[src[edges]], remap[dst[edges]], name_index[edges]
+        latlon = latlon[keep]
+
+        weights = geomath.haversine_m(latlon[src, 0], latlon[src, 1], latlon[dst, 0], latlon[dst, 1])
+        indptr, indices, weights, edge_names = _csr(len(latlon), src, dst, weights, name_index)
+        return cls(latlon[:, 0].copy(), latlon[:, 1].copy(), indptr, indices.astype(np.int32),
+                   weights, edge_names, names)
+
+    @classmethod
+    def from_osm(cls, path):
+        return cls.from_ways(*read_osm(path))
+
+    def save(self, path):
+        arrays = {
+            "latitudes": self.latitudes, "longitudes": self.longitudes, "indptr": self.indptr,
+            "indices": self.indices, "weights": self.weights, "edge_names": self.edge_names,
+            "names": np.array(self.names),
+        }
+        if self.ch is not None:
+            for key, value in zip(("ch_rank", "ch_indptr", "ch_indices", "ch_weights", "ch_middle"), self.ch):
+                arrays[key] = value
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            ch = None
+            if "ch_rank" in data:
+                ch = tuple(data[key] for key in ("ch_rank", "ch_indptr", "ch_indices", "ch_weights", "ch_middle"))
+            return cls(data["latitudes"], data["longitudes"], data["indptr"], data["indices"],
+                       data["weights"], data["edge_names"], data["names"].tolist(), ch)
+
+    def adjacency(self):
+        """CSR arrays as Python lists, which the search loops index fastest"""
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist(), self.weights.tolist())
+        return self._lists
+
+    def nearest_node(self, latitude, longitude):
+        """(node, distance in metres) closest to a point"""
+        distances = geomath.haversine_m(latitude, longitude, self.latitudes, self.longitudes)
+        node = int(np.argmin(distances))
+        return node, float(distances[node])
+
+    def edge(self, u, v):
+        """(weight, name) of the shortest edge u-v"""
+        indptr, indices, weights = self.adjacency()
+        best = None
+        for k in range(indptr[u], indptr[u + 1]):
+            if indices[k] == v and (best is None or weights[k] < weights[best]):
+                best = k
+        if best is None:
+            raise KeyError((u, v))
+        return weights[best], self.names[self.edge_names[best]]
+
+    def path_length(self, path):
+        return sum(self.edge(u, v)[0] for u, v in zip(path, path[1:]))
+
+    # --- searches ---------------------------------------------------------
+
+    def astar(self, source, target):
+        """(distance, node path) by A* with a haversine heuristic, or None"""
+        indptr, indices, weights = self.adjacency()
+        lat_t, lon_t = math.radians(self.latitudes[target]), math.radians(self.longitudes[target])
+        cos_t = math.cos(lat_t)
+        lats, lons = self.latitudes, self.longitudes
+        estimates = {}
+
+        def heuristic(v):
+            h = estimates.get(v)
+            if h is None:
+                lat, lon = math.radians(lats[v]), math.radians(lons[v])
+                a = math.sin((lat_t - lat) / 2) ** 2 + cos_t * math.cos(lat) * math.sin((lon_t - lon) / 2) ** 2
+                # Shaved slightly so float rounding never overestimates
+                h = estimates[v] = 2 * geomath.EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0))) * 0.999999
+            return h
+
+        dist = {source: 0.0}
+        parent = {source: -1}
+        heap = [(heuristic(source), 0.0, source)]
+        closed = set()
+        while heap:
+            _, g, u = heapq.heappop(heap)
+            if u == target:
+                return g, _walk_back(parent, target)
+            if u in closed:
+                continue
+            closed.add(u)
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                ng = g + weights[k]
+                if ng < dist.get(v, math.inf):
+                    dist[v] = ng
+                    parent[v] = u
+                    heapq.heappush(heap, (ng + heuristic(v), ng, v))
+        return None
+
+    def bidirectional_dijkstra(self, source, target):
+        """(distance, node path) searching from both ends at once, or None"""
+        if source == target:
+            return 0.0, [source]
+        indptr, indices, weights = self.adjacency()
+        dist = ({source: 0.0}, {target: 0.0})
+        parent = ({source: -1}, {target: -1})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        settled = (set(), set())
+        best, meet = math.inf, -1
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, u = heapq.heappop(heaps[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            mine, other = dist[side], dist[1 - side]
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                nd = d + weights[k]
+                if nd < mine.get(v, math.inf):
+                    mine[v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+                if v in other and mine[v] + other[v] < best:
+                    best, meet = mine[v] + other[v], v
+        if meet < 0:
+            return None
+        forward = _walk_back(parent[0], meet)
+        backward = _walk_back(parent[1], meet)
+        return best, forward + backward[-2::-1]
+
+    # --- contraction hierarchy ------------------------------------------------
+
+    def contract(self, settle_limit=WITNESS_SETTLE_LIMIT, progress=None):
+        """Build the contraction hierarchy used by ch_query"""
+        count = len(self)
+        indptr, indices, weights = self.adjacency()
+        adj = [dict() for _ in range(count)]  # neighbour -> (weight, middle node or -1)
+        for u in range(count):
+            for k in range(indptr[u], indptr[u + 1]):
+                v, w = indices[k], weights[k]
+                if v != u and (v not in adj[u] or w < adj[u][v][0]):
+                    adj[u][v] = (w, -1)
+        rank = [-1] * count
+        contracted_neighbours = [0] * count
+
+        def witness(source, excluded, limit):
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap and settled < settle_limit:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                if d > limit:
+                    break
+                settled += 1
+                for x, (w, _) in adj[u].items():
+                    if x == excluded or rank[x] >= 0:
+                        continue
+                    nd = d + w
+                    if nd < dist.get(x, math.inf):
+                        dist[x] = nd
+                        heapq.heappush(heap, (nd, x))
+            return dist
+
+        def shortcuts(v, apply):
+            neighbours = [(u, w) for u, (w, _) in adj[v].items() if rank[u] < 0]
+            added = 0
+            for i, (u, wu) in enumerate(neighbours[:-1]):
+                rest = neighbours[i + 1:]
+                found = witness(u, v, wu + max(wx for _, wx in rest))
+                for x, wx in rest:
+                    via = wu + wx
+                    # Any path avoiding v that is no longer makes the shortcut unnecessary
+                    if found.get(x, math.inf) <= via:
+                        continue
+                    added += 1
+                    if apply and via < adj[u].get(x, (math.inf,))[0]:
+                        adj[u][x] = (via, v)
+                        adj[x][u] = (via, v)
+            return added - len(neighbours)
+
+        heap = [(shortcuts(v, False), v) for v in range(count)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            priority = shortcuts(v, False) + contracted_neighbours[v]
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, v))
+                continue
+            shortcuts(v, True)
+            rank[v] = order
+            order += 1
+            for u in adj[v]:
+                if rank[u] < 0:
+                    contracted_neighbours[u] += 1
+            if progress and order % 1000 == 0:
+                progress(order, count)
+
+        src, dst, up_weights, middle = [], [], [], []
+        for u in range(count):
+            for v, (w, m) in adj[u].items():
+                if rank[v] > rank[u]:
+                    src.append(u)
+                    dst.append(v)
+                    up_weights.append(w)
+                    middle.append(m)
+        up = _csr(count, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                  np.array(up_weights, dtype=np.float64), np.array(middle, dtype=np.int64))
+        self.ch = (np.array(rank, dtype=np.int64), up[0], up[1].astype(np.int32), up[2], up[3])
+        self._ch_lists = None
+        return self
+
+    def _ch_adjacency(self):
+        if self._ch_lists is None:
+            _, indptr, indices, weights, middle = self.ch
+            self._ch_lists = (indptr.tolist(), indices.tolist(), weights.tolist(), middle.tolist())
+        return self._ch_lists
+
+    def _ch_middle(self, low, high):
+        indptr, indices, weights, middle = self._ch_adjacency()
+        best = None
+        for k in range(indptr[low], indptr[low + 1]):
+            if indices[k] == high and (best is None or weights[k] < weights[best]):
+                best = k
+        return middle[best]
+
+    def _unpack(self, a, b, mid, out):
+        """Append the original nodes after ``a`` up to ``b`` of edge a-b"""
+        stack = [(a, b, mid)]
+        while stack:
+            a, b, mid = stack.pop()
+            if mid < 0:
+                out.append(b)
+                continue
+            stack.append((mid, b, self._ch_middle(mid, b)))
+            stack.append((a, mid, self._ch_middle(mid, a)))
+
+    def ch_query(self, source, target):
+        """(distance, node path) through the contraction hierarchy, or None"""
+        if self.ch is None:
+            raise RoutingError("Graph has no contraction hierarchy (build with --ch)")
+        if source == target:
+            return 0.0, [source]
+        indptr, indices, weights, middle = self._ch_adjacency()
+        dist = ({source: 0.0}, {target: 0.0})
+        parent = ({source: (-1, -1)}, {target: (-1, -1)})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        best, meet = math.inf, -1
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            d, u = heapq.heappop(heaps[side])
+            if d > dist[side][u]:
+                continue
+            if d >= best:
+                # Nothing cheaper on this side; drain it
+                heaps[side].clear()
+                continue
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best, meet = d + other, u
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                nd = d + weights[k]
+                if nd < dist[side].get(v, math.inf):
+                    dist[side][v] = nd
+                    parent[side][v] = (u, middle[k])
+                    heapq.heappush(heaps[side], (nd, v))
+        if meet < 0:
+            return None
+
+        def chain(side):
+            edges = []
+            v = meet
+            while parent[side][v][0] >= 0:
+                u, mid = parent[side][v]
+                edges.append((u, v, mid))
+                v = u
+            return edges
+
+        path = [source]
+        for u, v, mid in reversed(chain(0)):
+            self._unpack(u, v, mid, path)
+        for u, v, mid in chain(1):
+            self._unpack(v, u, mid, path)
+        return best, path
+
+def _walk_back(parent, node):
+    path = []
+    while node >= 0:
+        path.append(node)
+        node = parent[node]
+    return path[::-1]
+
+def _turn(delta):
+    """ORS type and wording for a change of heading (positive is right)"""
+    angle = abs(delta)
+    side = "right" if delta > 0 else "left"
+    if angle < 20:
+        return TYPE_STRAIGHT, "Continue straight"
+    if angle < 45:
+        return (TYPE_SLIGHT_RIGHT if delta > 0 else TYPE_SLIGHT_LEFT), f"Turn slight {side}"
+    if angle < 120:
+        return (TYPE_RIGHT if delta > 0 else TYPE_LEFT), f"Turn {side}"
+    if angle < 170:
+        return (TYPE_SHARP_RIGHT if delta > 0 else TYPE_SHARP_LEFT), f"Turn sharp {side}"
+    return TYPE_UTURN, "Make a U-turn"
+
+class Router:
+    """Walking directions over a RoadGraph, shaped like ORS responses"""
+
+    METHODS = ("astar", "bidijkstra", "ch")
+
+    def __init__(self, graph, method=ROUTING_METHOD, max_snap_m=MAX_SNAP_M):
+        if method == "auto":
+            method = "ch" if graph.ch is not None else "astar"
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown routing method: {method}")
+        self.graph = graph
+        self.method = method
+        self.max_snap_m = max_snap_m
+
+    def snap(self, lon, lat):
+        node, distance = self.graph.nearest_node(lat, lon)
+        if distance > self.max_snap_m:
+            raise RoutingError(f"No walkable path within {self.max_snap_m:.0f} m of ({lat:.5f}, {lon:.5f})")
+        return node
+
+    def shortest_path(self, source, target):
+        """(distance, node path) between two graph nodes"""
+        search = {"astar": self.graph.astar, "bidijkstra": self.graph.bidirectional_dijkstra,
+                  "ch": self.graph.ch_query}[self.method]
+        result = search(source, target)
+        if result is None:
+            raise RoutingError("No walking route found")
+        return result
+
+    def _steps(self, path, offset):
+        """ORS steps for one node path; way_points index the route geometry"""
+        graph = self.graph
+        lats, lons = graph.latitudes, graph.longitudes
+        if len(path) < 2:
+            return [{"distance": 0.0, "duration": 0.0, "type": TYPE_GOAL,
+                     "instruction": "Arrive at your destination", "name": "-", "way_points": [offset, offset]}]
+        a, b = np.array(path[:-1]), np.array(path[1:])
+        bearings = np.atleast_1d(geomath.initial_bearing(lats[a], lons[a], lats[b], lons[b]))
+        edges = [graph.edge(u, v) for u, v in zip(path, path[1:])]
+
+        steps = []
+        for i, (weight, name) in enumerate(edges):
+            delta = (bearings[i] - bearings[i - 1] + 540) % 360 - 180 if i else 0.0
+            new_step = (i == 0 or name != edges[i - 1][1]
+                        or (not name and abs(delta) >= 45) or abs(delta) >= 120)
+            if new_step:
+                if i == 0:
+                    heading = geomath.compass_direction(bearings[0]).lower().replace("-", "")
+                    step_type, instruction = TYPE_DEPART, f"Head {heading}"
+                    preposition = "on"
+                else:
+                    step_type, instruction = _turn(delta)
+                    preposition = "onto"
+                if name:
+                    instruction = f"{instruction} {preposition} {name}"
+                steps.append({"distance": 0.0, "duration": 0.0, "type": step_type, "instruction": instruction,
+                              "name": name or "-", "way_points": [offset + i, offset + i]})
+            step = steps[-1]
+            step["distance"] += weight
+            step["duration"] += weight / WALKING_SPEED
+            step["way_points"][1] = offset + i + 1
+        end = offset + len(path) - 1
+        steps.append({"distance": 0.0, "duration": 0.0, "type": TYPE_GOAL,
+                      "instruction": "Arrive at your destination", "name": "-", "way_points": [end, end]})
+        for step in steps:
+            step["distance"] = round(step["distance"], 1)
+            step["duration"] = round(step["duration"], 1)
+        return steps
+
+    def route(self, coordinates):
+        """Walking route through (lon, lat) waypoints as ORS GeoJSON"""
+        if len(coordinates) < 2:
+            raise RoutingError("Need at least two coordinates")
+        nodes = [self.snap(lon, lat) for lon, lat in coordinates]
+        graph = self.graph
+        geometry_nodes = [nodes[0]]
+        segments = []
+        way_points = [0]
+        for source, target in zip(nodes, nodes[1:]):
+            distance, path = self.shortest_path(source, target)
+            steps = self._steps(path, len(geometry_nodes) - 1)
+            segments.append({"distance": round(distance, 1), "duration": round(distance / WALKING_SPEED, 1),
+                             "steps": steps})
+            geometry_nodes.extend(path[1:])
+            way_points.append(len(geometry_nodes) - 1)
+        geometry = [[float(graph.longitudes[n]), float(graph.latitudes[n])] for n in geometry_nodes]
+        if len(geometry) == 1:
+            geometry.append(geometry[0])
+        return {
+            "type": "FeatureCollection",
+            "features": [{
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": geometry},
+                "properties": {
+                    "segments": segments,
+                    "summary": {"distance": round(sum(s["distance"] for s in segments), 1),
+                                "duration": round(sum(s["duration"] for s in segments), 1)},
+                    "way_points": way_points,
+                },
+            }],
+        }
+
+    def directions(self, coordinates, profile="foot-walking", format="geojson"):
+        """Same call as openrouteservice.Client.directions for walking routes"""
+        if not profile.startswith("foot"):
+            raise RoutingError(f"Offline routing only supports walking, not {profile}")
+        if format != "geojson":
+            raise ValueError("Offline routing only returns geojson")
+        return self.route(coordinates)
+
+_default_router = None
+_default_loaded = False
+
+def get_router():
+    """Shared router over ROUTING_GRAPH_PATH (or walking_graph.npz), None if absent"""
+    global _default_router, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        path = os.getenv("ROUTING_GRAPH_PATH", DEFAULT_GRAPH_PATH)
+        if os.path.exists(path):
+            try:
+                _default_router = Router(RoadGraph.load(path))
+            except Exception as e:
+                print(f"Warning: Could not load walking graph {path}: {e}")
+    return _default_router
+
+def main():
+    """Build or query a walking graph from the command line"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    if len(args) == 3 and args[0] == "build":
+        start = time.perf_counter()
+        graph = RoadGraph.from_osm(args[1])
+        print(f"✅ {len(graph)} nodes, {graph.edge_count} edges in {time.perf_counter() - start:.1f} s")
+        if "--ch" in flags:
+            start = time.perf_counter()
+            graph.contract(progress=lambda done, total: print(f"   contracted {done}/{total}", end="\r"))
+            print(f"✅ Contraction hierarchy: {len(graph.ch[2])} upward edges "
+                  f"in {time.perf_counter() - start:.1f} s")
+        graph.save(args[2])
+        return 0
+    if len(args) == 6 and args[0] == "route":
+        method = next((flag[len("--method="):] for flag in flags if flag.startswith("--method=")), ROUTING_METHOD)
+        router = Router(RoadGraph.load(args[1]), method)
+        lat1, lon1, lat2, lon2 = map(float, args[2:])
+        start = time.perf_counter()
+        route = router.route([(lon1, lat1), (lon2, lat2)])
+        elapsed = time.perf_counter() - start
+        segment = route["features"][0]["properties"]["segments"][0]
+        for i, step in enumerate(segment["steps"], 1):
+            print(f"{i:2d}. {step['instruction']} ({step['distance']:.0f} m)")
+        print(f"📏 {segment['distance']:.0f} m, {segment['duration'] / 60:.1f} min ({router.method}, "
+              f"{elapsed * 1000:.1f} ms)")
+        return 0
+
+    print("Usage: python routing.py build <extract.osm|extract.osm.pbf> <graph.npz> [--ch]")
+    print("       python routing.py route <graph.npz> <lat> <lon> <lat> <lon> [--method=astar|bidijkstra|ch]")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
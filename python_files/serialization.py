@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Response Serialization for Blind Assistant
+Fast JSON encoding, compact detection payloads and response compression
+
+``dumps`` uses orjson when it is installed and the standard library otherwise
+(set JSON_BACKEND=stdlib to force the fallback). FastJSONResponse plugs it into
+FastAPI. ``columnar`` turns a list of detection dicts into parallel arrays so
+keys are not repeated per object. Large streamed responses are compressed with
+brotli or gzip, whichever the client accepts and is available, flushing after
+every chunk so results still arrive as they are produced.
+"""
+
+import gzip
+import json
+import os
+import zlib
+from contextlib import aclosing
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson" if orjson else "stdlib")
+if JSON_BACKEND == "orjson" and orjson is None:
+    print("⚠️  orjson not installed, using the standard json module")
+    JSON_BACKEND = "stdlib"
+
+# Streamed responses with fewer items than this are sent uncompressed
+COMPRESS_MIN_ITEMS = int(os.getenv("COMPRESS_MIN_ITEMS", "8"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+def get_dumps(backend=None):
+    """Serializer returning UTF-8 bytes for the named backend"""
+    backend = backend or JSON_BACKEND
+    if backend == "orjson":
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+        return _orjson_dumps
+    if backend == "stdlib":
+        return _stdlib_dumps
+    raise ValueError(f"Unknown JSON backend: {backend}")
+
+dumps = get_dumps()
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the configured fast serializer"""
+
+    def render(self, content):
+        return dumps(content)
+
+def columnar(objects):
+    """Detection dicts as parallel arrays of labels, confidences and boxes
+
+    Descriptions depend only on the label, so each is sent once.
+    """
+    labels = []
+    confidences = []
+    bboxes = []
+    descriptions = {}
+    for obj in objects:
+        labels.append(obj["type"])
+        confidences.append(obj["confidence"])
+        bboxes.append(obj["bbox"])
+        if "description" in obj:
+            descriptions.setdefault(obj["type"], obj["description"])
+    return {"labels": labels, "confidences": confidences, "bboxes": bboxes, "descriptions": descriptions}
+
+def negotiate_encoding(accept_encoding):
+    """Best supported content coding from an Accept-Encoding header, or None"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = None
+    for coding in candidates:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (coding, q)
+    return best[0] if best else None
+
+class _StreamCompressor:
+    """Incremental compressor that flushes whole chunks to the client"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "gzip":
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data):
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+async def compress_stream(chunks, encoding):
+    """Compress an async iterator of byte chunks, one flushed block per chunk"""
+    compressor = _StreamCompressor(encoding)
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.finish()
+
+def compress(data, encoding):
+    """Compress a whole body with ``encoding`` ('br' or 'gzip')"""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(data, GZIP_LEVEL)
+    raise ValueError(f"Unsupported encoding: {encoding}")
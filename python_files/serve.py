@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Production Server for Blind Assistant
+Pre-fork multi-worker serving of the FastAPI backend
+
+The master process imports the app (loading the Haar cascades, gazetteer and
+POI index once), binds the listening socket and forks one uvicorn worker per
+CPU. Workers share the preloaded models copy-on-write and accept from the same
+socket. The master restarts workers that exit, for example after
+``--max-requests`` requests to bound memory growth, replaces all workers
+gracefully on SIGHUP and drains them on SIGTERM/SIGINT. Workers that die
+right after starting are restarted with exponential backoff, and the master
+gives up after MAX_FAST_FAILURES of them in a row.
+
+    python serve.py --workers 4 --max-requests 5000
+"""
+
+import argparse
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+import tracing
+
+# A worker that exits sooner than this after starting counts as a failed start
+FAST_EXIT_SECONDS = 5.0
+RESPAWN_BACKOFF = 0.2  # first delay in seconds, doubling per failed start
+RESPAWN_BACKOFF_MAX = 30.0
+MAX_FAST_FAILURES = 10
+
+def default_workers():
+    """One worker per CPU this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def preload():
+    """Import the app and load shared models before forking"""
+    import backend_main
+    import gazetteer
+    import spatial_index
+    gazetteer.get_gazetteer()
+    spatial_index.get_spatial_index()
+    return backend_main.app
+
+def bind_socket(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def run_worker(app, sock, max_requests, log_level):
+    """Worker body: serve the preloaded app on the shared socket, then exit"""
+    import uvicorn
+    import cv2
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    # One OpenCV thread per worker; the workers already cover every core
+    cv2.setNumThreads(1)
+
+    limit = None
+    if max_requests:
+        # Jitter so workers started together do not all recycle together
+        limit = max_requests + random.randint(0, max(1, max_requests // 10))
+    config = uvicorn.Config(app, limit_max_requests=limit, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+class Master:
+    """Forks, supervises and replaces worker processes"""
+
+    def __init__(self, app, sock, workers, max_requests=0, graceful_timeout=30, log_level="info",
+                 max_fast_failures=MAX_FAST_FAILURES):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.max_requests = max_requests
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.max_fast_failures = max_fast_failures
+        self.children = {}  # pid -> (generation, start time)
+        self.generation = 0
+        self.fast_failures = 0  # consecutive workers that died right after starting
+        self._missing = 0  # workers to respawn
+        self._respawn_at = 0.0
+        self.gave_up = False
+        self._stopping = False
+        self._reload = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(self.app, self.sock, self.max_requests, self.log_level)
+            except BaseException as e:
+                print(f"❌ Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                status = 1
+            finally:
+                # os._exit skips atexit, so write out buffered trace events here
+                tracing.flush()
+                os._exit(status)
+        self.children[pid] = (self.generation, time.monotonic())
+        return pid
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def _on_reload(self, signum, frame):
+        self._reload = True
+
+    def _reap(self):
+        """Collect exited workers; return how many of the current generation died"""
+        died = 0
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            generation, started = self.children.pop(pid, (None, 0.0))
+            if generation != self.generation:
+                continue
+            died += 1
+            if time.monotonic() - started < FAST_EXIT_SECONDS:
+                self.fast_failures += 1
+            else:
+                self.fast_failures = 0
+        return died
+
+    def backoff(self):
+        """Delay before respawning after the current run of failed starts"""
+        if not self.fast_failures:
+            return 0.0
+        return min(RESPAWN_BACKOFF * 2 ** (self.fast_failures - 1), RESPAWN_BACKOFF_MAX)
+
+    def _respawn(self):
+        """Replace workers that exited, backing off while they keep failing to start"""
+        died = self._reap()
+        if died:
+            self._missing += died
+            self._respawn_at = time.monotonic() + self.backoff()
+            if self.fast_failures >= self.max_fast_failures:
+                print(f"❌ {self.fast_failures} workers in a row exited right after starting; giving up",
+                      file=sys.stderr)
+                self.gave_up = True
+                self._stopping = True
+                return
+            if self.fast_failures:
+                print(f"⚠️  Worker exited right after starting; restarting in {self.backoff():.1f} s",
+                      file=sys.stderr)
+        if self._missing and not self._stopping and time.monotonic() >= self._respawn_at:
+            for _ in range(self._missing):
+                self.spawn()
+            self._missing = 0
+
+    def _signal_generation(self, sig, generation=None):
+        for pid, (gen, _) in list(self.children.items()):
+            if generation is None or gen == generation:
+                try:
+                    os.kill(pid, sig)
+                except ProcessLookupError:
+                    pass
+
+    def reload(self):
+        """Start a fresh set of workers, then drain the old ones"""
+        old = self.generation
+        self.generation += 1
+        self.fast_failures = 0
+        self._missing = 0
+        print(f"🔄 Replacing workers (generation {self.generation})")
+        for _ in range(self.workers):
+            self.spawn()
+        self._signal_generation(signal.SIGTERM, old)
+
+    def run(self):
+        """Serve until stopped; returns 1 if workers kept failing to start"""
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+
+        for _ in range(self.workers):
+            self.spawn()
+        print(f"✅ Master {os.getpid()} serving with {self.workers} workers")
+
+        while not self._stopping:
+            if self._reload:
+                self._reload = False
+                self.reload()
+            # Replace workers that exited (recycled, crashed)
+            self._respawn()
+            time.sleep(0.2)
+
+        print("🛑 Stopping workers...")
+        self._signal_generation(signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        self._signal_generation(signal.SIGKILL)
+        self._reap()
+        return 1 if self.gave_up else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Blind Assistant production server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int,
+                        default=int(os.getenv("WEB_CONCURRENCY", "0")) or default_workers())
+    parser.add_argument("--max-requests", type=int, default=0,
+                        help="Recycle a worker after about this many requests (0 = never)")
+    parser.add_argument("--graceful-timeout", type=float, default=30.0)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    app = preload()
+
+    if not hasattr(os, "fork"):
+        # Windows: no fork, serve from this single process
+        import uvicorn
+        print("⚠️  Multi-worker serving needs fork(); running a single process")
+        uvicorn.run(app, host=args.host, port=args.port, log_level=args.log_level)
+        return 0
+
+    sock = bind_socket(args.host, args.port)
+    return Master(app, sock, args.workers, args.max_requests, args.graceful_timeout, args.log_level).run()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Alert Sounds for Blind Assistant
+Preloaded earcons played on reserved mixer channels
+
+A tone says "something is ahead" much faster than a spoken sentence. The
+SoundBank decodes alert.mp3 and synthesizes a few short tones into
+pygame.mixer.Sound objects once at startup, so triggering one is only a
+channel.play() on PCM already in memory. Alerts use their own reserved
+channels: they can overlap each other and speech (which plays through
+pygame.mixer.music) and are never cut off by other sounds. Each detected
+class maps to an earcon, repeated at most once per cooldown.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ALERT_SOUND = os.path.join(os.path.dirname(SCRIPT_DIR), "alert.mp3")
+ALERT_CHANNELS = int(os.getenv("ALERT_CHANNELS", "4"))
+EARCON_COOLDOWN = float(os.getenv("EARCON_COOLDOWN", "0.75"))  # seconds between repeats of one earcon
+# Mixer buffer in frames: 256 at 44.1 kHz adds under 6 ms of output latency
+MIXER_BUFFER = int(os.getenv("MIXER_BUFFER", "256"))
+
+# Synthesized earcons: (frequency Hz, seconds) segments played back to back
+TONES = {
+    "vehicle": [(880, 0.07), (0, 0.03), (1320, 0.09)],
+    "obstacle": [(330, 0.12)],
+    "confirm": [(660, 0.05)],
+}
+
+# Detected class -> earcon; unknown classes use "obstacle"
+EARCONS = {
+    "face": "alert",
+    "person": "alert",
+    "car": "vehicle",
+    "bus": "vehicle",
+    "truck": "vehicle",
+    "motorbike": "vehicle",
+    "bicycle": "vehicle",
+}
+
+def tone_samples(segments, rate, channels, volume=0.6):
+    """Sine tone PCM (int16, interleaved) for a list of (frequency, seconds)"""
+    parts = []
+    for frequency, seconds in segments:
+        t = np.arange(int(rate * seconds)) / rate
+        wave = np.sin(2 * np.pi * frequency * t) if frequency else np.zeros_like(t)
+        # 5 ms fade in/out so tones do not click
+        fade = min(len(t) // 2, int(rate * 0.005))
+        if fade:
+            ramp = np.linspace(0.0, 1.0, fade)
+            wave[:fade] *= ramp
+            wave[-fade:] *= ramp[::-1]
+        parts.append(wave)
+    samples = (np.concatenate(parts) * volume * 32767).astype(np.int16)
+    return np.repeat(samples[:, None], channels, axis=1)
+
+class SoundBank:
+    """Named in-memory sounds played on a set of reserved channels"""
+
+    def __init__(self, reserved_channels=ALERT_CHANNELS, cooldown=EARCON_COOLDOWN):
+        if not pygame.mixer.get_init():
+            pygame.mixer.pre_init(buffer=MIXER_BUFFER)
+            pygame.mixer.init()
+        self.rate, size, self.mixer_channels = pygame.mixer.get_init()
+        if abs(size) != 16:
+            raise RuntimeError(f"Unsupported mixer sample size: {size}")
+        if pygame.mixer.get_num_channels() < reserved_channels + 2:
+            pygame.mixer.set_num_channels(reserved_channels + 2)
+        # Channels 0..n-1 are kept out of pygame's automatic channel picking
+        pygame.mixer.set_reserved(reserved_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(reserved_channels)]
+        self.cooldown = cooldown
+        self.sounds = {}
+        self._last_played = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def load(self, name, path):
+        """Decode an audio file into memory under name"""
+        self.sounds[name] = pygame.mixer.Sound(path)
+        return self.sounds[name]
+
+    def add_tone(self, name, segments, volume=0.6):
+        samples = tone_samples(segments, self.rate, self.mixer_channels, volume)
+        self.sounds[name] = pygame.mixer.Sound(buffer=samples.tobytes())
+        return self.sounds[name]
+
+    def load_defaults(self):
+        """alert.mp3 plus the synthesized earcons"""
+        for name, segments in TONES.items():
+            self.add_tone(name, segments)
+        try:
+            self.load("alert", ALERT_SOUND)
+        except Exception as e:
+            print(f"⚠️  Could not load {ALERT_SOUND}: {e}")
+            self.add_tone("alert", [(1000, 0.1), (0, 0.05), (1000, 0.1)])
+        return self
+
+    def _channel(self):
+        """A free reserved channel, else the next one in turn (cutting it off)"""
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        channel = self.channels[self._next]
+        self._next = (self._next + 1) % len(self.channels)
+        return channel
+
+    def play(self, name, volume=1.0):
+        """Start a preloaded sound now; returns the channel used"""
+        sound = self.sounds[name]
+        with self._lock:
+            channel = self._channel()
+            channel.set_volume(volume)
+            channel.play(sound)
+        return channel
+
+    def play_for(self, label, now=None):
+        """Play the earcon for a detected class unless it just played"""
+        earcon = EARCONS.get(label, "obstacle")
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now - self._last_played.get(earcon, float("-inf")) < self.cooldown:
+                return None
+            self._last_played[earcon] = now
+        return self.play(earcon)
+
+    def play_for_detections(self, labels, now=None):
+        """One earcon per distinct class in a detection result"""
+        played = []
+        for earcon_label in dict.fromkeys(labels):
+            channel = self.play_for(earcon_label, now)
+            if channel is not None:
+                played.append(earcon_label)
+        return played
+
+_bank = None
+_bank_failed = not PYGAME_AVAILABLE
+
+def get_sound_bank():
+    """Shared sound bank with the default sounds, or None without audio"""
+    global _bank, _bank_failed
+    if _bank is None and not _bank_failed:
+        try:
+            _bank = SoundBank().load_defaults()
+        except Exception as e:
+            print(f"⚠️  Alert sounds unavailable: {e}")
+            _bank_failed = True
+    return _bank
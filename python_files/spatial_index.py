@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Spatial Index for Blind Assistant
+Offline reverse geocoding and nearby-POI queries over a memory-mapped grid
+
+Places are bucketed into a fixed lat/lon grid and stored sorted by cell in a
+single binary file. Opening the index memory-maps that file, so startup does no
+parsing and every worker process shares the same page cache. A query
+binary-searches the cell keys row by row and filters candidates by haversine
+distance.
+
+Build an index from the same CSV/GeoJSON files the gazetteer reads:
+    python spatial_index.py build places.csv pois.bin
+"""
+
+import math
+import os
+import struct
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from gazetteer import read_places
+from geomath import EARTH_RADIUS_M, haversine_m
+
+NearbyPlace = namedtuple(
+    "NearbyPlace", ["name", "address", "latitude", "longitude", "distance"]
+)
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pois.bin"
+)
+
+MAGIC = b"BAPOI001"
+# magic, count, name bytes, address bytes, cell size in degrees
+HEADER = struct.Struct("<8sQQQd")
+DEFAULT_CELL_DEG = 0.01  # roughly 1.1 km of latitude
+
+class SpatialIndex:
+    """Read-only grid index over a memory-mapped POI file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, count, name_bytes, address_bytes, cell_deg = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a POI index file: {path}")
+
+        self.count = count
+        self.cell_deg = cell_deg
+        self._columns = int(math.ceil(360.0 / cell_deg))
+
+        offset = HEADER.size
+        def view(dtype, length):
+            nonlocal offset
+            if length == 0:
+                return np.zeros(0, dtype=dtype)
+            array = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(length,))
+            offset += array.nbytes
+            return array
+
+        self.cells = view(np.int64, count)
+        self.latitudes = view(np.float64, count)
+        self.longitudes = view(np.float64, count)
+        self._name_offsets = view(np.uint64, count + 1)
+        self._address_offsets = view(np.uint64, count + 1)
+        self._names = view(np.uint8, name_bytes)
+        self._addresses = view(np.uint8, address_bytes)
+
+    def __len__(self):
+        return self.count
+
+    def _text(self, blob, offsets, i):
+        start, end = int(offsets[i]), int(offsets[i + 1])
+        return bytes(blob[start:end]).decode("utf-8")
+
+    def _place(self, i, distance):
+        name = self._text(self._names, self._name_offsets, i)
+        address = self._text(self._addresses, self._address_offsets, i) or name
+        return NearbyPlace(name, address, float(self.latitudes[i]), float(self.longitudes[i]), distance)
+
+    def _column_ranges(self, longitude, dlon):
+        """Inclusive column ranges covering longitude ± dlon, split at the antimeridian"""
+        col_min = int((longitude - dlon + 180.0) // self.cell_deg)
+        col_max = int((longitude + dlon + 180.0) // self.cell_deg)
+        if col_max - col_min + 1 >= self._columns:
+            return [(0, self._columns - 1)]
+        col_min %= self._columns
+        col_max %= self._columns
+        if col_min <= col_max:
+            return [(col_min, col_max)]
+        return [(col_min, self._columns - 1), (0, col_max)]
+
+    def _candidates(self, latitude, longitude, radius_m):
+        """Indices of places in the grid cells overlapping the search circle"""
+        dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        dlon = min(math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat)), 180.0)
+
+        row_min = int((max(latitude - dlat, -90.0) + 90.0) // self.cell_deg)
+        row_max = int((min(latitude + dlat, 90.0) + 90.0) // self.cell_deg)
+        columns = self._column_ranges(longitude, dlon)
+
+        ranges = []
+        for row in range(row_min, row_max + 1):
+            # Cells in one grid row are contiguous in the sorted key array
+            for col_min, col_max in columns:
+                lo = np.searchsorted(self.cells, row * self._columns + col_min, side="left")
+                hi = np.searchsorted(self.cells, row * self._columns + col_max, side="right")
+                if hi > lo:
+                    ranges.append(np.arange(lo, hi))
+        if not ranges:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(ranges)
+
+    def within(self, latitude, longitude, radius_m, limit=None):
+        """Places within ``radius_m`` metres, nearest first"""
+        candidates = self._candidates(latitude, longitude, radius_m)
+        if len(candidates) == 0:
+            return []
+        # Longitude differences wrap, so places across the antimeridian are near
+        dlon = (self.longitudes[candidates] - longitude + 180.0) % 360.0 - 180.0
+        distances = haversine_m(latitude, longitude, self.latitudes[candidates], longitude + dlon)
+        inside = distances <= radius_m
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return [self._place(int(candidates[i]), float(distances[i])) for i in order]
+
+    def nearest(self, latitude, longitude, k=1, max_distance_m=50000.0):
+        """The ``k`` nearest places, searching outwards up to ``max_distance_m``"""
+        radius = self.cell_deg * 111320.0
+        while True:
+            radius = min(radius, max_distance_m)
+            places = self.within(latitude, longitude, radius, limit=k)
+            # Everything closer than ``radius`` has been seen, so k hits are final
+            if len(places) >= k or radius >= max_distance_m:
+                return places
+            radius *= 2
+
+    def reverse(self, latitude, longitude, max_distance_m=250.0):
+        """Closest named place to a coordinate, or None if nothing is near"""
+        places = self.nearest(latitude, longitude, k=1, max_distance_m=max_distance_m)
+        return places[0] if places else None
+
+def build_index(records, out_path, cell_deg=DEFAULT_CELL_DEG):
+    """Write a POI index file from place records (see gazetteer.read_places)"""
+    names, addresses, latitudes, longitudes = [], [], [], []
+    for record in records:
+        names.append(record["name"].encode("utf-8"))
+        addresses.append((record.get("address") or "").encode("utf-8"))
+        latitudes.append(float(record["latitude"]))
+        longitudes.append(float(record["longitude"]))
+
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    columns = int(math.ceil(360.0 / cell_deg))
+    rows = np.floor((latitudes + 90.0) / cell_deg).astype(np.int64)
+    # Longitude 180 falls in the same column as -180
+    cols = np.floor((longitudes + 180.0) / cell_deg).astype(np.int64) % columns
+    cells = rows * columns + cols
+    order = np.argsort(cells, kind="stable")
+
+    def blob(values):
+        values = [values[i] for i in order]
+        offsets = np.zeros(len(values) + 1, dtype=np.uint64)
+        offsets[1:] = np.cumsum([len(v) for v in values], dtype=np.uint64)
+        return offsets, b"".join(values)
+
+    name_offsets, name_blob = blob(names)
+    address_offsets, address_blob = blob(addresses)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(order), len(name_blob), len(address_blob), cell_deg))
+        for array in (cells[order], latitudes[order], longitudes[order], name_offsets, address_offsets):
+            f.write(array.tobytes())
+        f.write(name_blob)
+        f.write(address_blob)
+    os.replace(tmp_path, out_path)
+    return len(order)
+
+_default_index = None
+_default_loaded = False
+
+def get_spatial_index():
+    """Shared index from POI_INDEX_PATH (or pois.bin), None if absent"""
+    global _default_index, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        path = os.getenv("POI_INDEX_PATH", DEFAULT_INDEX_PATH)
+        if os.path.exists(path):
+            try:
+                _default_index = SpatialIndex(path)
+            except Exception as e:
+                print(f"Warning: Could not load POI index {path}: {e}")
+    return _default_index
+
+def main():
+    """Build or query a POI index from the command line"""
+    if len(sys.argv) == 4 and sys.argv[1] == "build":
+        count = build_index(read_places(sys.argv[2]), sys.argv[3])
+        print(f"✅ Indexed {count} places into {sys.argv[3]}")
+        return 0
+    if len(sys.argv) in (5, 6) and sys.argv[1] == "nearby":
+        index = SpatialIndex(sys.argv[2])
+        radius = float(sys.argv[5]) if len(sys.argv) == 6 else 500.0
+        for place in index.within(float(sys.argv[3]), float(sys.argv[4]), radius, limit=10):
+            print(f"{place.distance:7.0f} m  {place.name}")
+        return 0
+
+    print("Usage: python spatial_index.py build <places.csv|places.geojson> <pois.bin>")
+    print("       python spatial_index.py nearby <pois.bin> <lat> <lon> [radius_m]")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
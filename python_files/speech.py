@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Speech Output Queue for Blind Assistant
+One playback worker, hazard alerts first, no duplicates, no stale messages
+
+Every spoken message goes through a SpeechQueue instead of its own thread or
+a blocking runAndWait. Messages are played one at a time, highest priority
+first (FIFO within a priority). A message that is already waiting or playing
+is not queued again, messages that waited past their time-to-live are
+dropped unplayed, and a hazard alert cuts off lower-priority speech that is
+playing. Audio that still has to be synthesized (a player with ``prepare``)
+is produced on a separate thread before the message can be played, so a
+slow synthesis never holds up playback or an interrupt. Queue wait times
+and drops are recorded in the metrics registry.
+"""
+
+import heapq
+import io
+import itertools
+import threading
+import time
+
+import metrics
+
+PRIORITY_HAZARD = 100
+PRIORITY_NAVIGATION = 50
+PRIORITY_INFO = 10
+PRIORITY_NAMES = {PRIORITY_HAZARD: "hazard", PRIORITY_NAVIGATION: "navigation", PRIORITY_INFO: "info"}
+
+DEFAULT_TTL = 15.0  # seconds a message may wait before it is pointless
+HAZARD_TTL = 3.0
+MAX_PENDING = 32
+# Playing speech below this priority is interrupted by a higher-priority message at or above it
+PREEMPT_PRIORITY = PRIORITY_HAZARD
+
+QUEUE_LATENCY = metrics.REGISTRY.histogram(
+    "blind_assistant_speech_queue_seconds", "Time spoken messages wait before playback", ("priority",)
+)
+DROPPED = metrics.REGISTRY.counter(
+    "blind_assistant_speech_dropped_total", "Spoken messages never played", ("reason",)
+)
+
+def _priority_name(priority):
+    return PRIORITY_NAMES.get(priority, str(priority))
+
+class _Utterance:
+    __slots__ = ("text", "key", "priority", "seq", "enqueued", "expires", "cancelled", "audio")
+
+    def __init__(self, text, key, priority, seq, enqueued, expires):
+        self.text = text
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = enqueued
+        self.expires = expires
+        self.cancelled = False
+        self.audio = text  # what the player is given: the text or prepared audio
+
+    def __lt__(self, other):
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+class SpeechQueue:
+    """Priority queue of messages played by a single worker thread"""
+
+    def __init__(self, player, max_pending=MAX_PENDING):
+        self.player = player
+        self.max_pending = max_pending
+        self.played = 0
+        self._heap = []  # ready to play
+        self._unprepared = []  # waiting for player.prepare()
+        self._pending = {}  # key -> _Utterance waiting to play
+        self._current = None
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._prepare_thread = None
+        self._closed = False
+
+    def say(self, text, priority=PRIORITY_INFO, ttl=None, key=None):
+        """Queue text for playback; returns False when it was collapsed or dropped"""
+        key = key or text
+        now = time.monotonic()
+        expires = now + (ttl if ttl is not None else DEFAULT_TTL)
+        # Audio already synthesized is ready at once; the rest is prepared on
+        # its own thread so a cache miss never delays what is queued behind it
+        audio = text
+        if hasattr(self.player, "prepare"):
+            lookup = getattr(self.player, "lookup", None)
+            audio = lookup(text) if lookup is not None else None
+        with self._cond:
+            if self._closed:
+                return False
+            current = self._current
+            if current is not None and current.key == key and current.priority >= priority:
+                DROPPED.inc("duplicate")
+                return False
+
+            existing = self._pending.get(key)
+            enqueued = now
+            if existing is not None:
+                if existing.priority >= priority:
+                    existing.expires = max(existing.expires, expires)
+                    DROPPED.inc("duplicate")
+                    return False
+                # Promote: replace with the higher priority, keep the original wait time
+                existing.cancelled = True
+                enqueued = existing.enqueued
+                del self._pending[key]
+
+            if len(self._pending) >= self.max_pending:
+                lowest = min(self._pending.values(), key=lambda u: (u.priority, u.seq))
+                if lowest.priority >= priority:
+                    DROPPED.inc("overflow")
+                    return False
+                lowest.cancelled = True
+                del self._pending[lowest.key]
+                DROPPED.inc("overflow")
+
+            utterance = _Utterance(text, key, priority, next(self._seq), enqueued, expires)
+            self._pending[key] = utterance
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="speech", daemon=True)
+                self._thread.start()
+            if audio is None:
+                heapq.heappush(self._unprepared, utterance)
+                if self._prepare_thread is None:
+                    self._prepare_thread = threading.Thread(target=self._prepare, name="speech-prepare", daemon=True)
+                    self._prepare_thread.start()
+                self._cond.notify_all()
+            else:
+                utterance.audio = audio
+                self._ready(utterance)
+        return True
+
+    def _ready(self, utterance):
+        """Make a message playable (lock held), interrupting speech it outranks"""
+        heapq.heappush(self._heap, utterance)
+        self._cond.notify_all()
+        current = self._current
+        if current is not None and current.priority < utterance.priority and utterance.priority >= PREEMPT_PRIORITY:
+            # Under the lock, so the stop cannot fall between choosing the
+            # current message and the player resetting for it
+            self._interrupt()
+
+    def _interrupt(self):
+        stop = getattr(self.player, "stop", None)
+        if stop is not None:
+            try:
+                stop()
+            except Exception as e:
+                print(f"Speech error: {e}")
+
+    def _prepare(self):
+        """Synthesis worker: prepares messages, highest priority first"""
+        while True:
+            with self._cond:
+                while not self._unprepared and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                utterance = heapq.heappop(self._unprepared)
+                if utterance.cancelled:
+                    continue
+            try:
+                audio = self.player.prepare(utterance.text)
+            except Exception as e:
+                print(f"Speech error: {e}")
+                audio = None
+            with self._cond:
+                if utterance.cancelled:
+                    continue
+                if audio is None:
+                    del self._pending[utterance.key]
+                    DROPPED.inc("error")
+                    self._cond.notify_all()
+                    continue
+                utterance.audio = audio
+                self._ready(utterance)
+
+    def _next(self):
+        """Highest-priority live message, or None once closed and drained"""
+        with self._cond:
+            while True:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    return None
+                utterance = heapq.heappop(self._heap)
+                if utterance.cancelled:
+                    continue
+                del self._pending[utterance.key]
+                if time.monotonic() > utterance.expires:
+                    DROPPED.inc("expired")
+                    self._cond.notify_all()
+                    continue
+                self._current = utterance
+                # Clear an earlier stop in the same critical section that a
+                # later interrupt takes, so that interrupt is never lost
+                reset = getattr(self.player, "reset", None)
+                if reset is not None:
+                    reset()
+                return utterance
+
+    def _run(self):
+        while True:
+            utterance = self._next()
+            if utterance is None:
+                return
+            QUEUE_LATENCY.observe(_priority_name(utterance.priority), value=time.monotonic() - utterance.enqueued)
+            try:
+                self.player.play(utterance.audio)
+            except Exception as e:
+                print(f"Speech error: {e}")
+            with self._cond:
+                self._current = None
+                self.played += 1
+                self._cond.notify_all()
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def wait_idle(self, timeout=None):
+        """Block until nothing is queued or playing; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and self._current is None, timeout)
+
+    def close(self, drain=True, timeout=None):
+        """Stop accepting messages; optionally finish the queued ones first"""
+        if drain:
+            self.wait_idle(timeout)
+        with self._cond:
+            self._closed = True
+            for utterance in self._pending.values():
+                utterance.cancelled = True
+            self._pending.clear()
+            self._unprepared.clear()
+            self._cond.notify_all()
+
+class PygamePlayer:
+    """Plays cached synthesized audio (see tts_cache.py) through pygame"""
+
+    def __init__(self):
+        import pygame
+        import tts_cache
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self.pygame = pygame
+        self.cache = tts_cache.get_cache()
+        self._stopped = threading.Event()
+
+    def lookup(self, text):
+        """Already synthesized audio for text, or None"""
+        return self.cache.lookup(text, lang='en')
+
+    def prepare(self, text):
+        """Synthesize (or fetch from the cache) before the message is played"""
+        return self.cache.get(text, lang='en')
+
+    def reset(self):
+        """Forget a stop aimed at the previous message"""
+        self._stopped.clear()
+
+    def play(self, clip):
+        if isinstance(clip, str):
+            clip = self.prepare(clip)
+        # A stop may arrive before playback starts; it still counts
+        if self._stopped.is_set():
+            return
+        music = self.pygame.mixer.music
+        music.load(io.BytesIO(clip.data), clip.fmt)
+        music.play()
+        while music.get_busy() and not self._stopped.is_set():
+            self.pygame.time.wait(20)
+        if self._stopped.is_set():
+            music.stop()
+
+    def stop(self):
+        self._stopped.set()
+        self.pygame.mixer.music.stop()
+
+class Pyttsx3Player:
+    """Speaks directly with the offline pyttsx3 engine"""
+
+    def __init__(self, rate=150, volume=0.8):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', rate)
+        self.engine.setProperty('volume', volume)
+
+    def play(self, text):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def stop(self):
+        self.engine.stop()
+
+class PrintPlayer:
+    """Prints messages when no audio output is available"""
+
+    def play(self, text):
+        print(f"Speech: {text}")
+
+def default_player():
+    """pygame with cached audio, else pyttsx3, else console output"""
+    for player in (PygamePlayer, Pyttsx3Player):
+        try:
+            return player()
+        except Exception as e:
+            print(f"⚠️  {player.__name__} unavailable: {e}")
+    return PrintPlayer()
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_speech_queue():
+    """Process-wide speech queue shared by every module"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = SpeechQueue(default_player())
+        return _queue
+
+def say(text, priority=PRIORITY_INFO, ttl=None, key=None):
+    """Queue text on the shared speech queue"""
+    return get_speech_queue().say(text, priority, ttl, key)
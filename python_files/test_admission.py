@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Admission control tests for Blind Assistant
+Checks rejection, expiry and the 503 response of /api/detect
+"""
+
+import asyncio
+import base64
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import backend_main
+from admission import REJECTED, AdmissionController, DeadlineExceeded, Overloaded
+
+def run(coroutine):
+    # A broken controller would hang; fail instead
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+def image_body():
+    ok, png = cv2.imencode(".png", np.zeros((60, 80, 3), dtype=np.uint8))
+    return {"image_data": base64.b64encode(png.tobytes()).decode()}
+
+def test_full_queue_is_refused():
+    """With the worker busy and the queue full, the next job is Overloaded"""
+    controller = AdmissionController(workers=1, max_queue=1)
+    release = threading.Event()
+    before = REJECTED.value("queue_full")
+
+    async def scenario():
+        deadline = time.monotonic() + 5
+        running = asyncio.ensure_future(controller.submit(release.wait, deadline=deadline))
+        while controller._running == 0:
+            await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(controller.submit(lambda: "second", deadline=deadline))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as refused:
+            await controller.submit(lambda: "third", deadline=deadline)
+        release.set()
+        results = await asyncio.gather(running, queued)
+        await controller.close()
+        return refused.value, results
+
+    refused, results = run(scenario())
+    assert str(refused) == "Detection queue is full" and refused.retry_after >= 1
+    assert results == [True, "second"]
+    assert REJECTED.value("queue_full") == before + 1
+
+def test_deadline_shorter_than_service_time_is_refused():
+    """While the detector is busy, a job that cannot finish in time is refused"""
+    controller = AdmissionController(workers=1, max_queue=4)
+    controller.service_time = 0.5
+    release = threading.Event()
+    calls = []
+    before = REJECTED.value("deadline")
+
+    async def scenario():
+        try:
+            busy = asyncio.ensure_future(controller.submit(release.wait, deadline=time.monotonic() + 5))
+            while controller._running == 0:
+                await asyncio.sleep(0.01)
+            with pytest.raises(Overloaded) as refused:
+                await controller.submit(calls.append, 1, deadline=time.monotonic() + 0.1)
+            release.set()
+            await busy
+            # A generous deadline still gets through
+            await controller.submit(calls.append, 2, deadline=time.monotonic() + 2)
+            return refused.value
+        finally:
+            await controller.close()
+
+    refused = run(scenario())
+    assert "deadline" in str(refused) and refused.retry_after == 1
+    assert calls == [2]
+    assert REJECTED.value("deadline") == before + 1
+
+def test_recovers_after_a_slow_job():
+    """One slow frame does not lock out later fast ones; the estimate comes back down"""
+    controller = AdmissionController(workers=1, max_queue=4)
+
+    async def scenario():
+        try:
+            await controller.submit(time.sleep, 0.3, deadline=time.monotonic() + 5)
+            slow_estimate = controller.service_time
+            results = [await controller.submit(lambda i=i: i, deadline=time.monotonic() + 0.2)
+                       for i in range(20)]
+            return slow_estimate, results
+        finally:
+            await controller.close()
+
+    slow_estimate, results = run(scenario())
+    assert slow_estimate >= 0.3
+    assert results == list(range(20))
+    assert controller.service_time < 0.01
+
+def test_expired_job_is_dropped_by_worker():
+    """A job whose deadline passes while queued never reaches the detector"""
+    controller = AdmissionController(workers=1, max_queue=4)
+    calls = []
+    before = REJECTED.value("expired")
+
+    async def scenario():
+        try:
+            slow = asyncio.ensure_future(controller.submit(time.sleep, 0.2, deadline=time.monotonic() + 5))
+            await asyncio.sleep(0.01)
+            with pytest.raises(DeadlineExceeded):
+                await controller.submit(calls.append, "late", deadline=time.monotonic() + 0.05)
+            await slow
+        finally:
+            await controller.close()
+
+    run(scenario())
+    assert calls == []
+    assert REJECTED.value("expired") == before + 1
+    assert controller.depth() == 0
+
+def test_controller_survives_a_new_event_loop():
+    """Workers are rebuilt when the controller is used from another loop"""
+    controller = AdmissionController(workers=1)
+    for value in (1, 2):
+        assert run(controller.submit(lambda v=value: v * 10, deadline=time.monotonic() + 2)) == value * 10
+
+def test_detect_endpoint_returns_503_with_retry_after(monkeypatch):
+    """Refused jobs are 503s telling the client when to retry"""
+    controller = AdmissionController(workers=1, max_queue=4)
+    monkeypatch.setattr(backend_main, "detection_queue", controller)
+    # No ``with``: every request runs on a fresh event loop
+    client = TestClient(backend_main.app)
+    for _ in range(2):
+        assert client.post("/api/detect", json=image_body()).status_code == 200
+
+    # A cold start left a slow estimate; an idle detector still takes the job
+    controller.service_time = 2.4
+    for _ in range(3):
+        response = client.post("/api/detect", json=image_body(), headers={"X-Deadline-Ms": "500"})
+        assert response.status_code == 200
+    assert controller.service_time < 2.4 * 0.8 ** 3 + 0.1
+
+    controller.max_queue = 0
+    response = client.post("/api/detect", json=image_body())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"] == "Detection queue is full"
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Camera capture tests for Blind Assistant
+Plays a generated video file through CameraStream
+"""
+
+import cv2
+import numpy as np
+
+from camera import CameraStream
+
+def write_video(path, frames=30, size=(160, 120)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 8 % 256, np.uint8))
+    writer.release()
+
+def test_latest_frame_and_stats(tmp_path):
+    """Frames are published with increasing sequence numbers and stats"""
+    video = tmp_path / "clip.avi"
+    write_video(video)
+    stream = CameraStream(str(video)).start()
+    try:
+        first = stream.wait_for_frame()
+        assert first is not None
+        assert first.image.shape == (120, 160, 3)
+        stream._stop.wait(0.2)
+        latest = stream.latest()
+        assert latest.seq >= first.seq
+        stats = stream.stats()
+        assert stats["frames"] == latest.seq
+        assert stats["frame_age_ms"] >= 0
+    finally:
+        stream.stop()
+    assert stream._cap is None
+
+def test_missing_camera_raises():
+    """Opening a source that does not exist fails at start"""
+    stream = CameraStream("/nonexistent/camera.avi")
+    try:
+        stream.start()
+    except RuntimeError:
+        pass
+    else:
+        stream.stop()
+        raise AssertionError("expected RuntimeError")
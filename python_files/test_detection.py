@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Detection helper tests for Blind Assistant
+Checks header parsing, reduced decoding and mapping boxes back to full size
+"""
+
+import struct
+
+import cv2
+import numpy as np
+
+import detection
+from detection import decode_gray, detect, detect_in_frame, image_size, reduction_factor
+
+class StubCascade:
+    """Returns fixed boxes and remembers the image it was given"""
+
+    def __init__(self, boxes):
+        self.boxes = boxes
+        self.shape = None
+
+    def detectMultiScale(self, gray, scale_factor, min_neighbors, **kwargs):
+        self.shape = gray.shape
+        return np.array(self.boxes, dtype=np.int32).reshape(-1, 4)
+
+def encode(ext, width, height, params=()):
+    image = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    ok, data = cv2.imencode(ext, image, list(params))
+    assert ok
+    return data.tobytes()
+
+def with_segment(jpeg, marker, payload):
+    """Insert a segment right after the SOI marker"""
+    return jpeg[:2] + bytes([0xFF, marker]) + struct.pack(">H", len(payload) + 2) + payload + jpeg[2:]
+
+def test_png_and_jpeg_sizes():
+    """Dimensions come from the PNG IHDR and the JPEG start-of-frame"""
+    assert image_size(encode(".png", 300, 200)) == (300, 200)
+    jpeg = encode(".jpg", 321, 123)
+    # OpenCV writes APP0 (JFIF) and DQT segments before the SOF
+    assert jpeg.index(b"\xff\xc0") > jpeg.index(b"\xff\xdb") > jpeg.index(b"\xff\xe0")
+    assert image_size(jpeg) == (321, 123)
+    progressive = encode(".jpg", 160, 90, (cv2.IMWRITE_JPEG_PROGRESSIVE, 1))
+    assert b"\xff\xc2" in progressive
+    assert image_size(progressive) == (160, 90)
+
+def test_jpeg_size_after_app_segments():
+    """APPn payloads are skipped by length, even when they contain marker bytes"""
+    jpeg = encode(".jpg", 64, 48)
+    exif = b"Exif\x00\x00" + b"\xff\xc0\x00\x11\x08\x99\x99\x99\x99" * 8
+    tagged = with_segment(with_segment(jpeg, 0xE1, exif), 0xED, b"Photoshop 3.0\x00\xff\xff")
+    assert image_size(tagged) == (64, 48)
+    # Fill bytes before a marker are allowed
+    assert image_size(tagged[:2] + b"\xff\xff" + tagged[2:]) == (64, 48)
+    assert cv2.imdecode(np.frombuffer(tagged, np.uint8), cv2.IMREAD_GRAYSCALE).shape == (48, 64)
+
+def test_truncated_and_invalid_input():
+    """Anything without a readable header has no size and does not decode"""
+    png = encode(".png", 300, 200)
+    jpeg = encode(".jpg", 300, 200)
+    sof = jpeg.index(b"\xff\xc0")
+    for data in (b"", b"\xff", png[:20], jpeg[:sof], jpeg[:sof + 6], b"GIF89a" + bytes(30), bytes(64)):
+        assert image_size(data) is None, data[:12]
+    gray, scale = decode_gray(b"not an image at all")
+    assert gray is None and scale == 1.0
+
+def test_reduction_factor():
+    """The largest power-of-two reduction that stays at or above the target"""
+    assert reduction_factor(2560, 640) == 4
+    assert reduction_factor(1920, 640) == 2
+    assert reduction_factor(1279, 640) == 1
+    assert reduction_factor(10000, 640) == 8
+    assert reduction_factor(4000, 0) == 1
+
+def test_reduced_decode_boxes_map_to_original():
+    """Boxes found on a reduced decode come back in original pixel coordinates"""
+    cascade = StubCascade([(10, 20, 30, 40)])
+    gray, scale = decode_gray(encode(".jpg", 2560, 1440), 640)
+    assert gray.shape == (360, 640) and scale == 0.25
+    assert detect(cascade, gray, scale) == [(40, 80, 120, 160)]
+
+    # A 2000 px image decodes at half size, then is resized to the target
+    gray, scale = decode_gray(encode(".jpg", 2000, 1000), 640)
+    assert gray.shape == (320, 640)
+    assert abs(scale - 0.32) < 1e-9
+    assert detect(StubCascade([(32, 32, 64, 64)]), gray, scale) == [(100, 100, 200, 200)]
+
+    # Full-size detection leaves boxes alone
+    gray, scale = decode_gray(encode(".png", 800, 600), 0)
+    assert gray.shape == (600, 800) and scale == 1.0
+    assert detect(StubCascade([(5, 6, 7, 8)]), gray, scale) == [(5, 6, 7, 8)]
+    assert detect(StubCascade([]), gray, scale) == []
+
+def test_camera_frame_is_downscaled_once():
+    """Frames wider than the target are resized before the cascade runs"""
+    cascade = StubCascade([(64, 36, 32, 32)])
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    assert detect_in_frame(cascade, frame, 640) == [(128, 72, 64, 64)]
+    assert cascade.shape == (360, 640)
+    assert detect_in_frame(cascade, frame[:, :600], 640) == [(64, 36, 32, 32)]
+    assert detection.to_working_gray(frame, 0)[1] == 1.0
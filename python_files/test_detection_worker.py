@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Background detection tests for Blind Assistant
+Drives DetectionWorker with a stub camera and cascade
+"""
+
+import time
+
+import numpy as np
+
+from camera import Frame
+from detection_worker import DetectionWorker
+
+class StubCamera:
+    def __init__(self):
+        self.frame = None
+
+    def latest(self):
+        return self.frame
+
+class StubCascade:
+    """Finds one 40x40 box and takes a little time doing it"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def detectMultiScale(self, gray, *args, **kwargs):
+        self.calls += 1
+        time.sleep(0.01)
+        return np.array([[10, 10, 40, 40]])
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+def test_detects_each_new_frame_once():
+    """Results carry their frame; an unchanged frame is not re-detected"""
+    camera, cascade = StubCamera(), StubCascade()
+    worker = DetectionWorker(camera, cascade, target_width=0).start()
+    try:
+        worker.set_active(True)
+        camera.frame = Frame(np.zeros((120, 160, 3), np.uint8), time.perf_counter(), 1)
+        assert wait_until(lambda: worker.latest() is not None)
+        result = worker.latest()
+        assert result.frame_seq == 1
+        assert result.boxes == [(10, 10, 40, 40)]
+        time.sleep(0.05)
+        assert cascade.calls == 1
+
+        camera.frame = Frame(camera.frame.image, time.perf_counter(), 2)
+        assert wait_until(lambda: worker.latest().frame_seq == 2)
+        assert worker.stats()["runs"] == 2
+    finally:
+        worker.stop()
+
+def test_inactive_worker_is_idle():
+    """Nothing runs while paused and pausing clears the last result"""
+    camera, cascade = StubCamera(), StubCascade()
+    camera.frame = Frame(np.zeros((120, 160, 3), np.uint8), time.perf_counter(), 1)
+    worker = DetectionWorker(camera, cascade, target_width=0).start()
+    try:
+        time.sleep(0.05)
+        assert cascade.calls == 0
+        worker.set_active(True)
+        assert wait_until(lambda: worker.latest() is not None)
+        worker.set_active(False)
+        assert worker.latest() is None
+    finally:
+        worker.stop()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Direction service tests for Blind Assistant
+Endpoint geocoding with a slow stand-in geocoder and a failing route service
+"""
+
+import threading
+import time
+
+import openrouteservice
+
+import direction
+import gazetteer
+from gazetteer import Place
+
+PLACES = {
+    "Kanpur Central": Place("Kanpur Central", None, 26.4537, 80.3515, 1.0),
+    "Gopal Nagar": Place("Gopal Nagar", None, 26.4361, 80.3027, 1.0),
+}
+
+class SlowGeocoder:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, place_name, geolocator=None):
+        with self._lock:
+            self.calls.append(place_name)
+        time.sleep(self.delay)
+        return PLACES.get(place_name)
+
+def test_fallback_reuses_concurrent_geocodes(monkeypatch):
+    """Route failure falls back without geocoding again; both lookups overlap"""
+    geocoder = SlowGeocoder()
+    monkeypatch.setattr(gazetteer, "geocode", geocoder)
+    monkeypatch.setenv("OPENROUTESERVICE_API_KEY", "test-key")
+
+    def broken_client(key):
+        raise RuntimeError("route service down")
+
+    monkeypatch.setattr(openrouteservice, "Client", broken_client)
+    start = time.perf_counter()
+    result = direction.get_advanced_directions("Kanpur Central", "Gopal Nagar")
+    elapsed = time.perf_counter() - start
+    assert sorted(geocoder.calls) == ["Gopal Nagar", "Kanpur Central"]
+    assert elapsed < 0.35
+    assert result["direction"] == "West" and 4 < result["distance"] < 6
+
+def test_pre_resolved_coordinates_skip_geocoding(monkeypatch):
+    """Directions from known coordinates never touch the geocoder"""
+    geocoder = SlowGeocoder()
+    monkeypatch.setattr(gazetteer, "geocode", geocoder)
+    monkeypatch.delenv("OPENROUTESERVICE_API_KEY", raising=False)
+    endpoints = ((26.4537, 80.3515), (26.4361, 80.3027))
+    result = direction.get_advanced_directions("a", "b", endpoints)
+    assert geocoder.calls == []
+    assert result == direction.basic_directions(*endpoints)
+    assert direction.get_basic_directions("a", "b", (None, endpoints[1])) is None
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Offline gazetteer tests for Blind Assistant
+Checks fuzzy matching and loading without touching the network
+"""
+
+import os
+import tempfile
+
+from gazetteer import Gazetteer, normalize, trigrams
+
+def build_gazetteer():
+    """Small gazetteer with a few Delhi and Kanpur places"""
+    gazetteer = Gazetteer()
+    gazetteer.add("India Gate", 28.6129, 77.2295, importance=1)
+    gazetteer.add("Connaught Place", 28.6315, 77.2167, alt_names=["CP"])
+    gazetteer.add("Kanpur Central", 26.4539, 80.3513)
+    gazetteer.add("Gopal Nagar", 26.4499, 80.3319)
+    return gazetteer
+
+def test_normalize():
+    """Accents, case and punctuation are folded away"""
+    assert normalize("  Café-Coffee,  Day ") == "cafe coffee day"
+
+def test_exact_and_alternate_names():
+    """Exact and alternate names resolve with a full score"""
+    gazetteer = build_gazetteer()
+    assert gazetteer.geocode("india gate").name == "India Gate"
+    assert gazetteer.geocode("cp").name == "Connaught Place"
+
+def test_fuzzy_match_tolerates_misrecognition():
+    """Typical speech-recognition typos still find the right place"""
+    gazetteer = build_gazetteer()
+    for query in ("conaught place", "kanpoor central", "gopal nagr"):
+        place = gazetteer.geocode(query)
+        assert place is not None, query
+        assert 0.5 < place.score < 1.0
+    assert gazetteer.geocode("railway museum") is None
+
+def test_load_csv():
+    """CSV rows with missing coordinates are skipped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "places.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("name,lat,lon,alt_names\n")
+            f.write("India Gate,28.6129,77.2295,Rajpath Arch\n")
+            f.write("Nowhere,,\n")
+        gazetteer = Gazetteer.load(path)
+    assert len(gazetteer) == 1
+    assert gazetteer.geocode("rajpath arch").latitude == 28.6129
+
+def test_trigrams_pad_every_word():
+    """Inner word boundaries get edge trigrams too"""
+    grams = trigrams("india gate")
+    assert {"  i", " in", "ia ", "  g", " ga", "te "} <= grams
+    assert "a g" not in grams
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Async geocoding tests for Blind Assistant
+Runs AsyncGeocoder against the local fake Nominatim server
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import backend_main
+import gazetteer
+import geocoding
+import serialization
+from fake_services import FakeGeocoder
+from geocoding import AsyncGeocoder, RateLimiter, TTLCache
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep inside geocoding"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def offline_disabled(monkeypatch):
+    monkeypatch.setattr(gazetteer, "get_gazetteer", lambda: None)
+
+def test_ttl_cache_hit_and_expiry(monkeypatch):
+    """Entries are served until their TTL passes; the oldest is evicted first"""
+    clock = FakeClock()
+    monkeypatch.setattr(geocoding, "time", clock)
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("india gate", "here")
+    clock.now += 59
+    assert cache.get("india gate") == "here"
+    clock.now += 2
+    assert cache.get("india gate", "gone") == "gone"
+    assert len(cache) == 0
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+
+def test_geocoder_serves_repeats_from_cache(monkeypatch):
+    """A repeated name stays off the network until its entry expires"""
+    offline_disabled(monkeypatch)
+    clock = FakeClock()
+    monkeypatch.setattr(geocoding, "time", clock)
+
+    async def lookups(geocoder):
+        try:
+            first = await geocoder.geocode("Lodhi Garden")
+            again = await geocoder.geocode("  lodhi garden ")
+            clock.now += geocoder.cache.ttl + 1
+            expired = await geocoder.geocode("Lodhi Garden")
+            return first, again, expired
+        finally:
+            await geocoder.close()
+
+    with FakeGeocoder(latency=0.0) as service:
+        geocoder = AsyncGeocoder(domain=service.domain, scheme="http")
+        geocoder.rate_limiter = RateLimiter(rate=0)
+        first, again, expired = asyncio.run(lookups(geocoder))
+        assert again is first
+        assert expired.address == first.address
+        assert service.requests == 2
+
+def test_rate_limiter_spaces_public_nominatim_calls(monkeypatch):
+    """At the public server's 1 request/s, starts are one second apart"""
+    clock = FakeClock()
+    monkeypatch.setattr(geocoding, "time", clock)
+    monkeypatch.setattr(geocoding, "asyncio", SimpleNamespace(sleep=clock.sleep))
+    limiter = RateLimiter(rate=1.0)
+    starts = []
+
+    async def call():
+        await limiter.wait()
+        starts.append(clock.now)
+
+    async def burst():
+        for _ in range(4):
+            await call()
+
+    asyncio.run(burst())
+    assert starts == [1000.0, 1001.0, 1002.0, 1003.0]
+    # After an idle gap the next call goes straight through
+    clock.now += 10
+    asyncio.run(call())
+    assert starts[-1] == 1013.0
+    assert clock.sleeps == [1.0, 1.0, 1.0]
+    assert RateLimiter(rate=0).interval == 0.0
+
+def test_lifespan_closes_pooled_session(monkeypatch):
+    """The keep-alive session the API shares is closed on shutdown"""
+    offline_disabled(monkeypatch)
+    with FakeGeocoder(latency=0.0) as service:
+        geocoder = AsyncGeocoder(domain=service.domain, scheme="http")
+        geocoder.rate_limiter = RateLimiter(rate=0)
+        monkeypatch.setattr(backend_main, "geocoder", geocoder)
+        with TestClient(backend_main.app) as client:
+            for name in ("Red Fort", "Janpath"):
+                assert client.get("/api/geocode", params={"name": name}).json()["success"]
+            session = geocoder.geolocator.adapter.session
+            # Both requests shared one session with the bounded pool
+            assert session.connector.limit == geocoding.GEOCODER_POOL_SIZE
+            assert not session.closed
+        assert session.closed
+        assert geocoder._geolocator is None
+
+def batch(client, names, **headers):
+    response = client.post("/api/geocode/batch", json={"names": names}, headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return response, lines
+
+def test_batch_streams_a_line_per_distinct_name(monkeypatch):
+    """Duplicates share a line; empty names get an error line, not silence"""
+    offline_disabled(monkeypatch)
+    with FakeGeocoder(latency=0.0) as service:
+        geocoder = AsyncGeocoder(domain=service.domain, scheme="http")
+        geocoder.rate_limiter = RateLimiter(rate=0)
+        monkeypatch.setattr(backend_main, "geocoder", geocoder)
+        with TestClient(backend_main.app) as client:
+            response, lines = batch(client, ["Red Fort", "red fort ", "Nowhere Land", "", "?!"])
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    by_name = {line["place_name"]: line for line in lines}
+    assert sorted(by_name) == ["", "?!", "Nowhere Land", "Red Fort"]
+    assert by_name["Red Fort"]["success"]
+    assert by_name["Nowhere Land"]["error"] == "Location not found"
+    assert by_name[""]["error"] == by_name["?!"]["error"] == "Geocoding error: Place name is empty"
+    assert service.requests == 2
+
+def test_batch_compresses_from_threshold(monkeypatch):
+    """Batches of COMPRESS_MIN_ITEMS names or more are compressed when accepted"""
+    offline_disabled(monkeypatch)
+    monkeypatch.setattr(serialization, "COMPRESS_MIN_ITEMS", 4)
+    with FakeGeocoder(latency=0.0) as service:
+        geocoder = AsyncGeocoder(domain=service.domain, scheme="http")
+        geocoder.rate_limiter = RateLimiter(rate=0)
+        monkeypatch.setattr(backend_main, "geocoder", geocoder)
+        names = [f"Place {i}" for i in range(4)]
+        with TestClient(backend_main.app) as client:
+            response, lines = batch(client, names[:3], **{"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in response.headers
+            assert len(lines) == 3
+            response, lines = batch(client, names, **{"Accept-Encoding": "gzip"})
+            assert response.headers["content-encoding"] == "gzip"
+            assert "Accept-Encoding" in response.headers["vary"]
+            assert sorted(line["place_name"] for line in lines) == names
+            response, lines = batch(client, names, **{"Accept-Encoding": "identity"})
+            assert "content-encoding" not in response.headers
+            assert len(lines) == 4
+
+def test_geocode_many_cancels_lookups_when_closed(monkeypatch):
+    """Closing the stream early cancels lookups still in flight"""
+    offline_disabled(monkeypatch)
+    geocoder = AsyncGeocoder()
+    cancelled = []
+
+    async def slow_geocode(name, timeout=None):
+        try:
+            await asyncio.sleep(0 if name == "fast" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return None
+
+    monkeypatch.setattr(geocoder, "geocode", slow_geocode)
+
+    async def first_result():
+        stream = geocoder.geocode_many(["fast", "slow a", "slow b"], concurrency=4)
+        result = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+        # Checked before asyncio.run cancels leftovers on its own
+        return result, sorted(cancelled)
+
+    assert asyncio.run(first_result()) == (("fast", None, None), ["slow a", "slow b"])
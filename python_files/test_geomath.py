@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Geodesic math tests for Blind Assistant
+Checks geomath against geopy and the per-pair formulas it replaced
+"""
+
+import numpy as np
+from geopy.distance import geodesic
+
+import direction
+import geomath
+from bench_geomath import scalar_bearing
+
+def random_points(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(-80, 80, count), rng.uniform(-180, 180, count)])
+
+def test_distances_match_geopy():
+    """Vincenty agrees with geodesic to a millimetre, haversine to 0.6%"""
+    a, b = random_points(300, 1), random_points(300, 2)
+    reference = np.array([geodesic(tuple(p), tuple(q)).meters for p, q in zip(a, b)])
+    vincenty = geomath.vincenty_m(a[:, 0], a[:, 1], b[:, 0], b[:, 1])
+    haversine = geomath.haversine_m(a[:, 0], a[:, 1], b[:, 0], b[:, 1])
+    assert np.abs(vincenty - reference).max() < 1e-3
+    assert (np.abs(haversine - reference) / reference).max() < 0.006
+    # Scalars stay floats; coincident and nearly antipodal points are handled
+    assert geomath.vincenty_m(28.6, 77.2, 28.6, 77.2) == 0.0
+    assert abs(geomath.vincenty_m(0, 0, 0.5, 179.7) - geodesic((0, 0), (0.5, 179.7)).meters) < 1e-3 * 2e7
+
+def test_bearings_and_compass():
+    """Vector bearings equal the scalar formula; sectors round like before"""
+    a, b = random_points(200, 3), random_points(200, 4)
+    bearings = geomath.initial_bearing(a[:, 0], a[:, 1], b[:, 0], b[:, 1])
+    expected = [scalar_bearing(p[0], p[1], q[0], q[1]) for p, q in zip(a, b)]
+    assert np.allclose(bearings, expected)
+    assert geomath.initial_bearing(0, 0, 1, 0) == 0.0
+    assert round(geomath.initial_bearing(0, 0, 0, -1)) == 270
+    assert geomath.compass_direction(22.4) == "North"
+    assert geomath.compass_direction(337.6) == "North"
+    assert list(geomath.compass_direction(np.array([45.0, 180.0, 269.0]))) == ["North-East", "South", "West"]
+    assert direction.bearing_to_direction(direction.calculate_bearing((28.6, 77.2), (28.7, 77.2))) == "North"
+
+def test_matrices_and_ranking():
+    """Matrix cells equal the pairwise results; ranking sorts nearest first"""
+    origins, destinations = random_points(5, 5), random_points(7, 6)
+    matrix = geomath.distance_matrix(origins, destinations)
+    bearings = geomath.bearing_matrix(origins, destinations)
+    assert matrix.shape == bearings.shape == (5, 7)
+    assert np.isclose(matrix[2, 3], geomath.vincenty_m(*origins[2], *destinations[3]))
+    assert np.isclose(bearings[4, 6], geomath.initial_bearing(*origins[4], *destinations[6]))
+    order, distances = geomath.rank_by_distance((28.6, 77.2), [(28.7, 77.2), (28.6, 77.21), (29.0, 77.2)], limit=2)
+    assert list(order) == [1, 0] and distances[0] < distances[1]
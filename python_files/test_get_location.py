@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Navigation pipeline tests for Blind Assistant
+Parallel geocoding and speculative routing with stand-in services
+"""
+
+import time
+
+import gazetteer
+import get_location
+import route_cache
+from gazetteer import Place
+
+class SlowGeolocator:
+    """Answers after a delay; ``places`` maps query to a Place or None"""
+
+    def __init__(self, places, delay=0.2):
+        self.places = places
+        self.delay = delay
+        self.queries = []
+
+    def geocode(self, query):
+        self.queries.append(query)
+        time.sleep(self.delay)
+        return self.places.get(query)
+
+class FakeORS:
+    def __init__(self):
+        self.calls = []
+
+    def directions(self, coordinates, profile, format):
+        self.calls.append(coordinates)
+        steps = [{"instruction": f"Step {i}"} for i in range(7)]
+        return {"features": [{"geometry": {"coordinates": coordinates},
+                              "properties": {"segments": [{"steps": steps}]}}]}
+
+def test_city_and_plain_geocodes_run_in_parallel(monkeypatch):
+    """A miss with the city costs one round trip, not two"""
+    monkeypatch.setattr(gazetteer, "geocode", lambda name: None)
+    gate = Place("Gate", "Gate, Agra", 27.17, 78.04, 1.0)
+    monkeypatch.setattr(get_location, "geolocator", SlowGeolocator({"gate": gate}))
+    start = time.perf_counter()
+    assert get_location.get_coordinates("gate") == (78.04, 27.17)
+    assert time.perf_counter() - start < 0.35
+
+def test_city_qualified_result_wins(monkeypatch):
+    """Both queries hit: the one qualified with the city is used"""
+    monkeypatch.setattr(gazetteer, "geocode", lambda name: None)
+    places = {
+        "gate, Delhi": Place("Gate", "Gate, Delhi", 28.61, 77.23, 1.0),
+        "gate": Place("Gate", "Gate, Agra", 27.17, 78.04, 1.0),
+    }
+    geolocator = SlowGeolocator(places, delay=0.01)
+    monkeypatch.setattr(get_location, "geolocator", geolocator)
+    assert get_location.get_coordinates("gate") == (77.23, 28.61)
+    assert sorted(geolocator.queries) == ["gate", "gate, Delhi"]
+
+def test_confident_partial_starts_route(monkeypatch, tmp_path):
+    """A partial the gazetteer knows is routed before the transcript is final"""
+    monkeypatch.setattr(route_cache, "_cache", route_cache.RouteCache(str(tmp_path)))
+    india_gate = Place("India Gate", None, 28.6129, 77.2295, 1.0)
+    monkeypatch.setattr(gazetteer, "geocode", lambda text: india_gate if "india gate" in text else None)
+    ors = FakeORS()
+    monkeypatch.setattr(get_location, "ors_client", ors)
+    speculation = get_location.Speculation((77.0, 28.0))
+    for partial in ("take", "take me to india", "take me to india gate", "take me to india gate please"):
+        speculation.on_partial(partial)
+    route = speculation.route_for((77.2295, 28.6129))
+    assert route.result() == [f"Step {i}" for i in range(get_location.ROUTE_STEPS)]
+    assert len(ors.calls) == 1
+    assert speculation.route_for((77.3, 28.5)) is None
+
+def test_only_latest_partial_place_is_routed(monkeypatch, tmp_path):
+    """A partial that resolves to a new place replaces the earlier speculative route"""
+    monkeypatch.setattr(route_cache, "_cache", route_cache.RouteCache(str(tmp_path)))
+    places = {
+        "connaught place": Place("Connaught Place", None, 28.6315, 77.2167, 1.0),
+        "india gate": Place("India Gate", None, 28.6129, 77.2295, 1.0),
+    }
+    monkeypatch.setattr(gazetteer, "geocode",
+                        lambda text: next((place for name, place in places.items() if name in text), None))
+    ors = FakeORS()
+    monkeypatch.setattr(get_location, "ors_client", ors)
+    speculation = get_location.Speculation((77.0, 28.0))
+    speculation.on_partial("from connaught place")
+    first = speculation.route
+    speculation.on_partial("india gate")
+    assert speculation.route_for((77.2167, 28.6315)) is None
+    assert speculation.route_for((77.2295, 28.6129)).result()[0] == "Step 0"
+    assert first.cancelled() or first.result() is None
+    assert ors.calls == [[(77.0, 28.0), (77.2295, 28.6129)]]
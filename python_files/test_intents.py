@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Voice intent matcher tests for Blind Assistant
+Checks priorities, suffix matching and slot extraction
+"""
+
+import ast
+import os
+
+from intents import DEFAULT_INTENTS, Intent, IntentMatcher, match_intent
+
+def test_priority_beats_mention_order():
+    """Hazards win over chatter regardless of word order"""
+    assert match_intent("help, I hear a horn").name == "traffic"
+    assert match_intent("help me navigate").name == "navigate"
+    assert match_intent("Help me please").name == "emergency"
+
+def test_keyword_suffixes_and_case():
+    """Keywords match at word starts, in any case, with suffixes"""
+    assert match_intent("Start DETECTION now").name == "detect"
+    assert match_intent("turn on navigation").name == "navigate"
+    assert match_intent("the cost is fine") is None
+
+def test_destination_slot():
+    """The destination keeps its casing and loses trailing filler"""
+    match = match_intent("Navigate to India Gate please.")
+    assert match.slots == {"destination": "India Gate"}
+    assert match_intent("take me to Connaught Place").slots == {"destination": "Connaught Place"}
+    assert match_intent("navigation").slots == {}
+
+def test_custom_intents():
+    """Shared phrases belong to the higher priority intent"""
+    matcher = IntentMatcher([
+        Intent("low", ("stop", "pause"), 1, None),
+        Intent("high", ("stop",), 5, None),
+    ])
+    assert matcher.match("please stop").name == "high"
+    assert matcher.match("pause it").name == "low"
+
+def test_phrases_in_destination_do_not_win():
+    """A hazard word inside the destination is part of the place name"""
+    match = match_intent("navigate to the traffic light")
+    assert match.name == "navigate"
+    assert match.slots == {"destination": "the traffic light"}
+    assert match_intent("take me to the emergency exit").name == "navigate"
+    # Outside the destination the hazard still wins
+    assert match_intent("traffic ahead, take me to the market").name == "traffic"
+
+def test_every_intent_has_a_reply_in_main():
+    """main.py answers each default intent instead of the generic reply"""
+    # Read the table from source: main.py needs kivy just to import
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    table = next(node.value for node in tree.body if isinstance(node, ast.Assign)
+                 and any(getattr(t, "id", None) == "COMMAND_RESPONSES" for t in node.targets))
+    responses = ast.literal_eval(table)
+    assert {intent.name for intent in DEFAULT_INTENTS} <= set(responses)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Metrics tests for Blind Assistant
+Checks the Prometheus text output and per-route labelling of requests
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import metrics
+from metrics import Registry
+
+def test_prometheus_text_output():
+    """Counters render one line per label set; histograms are cumulative"""
+    registry = Registry()
+    errors = registry.counter("app_errors_total", "Errors", ("route",))
+    latency = registry.histogram("app_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    errors.inc("/a")
+    errors.inc("/a", amount=2)
+    errors.inc('say "hi"')
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe("/a", value=value)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP app_errors_total Errors", "# TYPE app_errors_total counter"]
+    assert 'app_errors_total{route="/a"} 3' in lines
+    assert 'app_errors_total{route="say \\"hi\\""} 1' in lines
+    assert "# TYPE app_latency_seconds histogram" in lines
+    assert lines[-5:] == [
+        'app_latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'app_latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'app_latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'app_latency_seconds_sum{route="/a"} 3.65',
+        'app_latency_seconds_count{route="/a"} 4',
+    ]
+
+def test_middleware_labels_by_route_template():
+    """Requests to a parameterised route share one series named by its template"""
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/places/{place_id}")
+    async def place(place_id: int):
+        return {"id": place_id}
+
+    @app.get("/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    template = ("GET", "/places/{place_id}")
+    before = metrics.REQUEST_LATENCY.count(*template)
+    errors_before = metrics.REQUEST_ERRORS.value("GET", "/broken", "500")
+    client = TestClient(app, raise_server_exceptions=False)
+    for place_id in (1, 2, 3):
+        assert client.get(f"/places/{place_id}").status_code == 200
+    assert client.get("/broken").status_code == 500
+    assert client.get("/nowhere/7").status_code == 404
+
+    assert metrics.REQUEST_LATENCY.count(*template) == before + 3
+    assert metrics.REQUEST_ERRORS.value("GET", "/broken", "500") == errors_before + 1
+    text = metrics.REGISTRY.render()
+    assert 'route="/places/{place_id}"' in text
+    assert 'route="unmatched"' in text
+    assert "/places/1" not in text and "/nowhere/7" not in text
+    assert metrics.REQUESTS_IN_FLIGHT.value() == 0
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Microphone session tests for Blind Assistant
+Feeds generated WAV fixtures through MicSession
+"""
+
+import speech_recognition as sr
+
+from bench_voice import write_fixture
+from mic_session import MicSession
+
+def test_endpoint_follows_end_of_speech(tmp_path):
+    """Capture covers the phrase and stops soon after it ends"""
+    path = str(tmp_path / "phrase.wav")
+    (end,) = write_fixture(path, lead=0.8, speech=1.2)
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, end_silence=0.4, calibration=0.3)
+        capture = session.capture(timeout=5)
+    assert abs(capture.speech_start - 0.8) < 0.1
+    assert abs(capture.speech_end - end) < 0.1
+    lag = capture.endpoint - end
+    assert 0.35 <= lag < 0.5
+    assert len(capture.audio.frame_data) / 2 / 16000 >= 1.2
+
+def test_session_stays_open_between_phrases(tmp_path):
+    """Consecutive captures reuse the stream and the noise estimate"""
+    path = str(tmp_path / "two.wav")
+    ends = write_fixture(path, phrases=2, gap=1.5, seed=3)
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, calibration=0.3)
+        first = session.capture(timeout=5)
+        noise = session.noise_energy
+        second = session.capture(timeout=5)
+    assert abs(first.speech_end - ends[0]) < 0.1
+    assert abs(second.speech_end - ends[1]) < 0.1
+    assert noise is not None and session.noise_energy is not None
+
+def test_threshold_tracks_background_noise(tmp_path):
+    """A noisier room raises the speech threshold"""
+    thresholds = []
+    for noise in (60, 600):
+        path = str(tmp_path / f"noise_{noise}.wav")
+        write_fixture(path, noise=noise)
+        with sr.AudioFile(path) as source:
+            session = MicSession(source, calibration=0.3)
+            session.capture(timeout=5)
+            thresholds.append(session.threshold)
+    assert thresholds[1] > 2 * thresholds[0]
+
+def test_timeout_without_speech(tmp_path):
+    """Silence ends in WaitTimeoutError like Recognizer.listen"""
+    path = str(tmp_path / "silence.wav")
+    write_fixture(path, lead=0.5, speech=0.0, tail=2.0)
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, calibration=0.3)
+        try:
+            session.capture(timeout=1.0)
+        except sr.WaitTimeoutError:
+            pass
+        else:
+            raise AssertionError("expected WaitTimeoutError")
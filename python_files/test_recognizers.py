@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Speech recognizer tests for Blind Assistant
+Backend fallback and streaming with stand-in recognizers
+"""
+
+import speech_recognition as sr
+
+import recognizers
+from bench_recognizers import word_error_rate
+from bench_voice import write_fixture
+from mic_session import MicSession
+
+class FakeBackend(recognizers.RecognizerBackend):
+    def __init__(self, name, text=None, error=sr.UnknownValueError):
+        self.name = name
+        self.text = text
+        self.error = error
+        self.calls = []
+
+    def recognize(self, audio, grammar=None):
+        self.calls.append((len(audio.frame_data), grammar))
+        if self.text is None:
+            raise self.error()
+        return recognizers.Transcript(self.text, 1.0, self.name, 0.0)
+
+class StreamingBackend(FakeBackend):
+    streaming = True
+
+    def stream(self, rate, width, grammar=None):
+        backend = self
+
+        class Stream:
+            frames = 0
+
+            def accept(self, data):
+                self.frames += 1
+                return f"partial {self.frames // 10}"
+
+            def finish(self):
+                backend.streamed = self.frames
+                return recognizers.Transcript(backend.text, 1.0, backend.name, 0.0)
+
+        return Stream()
+
+def test_chain_falls_through_failing_backends():
+    """Offline failure and network errors move on to the next backend"""
+    audio = sr.AudioData(b"\0\0" * 1600, 16000, 2)
+    offline = FakeBackend("offline")
+    down = FakeBackend("down", error=sr.RequestError)
+    online = FakeBackend("online", "take me home")
+    result = recognizers.RecognizerChain([offline, down, online]).recognize(audio, grammar=["help"])
+    assert result.text == "take me home" and result.backend == "online"
+    assert offline.calls == [(3200, ["help"])] and len(down.calls) == 1
+
+def test_listen_falls_back_with_captured_audio(tmp_path):
+    """When the first backend fails, the next one gets the whole phrase"""
+    path = str(tmp_path / "phrase.wav")
+    write_fixture(path, lead=0.8, speech=1.0)
+    offline = FakeBackend("offline")
+    online = FakeBackend("online", "help")
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, calibration=0.3)
+        result = recognizers.RecognizerChain([offline, online]).listen(session, timeout=5)
+    assert result.backend == "online"
+    assert offline.calls[0][0] == online.calls[0][0] == len(session.last_capture.audio.frame_data)
+
+def test_streaming_backend_sees_frames_during_capture(tmp_path):
+    """Partials arrive while capturing and every captured frame is streamed"""
+    path = str(tmp_path / "phrase.wav")
+    write_fixture(path, lead=0.8, speech=1.0)
+    backend = StreamingBackend("stream", "where am i")
+    partials = []
+    with sr.AudioFile(path) as source:
+        session = MicSession(source, calibration=0.3)
+        result = recognizers.RecognizerChain([backend]).listen(session, timeout=5, on_partial=partials.append)
+    assert result.text == "where am i"
+    frames = len(session.last_capture.audio.frame_data) // (2 * session.frame_samples)
+    assert backend.streamed == frames
+    assert partials[0] == "partial 0" and len(partials) == len(set(partials)) > 1
+
+def test_command_grammar_and_word_error_rate():
+    """The grammar covers each intent phrase once; WER counts word edits"""
+    grammar = recognizers.command_grammar()
+    assert "take me to" in grammar and "where am i" in grammar
+    assert len(grammar) == len(set(grammar))
+    assert word_error_rate("take me to india gate", "take me to india gate") == 0
+    assert word_error_rate("take me to india gate", "take me india gates") == 0.4
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Route cache tests for Blind Assistant
+Runs RouteCache against the local fake OpenRouteService server
+"""
+
+import os
+
+import openrouteservice
+
+from fake_services import FakeORS
+from route_cache import RouteCache, decode_polyline, encode_polyline
+
+HOME = [77.2295, 28.6129]
+MARKET = [77.2190, 28.6315]
+
+def test_polyline_round_trip():
+    """Encoding keeps coordinates to 1e-5 degrees"""
+    points = [[77.2295, 28.6129], [77.22841, 28.61477], [-122.41942, 37.77493]]
+    assert encode_polyline([[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    decoded = decode_polyline(encode_polyline(points))
+    assert all(abs(a - b) <= 5e-6 for p, q in zip(points, decoded) for a, b in zip(p, q))
+
+def test_repeat_walks_hit_cache_across_restarts(tmp_path):
+    """Nearby start points reuse the route, also from a fresh process"""
+    with FakeORS(latency=0.0) as service:
+        client = openrouteservice.Client(base_url=service.url)
+        cache = RouteCache(str(tmp_path))
+        first = cache.directions(client, [HOME, MARKET])
+        # A few metres of GPS jitter snaps to the same key
+        again = cache.directions(client, [[HOME[0] + 0.00002, HOME[1] - 0.00001], MARKET])
+        assert service.requests == 1
+        assert again["features"][0]["properties"]["segments"] == first["features"][0]["properties"]["segments"]
+        assert len(again["features"][0]["geometry"]["coordinates"]) == len(first["features"][0]["geometry"]["coordinates"])
+
+        restarted = RouteCache(str(tmp_path))
+        restarted.directions(client, [HOME, MARKET])
+        restarted.directions(client, [HOME, MARKET], profile="driving-car")
+        assert service.requests == 2
+        assert cache.stats()["hit_rate"] == 0.5 and restarted.stats()["hit_rate"] == 0.5
+
+def test_ttl_and_size_bound(tmp_path):
+    """Old routes are refetched and the disk store keeps the newest routes"""
+    with FakeORS(latency=0.0) as service:
+        client = openrouteservice.Client(base_url=service.url)
+        stale = RouteCache(str(tmp_path / "stale"), ttl=0)
+        stale.directions(client, [HOME, MARKET])
+        stale.directions(client, [HOME, MARKET])
+        assert service.requests == 2 and stale.stats()["expired"] == 1
+
+        bounded = RouteCache(str(tmp_path / "bounded"), max_items=2)
+        for i in range(4):
+            bounded.directions(client, [HOME, [MARKET[0] + i * 0.01, MARKET[1]]])
+        assert len(os.listdir(tmp_path / "bounded")) == 2
+        assert bounded.stats()["evictions"] == 2
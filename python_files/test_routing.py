@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Offline routing tests for Blind Assistant
+Builds walking graphs from generated OSM grids and checks every search method
+"""
+
+import numpy as np
+
+import direction
+import routing
+from bench_routing import write_grid_osm
+from routing import RoadGraph, Router, RoutingError
+
+def build(tmp_path, rows=8, cols=8, missing=0.15, seed=0):
+    path = str(tmp_path / "grid.osm")
+    coords = write_grid_osm(path, rows, cols, missing=missing, seed=seed)
+    return RoadGraph.from_osm(path), coords
+
+def test_graph_keeps_walkable_connected_ways(tmp_path):
+    """Motorways, private roads and unreachable islands are left out"""
+    graph, _ = build(tmp_path, missing=0.0)
+    assert len(graph) == 64
+    used = {graph.names[i] for i in graph.edge_names.tolist()}
+    assert "Ring Road" not in used and "Island Path" not in used
+    assert np.all(np.diff(graph.indptr) > 0)
+    # Every edge is stored in both directions
+    assert graph.edge_count * 2 == len(graph.indices)
+
+def test_search_methods_agree(tmp_path):
+    """A*, bidirectional Dijkstra and the contraction hierarchy find equal shortest paths"""
+    graph, _ = build(tmp_path, 12, 12, seed=3)
+    graph.contract()
+    saved = str(tmp_path / "graph.npz")
+    graph.save(saved)
+    graph = RoadGraph.load(saved)
+    rng = np.random.default_rng(0)
+    for source, target in rng.integers(0, len(graph), size=(60, 2)).tolist():
+        results = [graph.astar(source, target), graph.bidirectional_dijkstra(source, target),
+                   graph.ch_query(source, target)]
+        distances = [distance for distance, _ in results]
+        assert max(distances) - min(distances) < 1e-6
+        for distance, path in results:
+            assert path[0] == source and path[-1] == target
+            assert abs(graph.path_length(path) - distance) < 1e-6
+
+def test_route_matches_ors_shape(tmp_path):
+    """Steps name the streets, cover the geometry and add up to the segment"""
+    graph, coords = build(tmp_path, missing=0.0)
+    router = Router(graph)
+    start, corner, end = coords[1], coords[6], coords[5 * 8 + 6]  # (0,0), (0,5), (5,5)
+    route = router.directions([(start[1], start[0]), (corner[1], corner[0]), (end[1], end[0])])
+    feature = route["features"][0]
+    first, second = feature["properties"]["segments"]
+    assert [step["instruction"] for step in first["steps"]] == ["Head east on Street 1", "Arrive at your destination"]
+    assert second["steps"][0]["instruction"] == "Head north on Avenue 6"
+    assert second["steps"][-1]["type"] == routing.TYPE_GOAL
+    assert feature["properties"]["way_points"] == [0, 5, 10]
+    assert len(feature["geometry"]["coordinates"]) == 11
+    for segment in (first, second):
+        assert abs(sum(step["distance"] for step in segment["steps"]) - segment["distance"]) < 1.0
+        assert 60 * 5 < segment["duration"] < 60 * 8  # ~500 m at walking pace
+    try:
+        router.directions([(start[1], start[0]), (start[1] + 1.0, start[0])])
+    except RoutingError:
+        pass
+    else:
+        raise AssertionError("expected RoutingError for a point far from the graph")
+
+def test_directions_use_offline_router_without_key(tmp_path, monkeypatch):
+    """direction.py routes offline when no OpenRouteService key is set"""
+    graph, coords = build(tmp_path, missing=0.0)
+    monkeypatch.delenv("OPENROUTESERVICE_API_KEY", raising=False)
+    monkeypatch.setattr(routing, "_default_router", Router(graph))
+    monkeypatch.setattr(routing, "_default_loaded", True)
+    result = direction.get_advanced_directions("a", "b", (coords[1], coords[5 * 8 + 1]))
+    assert result["steps"][0]["instruction"] == "Head north on Avenue 1"
+    assert 0.45 < result["total_distance"] < 0.55
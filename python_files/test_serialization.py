@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Response serialization tests for Blind Assistant
+Checks serializer parity, the columnar layout and compression negotiation
+"""
+
+import asyncio
+import gzip
+import json
+
+import serialization
+
+DETECTIONS = [
+    {"type": "face", "confidence": 0.85, "bbox": [10, 20, 30, 40], "description": "Human face detected"},
+    {"type": "face", "confidence": 0.85, "bbox": [50, 60, 70, 80], "description": "Human face detected"},
+]
+
+def test_backends_agree():
+    """Every available backend produces the same JSON"""
+    payload = {"objects": DETECTIONS, "count": 2, "place": "Chandni Chowk, दिल्ली"}
+    backends = ["stdlib"] + (["orjson"] if serialization.orjson else [])
+    for backend in backends:
+        assert json.loads(serialization.get_dumps(backend)(payload)) == payload
+
+def test_columnar_layout():
+    """Parallel arrays line up and descriptions are sent once per label"""
+    result = serialization.columnar(DETECTIONS)
+    assert result["labels"] == ["face", "face"]
+    assert result["confidences"] == [0.85, 0.85]
+    assert result["bboxes"] == [[10, 20, 30, 40], [50, 60, 70, 80]]
+    assert result["descriptions"] == {"face": "Human face detected"}
+    assert serialization.columnar([])["labels"] == []
+
+def test_negotiate_encoding():
+    """Quality values are honoured and unsupported codings ignored"""
+    assert serialization.negotiate_encoding(None) is None
+    assert serialization.negotiate_encoding("identity") is None
+    assert serialization.negotiate_encoding("gzip;q=0, deflate") is None
+    assert serialization.negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+    expected = "br" if serialization.brotli else "gzip"
+    assert serialization.negotiate_encoding("gzip;q=0.8, br") == expected
+    assert serialization.negotiate_encoding("*") == expected
+
+def test_compress_stream_round_trip():
+    """Each streamed chunk is flushed and the whole stream decompresses"""
+    lines = [serialization.dumps({"n": i}) + b"\n" for i in range(20)]
+
+    async def chunks():
+        for line in lines:
+            yield line
+
+    async def collect():
+        return [part async for part in serialization.compress_stream(chunks(), "gzip")]
+
+    parts = asyncio.run(collect())
+    assert all(parts)
+    assert gzip.decompress(b"".join(parts)) == b"".join(lines)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Production server tests for Blind Assistant
+Runs the pre-fork master with stand-in workers instead of uvicorn
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+import serve
+import tracing
+from serve import Master
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+
+@pytest.fixture(autouse=True)
+def restore_signals():
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)}
+    yield
+    for sig, handler in handlers.items():
+        signal.signal(sig, handler)
+
+def stand_in_worker(lifetime, crash=False):
+    def run_worker(app, sock, max_requests, log_level):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        time.sleep(lifetime)
+        if crash:
+            raise RuntimeError("model failed to load")
+    return run_worker
+
+class RecordingMaster(Master):
+    """Master that remembers each spawned pid and the backoff it waited out"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spawned = []
+        self.delays = []
+
+    def spawn(self):
+        self.delays.append(self.backoff())
+        pid = super().spawn()
+        self.spawned.append(pid)
+        return pid
+
+def test_crashing_workers_back_off_then_give_up(monkeypatch):
+    """Workers that die on start are respawned ever more slowly, then abandoned"""
+    monkeypatch.setattr(serve, "run_worker", stand_in_worker(0.0, crash=True))
+    monkeypatch.setattr(serve, "RESPAWN_BACKOFF", 0.1)
+    master = RecordingMaster(None, None, workers=1, graceful_timeout=1, max_fast_failures=4)
+    start = time.monotonic()
+    assert master.run() == 1
+    assert master.gave_up and master.fast_failures == 4
+    # The first start plus three respawns, each waiting twice as long
+    assert master.delays == [0.0, 0.1, 0.2, 0.4]
+    assert time.monotonic() - start >= 0.7
+    assert master.children == {}
+
+def test_recycled_workers_are_replaced(monkeypatch):
+    """Workers that exit after running a while are reaped and replaced at once"""
+    monkeypatch.setattr(serve, "run_worker", stand_in_worker(0.3))
+    monkeypatch.setattr(serve, "FAST_EXIT_SECONDS", 0.1)
+    master = RecordingMaster(None, None, workers=2, graceful_timeout=1)
+    stopper = threading.Timer(1.5, lambda: setattr(master, "_stopping", True))
+    stopper.start()
+    assert master.run() == 0
+    assert len(master.spawned) >= 6 and len(set(master.spawned)) == len(master.spawned)
+    assert set(master.delays) == {0.0}
+    assert master.fast_failures == 0 and not master.gave_up
+    assert master.children == {}
+
+def test_forked_worker_traces_to_its_own_descriptor(tmp_path):
+    """A child writes its own events once and never the parent's buffer"""
+    path = str(tmp_path / "trace.json")
+    tracing.enable(path)
+    try:
+        tracing.record("parent", 0, 1000)
+        pid = os.fork()
+        if pid == 0:
+            tracing.record("child", 0, 1000)
+            tracing.flush()
+            os._exit(0)
+        os.waitpid(pid, 0)
+    finally:
+        tracing.disable()
+    with open(path, encoding="utf-8") as f:
+        events = json.loads(f.read().rstrip().rstrip(",") + "]")
+    assert sorted((e["name"], e["pid"] == os.getpid()) for e in events) == [("child", False), ("parent", True)]
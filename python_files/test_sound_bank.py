@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Alert sound tests for Blind Assistant
+Runs the sound bank on SDL's dummy audio driver
+"""
+
+import os
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+import sound_bank
+from sound_bank import SoundBank, tone_samples
+
+def test_tone_samples_shape():
+    """Tones are interleaved int16 frames for every mixer channel"""
+    samples = tone_samples([(440, 0.1), (0, 0.05)], 8000, 2)
+    assert samples.shape == (1200, 2)
+    assert samples.dtype == np.int16
+    assert np.all(samples[800:] == 0)
+
+def test_overlapping_alerts_on_reserved_channels():
+    """Simultaneous alerts each get their own reserved channel"""
+    bank = SoundBank(reserved_channels=3).load_defaults()
+    assert {"alert", "vehicle", "obstacle"} <= set(bank.sounds)
+    channels = [bank.play(name) for name in ("alert", "vehicle", "obstacle")]
+    assert len({id(channel) for channel in channels}) == 3
+    assert bank.play("confirm") in bank.channels
+
+def test_earcons_per_class_with_cooldown():
+    """Each class maps to its earcon, repeated at most once per cooldown"""
+    bank = SoundBank(reserved_channels=4, cooldown=1.0).load_defaults()
+    assert bank.play_for_detections(["face", "car", "face", "bench"], now=10.0) == ["face", "car", "bench"]
+    assert bank.play_for_detections(["person", "bus"], now=10.5) == []
+    assert bank.play_for_detections(["person"], now=11.1) == ["person"]
+    assert sound_bank.EARCONS.get("bench", "obstacle") == "obstacle"
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Spatial index tests for Blind Assistant
+Builds small POI files and checks nearby, nearest and reverse queries
+"""
+
+from spatial_index import SpatialIndex, build_index
+
+PLACES = [
+    {"name": "India Gate", "address": "Rajpath, New Delhi", "latitude": 28.6129, "longitude": 77.2295},
+    {"name": "National Stadium", "latitude": 28.6110, "longitude": 77.2370},
+    {"name": "Connaught Place", "latitude": 28.6315, "longitude": 77.2167},
+    {"name": "Red Fort", "latitude": 28.6562, "longitude": 77.2410},
+]
+
+def build(tmp_path, records=PLACES):
+    path = str(tmp_path / "pois.bin")
+    assert build_index(records, path) == len(records)
+    return SpatialIndex(path)
+
+def test_build_and_load_round_trip(tmp_path):
+    """Names, addresses and coordinates survive the binary file"""
+    index = build(tmp_path)
+    assert len(index) == len(PLACES)
+    place = index.reverse(28.6129, 77.2295)
+    assert place.name == "India Gate"
+    assert place.address == "Rajpath, New Delhi"
+    assert (place.latitude, place.longitude) == (28.6129, 77.2295)
+    assert place.distance < 1.0
+    # A place without an address reads back its name
+    assert index.reverse(28.6110, 77.2370).address == "National Stadium"
+
+def test_within_sorts_by_distance(tmp_path):
+    """Only places inside the radius come back, nearest first"""
+    index = build(tmp_path)
+    places = index.within(28.6129, 77.2295, 1000)
+    assert [p.name for p in places] == ["India Gate", "National Stadium"]
+    assert places[0].distance < places[1].distance <= 1000
+    assert [p.name for p in index.within(28.6129, 77.2295, 5000, limit=3)] == \
+        ["India Gate", "National Stadium", "Connaught Place"]
+
+def test_nearest_and_reverse(tmp_path):
+    """Nearest widens its search; reverse gives up beyond its distance"""
+    index = build(tmp_path)
+    assert [p.name for p in index.nearest(28.66, 77.25, k=2)] == ["Red Fort", "Connaught Place"]
+    assert index.reverse(28.70, 77.30) is None
+    assert index.reverse(28.70, 77.30, max_distance_m=20000).name == "Red Fort"
+
+def test_empty_index(tmp_path):
+    """An index with no places answers every query with nothing"""
+    index = build(tmp_path, [])
+    assert len(index) == 0
+    assert index.within(28.6, 77.2, 1000) == []
+    assert index.nearest(28.6, 77.2, k=3) == []
+    assert index.reverse(28.6, 77.2) is None
+
+def test_antimeridian(tmp_path):
+    """Searches near ±180° find places on the other side"""
+    index = build(tmp_path, [
+        {"name": "East", "latitude": -10.0, "longitude": 179.999},
+        {"name": "Dateline", "latitude": -10.0, "longitude": 180.0},
+        {"name": "West", "latitude": -10.0, "longitude": -179.998},
+    ])
+    places = index.within(-10.0, -179.9999, 500)
+    assert [p.name for p in places] == ["Dateline", "East", "West"]
+    assert places[1].distance < 150
+    assert index.reverse(-10.0, 179.9991).name == "East"
+    assert index.nearest(-10.0, 179.99, k=3)[-1].name == "West"
+
+def test_nearby_endpoint_validates_radius_and_limit(tmp_path, monkeypatch):
+    """Out-of-range radius or limit is a 422, not a strange slice or a full scan"""
+    from fastapi.testclient import TestClient
+
+    import backend_main
+    monkeypatch.setattr(backend_main, "get_spatial_index", lambda: build(tmp_path))
+    client = TestClient(backend_main.app)
+    params = {"lat": 28.6129, "lon": 77.2295}
+    response = client.get("/api/nearby", params={**params, "radius": 1000, "limit": 1})
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()["places"]] == ["India Gate"]
+    for bad in ({"limit": -1}, {"limit": 0}, {"limit": 101}, {"radius": 0}, {"radius": -5}, {"radius": 1e9}):
+        assert client.get("/api/nearby", params={**params, **bad}).status_code == 422, bad
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Speech queue tests for Blind Assistant
+Drives SpeechQueue with a recording player and a synthetic alert storm
+"""
+
+import threading
+import time
+
+import speech
+from speech import PRIORITY_HAZARD, PRIORITY_INFO, PRIORITY_NAVIGATION, SpeechQueue
+
+class RecordingPlayer:
+    """Takes a fixed time per message and records overlap"""
+
+    def __init__(self, duration=0.005):
+        self.duration = duration
+        self.played = []
+        self.playing = 0
+        self.max_playing = 0
+        self.stops = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def play(self, text):
+        with self._lock:
+            self.playing += 1
+            self.max_playing = max(self.max_playing, self.playing)
+        self._stopped.clear()
+        self.gate.wait()
+        self._stopped.wait(self.duration)
+        with self._lock:
+            self.playing -= 1
+            self.played.append(text)
+
+    def stop(self):
+        self.stops += 1
+        self._stopped.set()
+
+def test_alert_storm():
+    """Hazards jump the queue, duplicates collapse, playback never overlaps"""
+    player = RecordingPlayer()
+    queue = SpeechQueue(player, max_pending=16)
+    player.gate.clear()  # hold the first message while the storm arrives
+    queue.say("warming up")
+    time.sleep(0.02)
+
+    for i in range(200):
+        queue.say(f"chatter {i % 10}", PRIORITY_INFO)
+        if i % 50 == 0:
+            queue.say("Obstacle ahead", PRIORITY_HAZARD)
+        if i % 40 == 0:
+            queue.say(f"Turn {i // 40}", PRIORITY_NAVIGATION)
+    player.gate.set()
+    assert queue.wait_idle(timeout=5)
+
+    played = player.played
+    assert played[0] == "warming up"
+    assert played[1] == "Obstacle ahead"
+    assert played[2:7] == [f"Turn {i}" for i in range(5)]
+    assert sorted(played[7:]) == sorted(f"chatter {i}" for i in range(10))
+    assert player.max_playing == 1
+    assert player.stops == 1  # the hazard interrupted the info message
+    assert speech.QUEUE_LATENCY.count("hazard") >= 1
+    queue.close()
+
+def test_expired_messages_are_dropped():
+    """Messages older than their time-to-live are never played"""
+    player = RecordingPlayer()
+    queue = SpeechQueue(player)
+    player.gate.clear()
+    queue.say("first")
+    time.sleep(0.02)
+    queue.say("stale", PRIORITY_INFO, ttl=0.01)
+    queue.say("fresh", PRIORITY_INFO, ttl=5)
+    time.sleep(0.05)
+    expired = speech.DROPPED.value("expired")
+    player.gate.set()
+    assert queue.wait_idle(timeout=5)
+    assert player.played == ["first", "fresh"]
+    assert speech.DROPPED.value("expired") == expired + 1
+    queue.close()
+
+def test_duplicate_promoted_to_higher_priority():
+    """A repeat at higher priority moves the pending message forward"""
+    player = RecordingPlayer()
+    queue = SpeechQueue(player)
+    player.gate.clear()
+    queue.say("first", PRIORITY_HAZARD)
+    time.sleep(0.02)
+    queue.say("a", PRIORITY_INFO)
+    queue.say("b", PRIORITY_INFO)
+    assert queue.say("b", PRIORITY_NAVIGATION)
+    assert not queue.say("a", PRIORITY_INFO)
+    assert queue.pending() == 2
+    player.gate.set()
+    assert queue.wait_idle(timeout=5)
+    assert player.played == ["first", "b", "a"]
+    queue.close()
+
+class FakeMusic:
+    """pygame.mixer.music stand-in: a clip plays until its duration or stop()"""
+
+    def __init__(self, durations):
+        self.durations = durations
+        self.started = []
+        self._clip = None
+        self._until = 0.0
+
+    def load(self, data, fmt):
+        self._clip = data.getvalue().decode()
+
+    def play(self):
+        self.started.append(self._clip)
+        self._until = time.monotonic() + self.durations.get(self._clip, 0.01)
+
+    def get_busy(self):
+        return time.monotonic() < self._until
+
+    def stop(self):
+        self._until = 0.0
+
+class FakeCache:
+    """tts_cache stand-in; synthesizing a miss takes ``synth_time`` seconds"""
+
+    def __init__(self, cached=(), synth_time=0.3):
+        self.clips = {text: self.clip(text) for text in cached}
+        self.synth_time = synth_time
+        self.synth_threads = []
+
+    @staticmethod
+    def clip(text):
+        return type("Clip", (), {"data": text.encode(), "fmt": "mp3"})()
+
+    def lookup(self, text, lang="en"):
+        return self.clips.get(text)
+
+    def get(self, text, lang="en"):
+        if text not in self.clips:
+            self.synth_threads.append(threading.current_thread().name)
+            time.sleep(self.synth_time)
+            self.clips[text] = self.clip(text)
+        return self.clips[text]
+
+def pygame_player(cache, durations):
+    player = speech.PygamePlayer.__new__(speech.PygamePlayer)
+    music = FakeMusic(durations)
+    player.pygame = type("pygame", (), {})()
+    player.pygame.mixer = type("mixer", (), {"music": music})()
+    player.pygame.time = type("time", (), {"wait": staticmethod(lambda ms: time.sleep(ms / 1000))})()
+    player.cache = cache
+    player._stopped = threading.Event()
+    return player, music
+
+def test_stop_before_playback_starts_is_kept():
+    """A hazard between dequeue and playback still cuts the message off"""
+    player, music = pygame_player(FakeCache(["info", "Obstacle ahead"]), {"info": 5.0})
+    queue = SpeechQueue(player)
+    entered = threading.Event()
+    release = threading.Event()
+    play = player.play
+
+    def delayed_play(clip):
+        # Hold the worker after it took "info" but before playback begins
+        entered.set()
+        release.wait()
+        play(clip)
+
+    player.play = delayed_play
+    queue.say("info")
+    assert entered.wait(2)
+    queue.say("Obstacle ahead", PRIORITY_HAZARD)
+    release.set()
+    start = time.monotonic()
+    assert queue.wait_idle(timeout=5)
+    assert time.monotonic() - start < 1.0
+    # "info" never started; the hazard played normally
+    assert music.started == ["Obstacle ahead"]
+    queue.close()
+
+def test_synthesis_happens_before_the_playback_queue():
+    """Cache misses are synthesized off the playback thread, which stays interruptible"""
+    cache = FakeCache(["Obstacle ahead", "long info"])
+    player, music = pygame_player(cache, {"long info": 5.0})
+    queue = SpeechQueue(player)
+    queue.say("long info")
+    time.sleep(0.05)
+    queue.say("new street name")  # a cache miss, synthesized while "long info" plays
+    time.sleep(0.05)
+    start = time.monotonic()
+    queue.say("Obstacle ahead", PRIORITY_HAZARD)
+    assert queue.wait_idle(timeout=5)
+    assert time.monotonic() - start < 1.0
+    assert music.started == ["long info", "Obstacle ahead", "new street name"]
+    assert cache.synth_threads == ["speech-prepare"]
+    queue.close()
+
+def test_failed_synthesis_is_dropped():
+    """A message that cannot be synthesized is dropped, not retried on playback"""
+    cache = FakeCache()
+
+    def broken(text, lang="en"):
+        raise RuntimeError("no engine")
+
+    cache.get = broken
+    player, music = pygame_player(cache, {})
+    queue = SpeechQueue(player)
+    errors = speech.DROPPED.value("error")
+    queue.say("unsayable")
+    assert queue.wait_idle(timeout=2)
+    assert music.started == []
+    assert speech.DROPPED.value("error") == errors + 1
+    queue.close()
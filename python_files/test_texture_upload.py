@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Frame display tests for Blind Assistant
+Checks zero-copy buffers and texture reuse with a stub Texture
+"""
+
+import numpy as np
+
+import texture_upload
+from texture_upload import FrameTexture, frame_buffer
+
+class StubTexture:
+    def __init__(self, size):
+        self.size = size
+        self.flipped = False
+        self.blits = []
+
+    @classmethod
+    def create(cls, size, colorfmt):
+        return cls(size)
+
+    def flip_vertical(self):
+        self.flipped = not self.flipped
+
+    def blit_buffer(self, buf, colorfmt, bufferfmt):
+        self.blits.append(buf)
+
+class StubWidget:
+    class canvas:
+        @staticmethod
+        def ask_update():
+            pass
+
+    texture = None
+
+def test_frame_buffer_shares_memory():
+    """Contiguous frames are viewed, slices are copied once"""
+    frame = np.zeros((72, 128, 3), np.uint8)
+    assert np.shares_memory(frame_buffer(frame), frame)
+    assert frame_buffer(frame).shape == (72 * 128 * 3,)
+    cropped = frame[:, 10:50]
+    assert not np.shares_memory(frame_buffer(cropped), frame)
+
+def test_texture_created_once_per_resolution(monkeypatch):
+    """Same-size frames reuse one flipped texture"""
+    monkeypatch.setattr(texture_upload, "Texture", StubTexture)
+    widget = StubWidget()
+    display = FrameTexture(widget)
+    for _ in range(3):
+        display.show(np.zeros((72, 128, 3), np.uint8))
+    assert display.created == 1
+    assert widget.texture.flipped
+    assert len(widget.texture.blits) == 3
+    display.show(np.zeros((36, 64, 3), np.uint8))
+    assert display.created == 2
+    assert widget.texture.size == (64, 36)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tracing tests for Blind Assistant
+Checks the disabled no-op path and the Chrome trace-event file
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+import tracing
+
+@pytest.fixture(autouse=True)
+def tracing_off():
+    tracing.disable()
+    yield
+    tracing.disable()
+
+def read_events(path):
+    # The closing bracket is optional in the trace-event format; add it to parse
+    with open(path, encoding="utf-8") as f:
+        return json.loads(f.read().rstrip().rstrip(",") + "]")
+
+def test_disabled_tracing_records_nothing():
+    """Spans are a shared no-op and nothing is buffered"""
+    assert not tracing.enabled()
+    first, second = tracing.span("a"), tracing.span("b", x=1)
+    assert first is second
+    with first as span:
+        span.set(y=2)
+
+    @tracing.traced()
+    def double(x):
+        return 2 * x
+
+    assert double(4) == 8
+    tracing.record("manual", 0, 1000)
+    assert tracing._pending == []
+
+def test_enabled_tracing_writes_chrome_events(tmp_path):
+    """Finished spans become complete ("X") events with microsecond times"""
+    path = str(tmp_path / "trace.json")
+    tracing.enable(path)
+    assert tracing.enabled()
+    with tracing.span("detect.decode", width=640) as span:
+        span.set(height=480)
+    with pytest.raises(ValueError):
+        with tracing.span("detect.cascade"):
+            raise ValueError("bad frame")
+
+    @tracing.traced("geocode")
+    def lookup(name):
+        time.sleep(0.001)
+        return name
+
+    assert lookup("India Gate") == "India Gate"
+    tracing.record("manual", 2_000_000, 5_000_000, {"status": 200})
+    tracing.disable()
+
+    events = read_events(path)
+    assert [e["name"] for e in events] == ["detect.decode", "detect.cascade", "geocode", "manual"]
+    assert all(e["ph"] == "X" and e["pid"] == os.getpid() for e in events)
+    assert events[0]["args"] == {"width": 640, "height": 480}
+    assert events[1]["args"] == {"error": "ValueError"}
+    assert events[2]["dur"] >= 1000
+    assert (events[3]["ts"], events[3]["dur"], events[3]["args"]) == (2000.0, 3000.0, {"status": 200})
+
+    # Enabling again appends without a second opening bracket
+    tracing.enable(path)
+    tracing.record("again", 0, 1000)
+    tracing.disable()
+    assert [e["name"] for e in read_events(path)][-1] == "again"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Speech cache tests for Blind Assistant
+Uses stub engines so nothing is synthesized or fetched
+"""
+
+from tts_cache import PhraseCache
+
+class StubEngine:
+    def __init__(self, fmt="mp3", fail=False):
+        self.fmt = fmt
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, text, lang):
+        self.calls.append((text, lang))
+        if self.fail:
+            raise ConnectionError("offline")
+        return f"{lang}:{text}".encode("utf-8"), self.fmt
+
+def test_synthesizes_each_phrase_once(tmp_path):
+    """Repeats come from memory, other languages are separate entries"""
+    engine = StubEngine()
+    cache = PhraseCache(str(tmp_path), engines=[("stub", engine)])
+    assert cache.get("Person detected").data == b"en:Person detected"
+    assert cache.get("Person detected").data == b"en:Person detected"
+    cache.get("Person detected", lang="hi")
+    assert engine.calls == [("Person detected", "en"), ("Person detected", "hi")]
+    assert cache.stats()["hits"] == 1
+
+def test_disk_store_survives_restart(tmp_path):
+    """A new cache over the same directory does not synthesize again"""
+    PhraseCache(str(tmp_path), engines=[("stub", StubEngine())]).get("Obstacle ahead")
+    engine = StubEngine()
+    cache = PhraseCache(str(tmp_path), engines=[("stub", engine)])
+    clip = cache.get("Obstacle ahead")
+    assert clip.data == b"en:Obstacle ahead" and clip.fmt == "mp3"
+    assert engine.calls == []
+    assert cache.stats()["disk_hits"] == 1
+
+def test_memory_lru_eviction():
+    """Least recently used clips leave memory first"""
+    engine = StubEngine()
+    cache = PhraseCache(None, max_items=2, engines=[("stub", engine)])
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")  # evicts "b"
+    cache.get("a")
+    cache.get("b")
+    assert [text for text, _ in engine.calls] == ["a", "b", "c", "b"]
+
+def test_falls_back_to_offline_engine(tmp_path):
+    """When the first engine fails the next one is used and cached"""
+    online = StubEngine(fail=True)
+    offline = StubEngine(fmt="wav")
+    cache = PhraseCache(str(tmp_path), engines=[("gtts", online), ("pyttsx3", offline)])
+    clip = cache.get("Turn left")
+    assert clip.engine == "pyttsx3" and clip.fmt == "wav"
+    cache.get("Turn left")
+    assert len(offline.calls) == 1
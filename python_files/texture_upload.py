@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Frame Display for Blind Assistant
+Uploads camera frames to one reusable Kivy texture without extra copies
+
+The old path flipped every frame in memory (cv2.flip, a full copy), turned it
+into bytes (another copy) and created a new GPU texture 30 times a second.
+FrameTexture creates the texture once per resolution and flips it through
+its texture coordinates instead, so each frame is a single blit straight from
+the numpy array's memory.
+"""
+
+import numpy as np
+
+try:
+    from kivy.graphics.texture import Texture
+except ImportError:
+    Texture = None
+
+def frame_buffer(frame):
+    """Flat uint8 view of a frame's pixels; copies only non-contiguous frames"""
+    if not frame.flags.c_contiguous:
+        frame = np.ascontiguousarray(frame)
+    return frame.reshape(-1)
+
+class FrameTexture:
+    """Displays BGR frames on an Image widget through a reused texture"""
+
+    def __init__(self, widget, colorfmt="bgr"):
+        self.widget = widget
+        self.colorfmt = colorfmt
+        self.texture = None
+        self.size = None
+        self.created = 0  # textures allocated, for diagnostics
+
+    def _create(self, size):
+        texture = Texture.create(size=size, colorfmt=self.colorfmt)
+        # OpenCV rows run top to bottom, GL rows bottom to top: flip the UVs once
+        texture.flip_vertical()
+        self.texture = texture
+        self.size = size
+        self.created += 1
+        self.widget.texture = texture
+
+    def show(self, frame):
+        size = (frame.shape[1], frame.shape[0])
+        if size != self.size:
+            self._create(size)
+        self.texture.blit_buffer(frame_buffer(frame), colorfmt=self.colorfmt, bufferfmt="ubyte")
+        # The texture object is unchanged, so tell the widget to redraw
+        self.widget.canvas.ask_update()
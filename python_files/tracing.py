@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tracing for Blind Assistant
+Context-manager spans with monotonic timestamps, exported for chrome://tracing
+
+Tracing is off unless TRACE_FILE is set or ``enable(path)`` is called; a
+disabled ``span()`` returns a shared no-op object and records nothing. When
+enabled, each finished span is written as one line of the Chrome trace-event
+JSON array format (its closing bracket is optional), so the file can be
+appended to by several processes and loaded directly in chrome://tracing or
+https://ui.perfetto.dev.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+FLUSH_EVENTS = 256
+
+_fd = None
+_path = None
+_pending = []
+_lock = threading.Lock()
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class _Span:
+    __slots__ = ("name", "args", "_start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        record(self.name, self._start, end, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach extra arguments to the span (shown in the trace viewer)"""
+        self.args.update(args)
+
+def record(name, start_ns, end_ns, args=None):
+    """Write a complete span measured elsewhere with time.perf_counter_ns()"""
+    if _fd is None:
+        return
+    event = {
+        "name": name,
+        "ph": "X",
+        "ts": start_ns / 1000,
+        "dur": (end_ns - start_ns) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    line = json.dumps(event, default=str) + ",\n"
+    with _lock:
+        _pending.append(line)
+        if len(_pending) >= FLUSH_EVENTS:
+            _flush_locked()
+
+def _flush_locked():
+    global _pending
+    if _fd is not None and _pending:
+        # One write of whole lines, so concurrent writers never split an event
+        os.write(_fd, "".join(_pending).encode("utf-8"))
+    _pending = []
+
+def flush():
+    """Write buffered events to the trace file"""
+    with _lock:
+        _flush_locked()
+
+def enable(path):
+    """Start recording spans to ``path`` (appending if it exists)"""
+    global _fd, _path
+    disable()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    if os.fstat(fd).st_size == 0:
+        os.write(fd, b"[\n")
+    with _lock:
+        _fd = fd
+        _path = path
+
+def disable():
+    """Flush and stop recording"""
+    global _fd
+    with _lock:
+        _flush_locked()
+        if _fd is not None:
+            os.close(_fd)
+        _fd = None
+
+def enabled():
+    return _fd is not None
+
+def span(name, **args):
+    """Time a block: ``with span("net.forward"): ...``"""
+    if _fd is None:
+        return _NOOP_SPAN
+    return _Span(name, args)
+
+def traced(name=None):
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _fd is None:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _after_fork():
+    """Give a forked child its own descriptor, lock and an empty buffer"""
+    # The parent flushes its own buffered events; a lock another parent
+    # thread held at fork time would never be released in the child
+    global _fd, _lock, _pending
+    _lock = threading.Lock()
+    _pending = []
+    if _fd is not None:
+        os.close(_fd)
+        _fd = os.open(_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+atexit.register(disable)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+if os.getenv("TRACE_FILE"):
+    enable(os.getenv("TRACE_FILE"))
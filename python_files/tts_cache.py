@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Speech Audio Cache for Blind Assistant
+Synthesizes each phrase once and replays the stored audio afterwards
+
+Alerts repeat the same few phrases, yet every speak() call used to go to gTTS
+over the network and through a shared voice.mp3 file. PhraseCache keys audio
+by (text, language, engine): recent clips stay in a memory LRU, all clips are
+kept on disk under a hash of the key, so they survive restarts and concurrent
+speakers never share a file. Synthesis uses gTTS and falls back to offline
+pyttsx3 when gTTS is missing or the network is down.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.path.dirname(SCRIPT_DIR), ".tts_cache"))
+TTS_CACHE_SIZE = int(os.getenv("TTS_CACHE_SIZE", "64"))  # clips kept in memory
+TTS_ENGINES = os.getenv("TTS_ENGINES", "gtts,pyttsx3")
+
+# fmt is the file type ("mp3", "wav", "aiff") for players that need a hint
+Clip = namedtuple("Clip", ["data", "fmt", "engine"])
+
+def _gtts_synthesize(text, lang):
+    from gtts import gTTS
+    buffer = io.BytesIO()
+    gTTS(text=text, lang=lang).write_to_fp(buffer)
+    return buffer.getvalue(), "mp3"
+
+_pyttsx3_engine = None
+
+def _pyttsx3_synthesize(text, lang):
+    global _pyttsx3_engine
+    import pyttsx3
+    if _pyttsx3_engine is None:
+        _pyttsx3_engine = pyttsx3.init()
+        _pyttsx3_engine.setProperty('rate', 150)
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        _pyttsx3_engine.save_to_file(text, path)
+        _pyttsx3_engine.runAndWait()
+        with open(path, "rb") as f:
+            data = f.read()
+    finally:
+        os.remove(path)
+    if not data:
+        raise RuntimeError("pyttsx3 produced no audio")
+    # The platform driver decides the container (SAPI/espeak: WAV, macOS: AIFF)
+    return data, "aiff" if data[:4] == b"FORM" else "wav"
+
+ENGINES = {"gtts": _gtts_synthesize, "pyttsx3": _pyttsx3_synthesize}
+
+def cache_key(text, lang, engine):
+    return hashlib.sha256(f"{engine}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+
+class PhraseCache:
+    """Memory LRU over a content-addressed disk store of synthesized phrases"""
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_items=TTS_CACHE_SIZE, engines=None):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        if engines is None:
+            engines = [(name, ENGINES[name]) for name in TTS_ENGINES.split(",") if name in ENGINES]
+        self.engines = list(engines)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._synth_lock = threading.Lock()
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                print(f"⚠️  TTS disk cache disabled: {e}")
+                self.cache_dir = None
+
+    def _remember(self, key, clip):
+        with self._lock:
+            self._memory[key] = clip
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _from_memory(self, key):
+        with self._lock:
+            clip = self._memory.get(key)
+            if clip is not None:
+                self._memory.move_to_end(key)
+            return clip
+
+    def _from_disk(self, key, engine):
+        if not self.cache_dir:
+            return None
+        for fmt in ("mp3", "wav", "aiff"):
+            path = os.path.join(self.cache_dir, f"{key}.{fmt}")
+            try:
+                with open(path, "rb") as f:
+                    return Clip(f.read(), fmt, engine)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"⚠️  Could not read cached speech {path}: {e}")
+        return None
+
+    def _store(self, key, clip):
+        if not self.cache_dir:
+            return
+        path = os.path.join(self.cache_dir, f"{key}.{clip.fmt}")
+        try:
+            # Write then rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(clip.data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache speech: {e}")
+
+    def lookup(self, text, lang="en"):
+        """Cached clip for text from any engine, or None"""
+        for engine, _ in self.engines:
+            key = cache_key(text, lang, engine)
+            clip = self._from_memory(key)
+            if clip is not None:
+                self.hits += 1
+                return clip
+            clip = self._from_disk(key, engine)
+            if clip is not None:
+                self.disk_hits += 1
+                self._remember(key, clip)
+                return clip
+        return None
+
+    def get(self, text, lang="en"):
+        """Audio for text, synthesizing and caching it on a miss"""
+        clip = self.lookup(text, lang)
+        if clip is not None:
+            return clip
+        with self._synth_lock:
+            # Another thread may have synthesized it while we waited
+            clip = self.lookup(text, lang)
+            if clip is not None:
+                return clip
+            self.misses += 1
+            errors = []
+            for engine, synthesize in self.engines:
+                try:
+                    data, fmt = synthesize(text, lang)
+                except Exception as e:
+                    errors.append(f"{engine}: {e}")
+                    continue
+                clip = Clip(data, fmt, engine)
+                key = cache_key(text, lang, engine)
+                self._remember(key, clip)
+                self._store(key, clip)
+                return clip
+        raise RuntimeError("No speech engine succeeded (" + "; ".join(errors) + ")")
+
+    def prewarm(self, phrases, lang="en"):
+        """Synthesize phrases in the background; returns the thread"""
+        def warm():
+            for phrase in phrases:
+                try:
+                    self.get(phrase, lang)
+                except Exception as e:
+                    print(f"⚠️  Could not pre-synthesize '{phrase}': {e}")
+        thread = threading.Thread(target=warm, name="tts-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "memory_items": len(self._memory)}
+
+_cache = None
+
+def get_cache():
+    """Shared process-wide phrase cache"""
+    global _cache
+    if _cache is None:
+        _cache = PhraseCache()
+    return _cache
@@ -1,20 +1,23 @@
 import speech_recognition as sr
+import mic_session
+import recognizers
 
 def get_voice_command():
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Please speak your destination:")
-        audio = recognizer.listen(source)
+    print("Please speak your destination:")
 
     try:
-        command = recognizer.recognize_google(audio)
+        # Stops as soon as the speaker pauses (see mic_session.py)
+        command = recognizers.get_recognizer().listen(mic_session.get_session()).text
         print("You said:", command)
         return command
     except sr.UnknownValueError:
         print("Sorry, I could not understand the audio.")
         return None
     except sr.RequestError as e:
-        print(f"Could not request results from Google Speech Recognition service; {e}")
+        print(f"Could not request results from the speech recognition service; {e}")
+        return None
+    except sr.WaitTimeoutError:
+        print("No speech heard. Please try again.")
         return None
 
 # Call the function and get the voice input